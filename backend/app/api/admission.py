@@ -0,0 +1,288 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterable, Optional
+from starlette.responses import JSONResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Lower number = more important; low-priority callers are shed first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+DEFAULT_PRIORITY = "normal"
+
+# Fraction of the wait queue each priority may occupy before it is shed
+DEFAULT_QUEUE_SHARE = {"high": 1.0, "normal": 0.75, "low": 0.5}
+
+
+class TokenBucket:
+    """Token bucket with lazy refill; O(1) per check."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class AdmissionController:
+    """
+    Per-client rate limiting plus a priority-aware concurrency cap.
+
+    Rate limiting uses one token bucket per client, kept in an LRU table of
+    at most max_clients entries so memory stays bounded no matter how many
+    distinct clients appear. Admitted requests then need one of
+    max_concurrent slots; when none is free they wait in a bounded queue.
+    Each priority may only fill its share of that queue, so as the queue
+    grows low-priority callers are rejected first, then normal, then high.
+    Freed slots are handed to the highest-priority waiter.
+
+    All state is touched from the event loop thread only.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 200.0,
+        burst: float = 400.0,
+        max_clients: int = 10000,
+        max_concurrent: int = 64,
+        max_queue: int = 256,
+        max_queue_wait_ms: float = 1000.0,
+        queue_share: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            rate_per_second: Sustained requests per second allowed per client
+            burst: Bucket capacity, i.e. the largest burst a client may send
+            max_clients: Maximum number of client buckets kept (LRU evicted)
+            max_concurrent: Requests allowed in flight at once
+            max_queue: Requests allowed to wait for a slot
+            max_queue_wait_ms: Longest time a request may wait for a slot
+            queue_share: Fraction of max_queue each priority may occupy
+            clock: Monotonic time source in seconds
+        """
+        if rate_per_second <= 0 or burst < 1:
+            raise ValueError("rate_per_second must be positive and burst at least 1")
+        if max_clients < 1 or max_concurrent < 1 or max_queue < 0:
+            raise ValueError("max_clients and max_concurrent must be at least 1, max_queue non-negative")
+
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_clients = max_clients
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait_ms / 1000.0
+        self.clock = clock
+
+        share = dict(DEFAULT_QUEUE_SHARE)
+        share.update(queue_share or {})
+        self.queue_limits = {name: int(max_queue * share[name]) for name in PRIORITIES}
+
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._waiters: Dict[int, Deque[asyncio.Future]] = {rank: deque() for rank in PRIORITIES.values()}
+        self.active = 0
+        self.queued = 0
+
+        self.rate_limited = 0
+        self.shed = 0
+
+    @staticmethod
+    def normalize_priority(priority: Optional[str]) -> str:
+        """Map a caller-supplied priority onto a known one."""
+        if priority is None:
+            return DEFAULT_PRIORITY
+        priority = priority.strip().lower()
+        return priority if priority in PRIORITIES else DEFAULT_PRIORITY
+
+    def check_rate(self, client_id: str) -> Optional[float]:
+        """
+        Take one token from the client's bucket.
+
+        Args:
+            client_id: Caller identity
+
+        Returns:
+            None if admitted, otherwise seconds until a token is available
+        """
+        now = self.clock()
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, now)
+            self._buckets[client_id] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate_per_second)
+            bucket.updated = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return None
+
+        self.rate_limited += 1
+        return (1 - bucket.tokens) / self.rate_per_second
+
+    async def acquire(self, priority: str = DEFAULT_PRIORITY) -> bool:
+        """
+        Wait for a concurrency slot.
+
+        Args:
+            priority: One of "high", "normal", "low"
+
+        Returns:
+            True if a slot was acquired (caller must release()), False if shed
+        """
+        if self.active < self.max_concurrent and self.queued == 0:
+            self.active += 1
+            return True
+
+        if self.queued >= self.queue_limits[priority]:
+            self.shed += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters[PRIORITIES[priority]]
+        waiters.append(future)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_queue_wait)
+            return True
+        except asyncio.TimeoutError:
+            if future.done():
+                # The slot was handed over just as the wait expired
+                return True
+            future.cancel()
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+            raise
+        finally:
+            if not future.done() or future.cancelled():
+                self._discard(waiters, future)
+
+    def _discard(self, waiters: Deque[asyncio.Future], future: asyncio.Future) -> None:
+        """Remove an abandoned waiter from its queue."""
+        try:
+            waiters.remove(future)
+            self.queued -= 1
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        """Release a slot, handing it to the highest-priority waiter if any."""
+        for rank in sorted(self._waiters):
+            waiters = self._waiters[rank]
+            while waiters:
+                future = waiters.popleft()
+                self.queued -= 1
+                if not future.done():
+                    # Slot passes directly to the waiter; active count is unchanged
+                    future.set_result(True)
+                    return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        """Suggested Retry-After (whole seconds) for a shed request."""
+        return max(1, math.ceil(self.max_queue_wait))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Current counters for monitoring."""
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "clients": len(self._buckets),
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to selected paths.
+
+    Only the configured scoring paths are limited; everything else,
+    including /health, passes straight through. Clients are identified by
+    their peer address. The X-Client-Id and X-Priority: high | normal | low
+    headers are caller-supplied, so they are only honoured when
+    trust_client_headers is set or the peer is a trusted proxy; otherwise a
+    caller could mint a fresh bucket per request or claim high priority.
+    Rejected requests receive 429 with a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        protected_paths: Iterable[str] = ("/calculate-risk",),
+        trust_client_headers: bool = False,
+        trusted_proxies: Iterable[str] = (),
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            controller: Rate limiter and concurrency cap
+            protected_paths: Paths subject to admission control
+            trust_client_headers: Honour X-Client-Id and X-Priority from any peer
+            trusted_proxies: Peer addresses whose X-Client-Id and X-Priority are honoured
+        """
+        self.app = app
+        self.controller = controller
+        self.protected_paths = frozenset(protected_paths)
+        self.trust_client_headers = trust_client_headers
+        self.trusted_proxies = frozenset(trusted_proxies)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.protected_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        client_id = None
+        priority = None
+        if self.trust_client_headers or peer in self.trusted_proxies:
+            for name, value in scope["headers"]:
+                if name == b"x-client-id":
+                    client_id = value.decode("latin-1")
+                elif name == b"x-priority":
+                    priority = value.decode("latin-1")
+        if client_id is None:
+            client_id = peer
+
+        controller = self.controller
+        wait = controller.check_rate(client_id)
+        if wait is not None:
+            await self._reject(scope, receive, send, "Rate limit exceeded", max(1, math.ceil(wait)))
+            return
+
+        if not await controller.acquire(controller.normalize_priority(priority)):
+            logger.warning(f"Shedding request from {client_id} (priority {priority or DEFAULT_PRIORITY})")
+            await self._reject(scope, receive, send, "Server overloaded", controller.retry_after())
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+
+    @staticmethod
+    async def _reject(scope, receive, send, detail: str, retry_after: int) -> None:
+        """Send a 429 response."""
+        response = JSONResponse(
+            status_code=429,
+            content={"detail": detail},
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+from ..diagnostics import ProfilerBusyError
+from . import routes
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Only mounted when diagnostics are enabled in service.yaml
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+def run_profile(
+    seconds: float = Query(10, gt=0, description="Profile duration in seconds"),
+    interval_ms: float = Query(5, gt=0, description="Sampling interval in milliseconds"),
+) -> str:
+    """
+    Sample every thread for the requested duration.
+    
+    Returns collapsed stacks ("frame;frame;frame count" per line) that can be
+    fed to flamegraph.pl or loaded into speedscope.
+    
+    Raises:
+        HTTPException: 404 if diagnostics are disabled, 409 if a profile is already running
+    """
+    if routes.profiler is None:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled")
+    try:
+        return routes.profiler.profile(seconds, interval_ms)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/slow-requests")
+def list_slow_requests(limit: Optional[int] = Query(None, ge=1, description="Maximum entries to return")) -> dict:
+    """Return captured slow requests, newest first, with input and per-stage timings."""
+    slow_log = routes.slow_log
+    if slow_log is None:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled")
+    return {
+        "threshold_ms": slow_log.threshold_ms,
+        "capacity": slow_log.capacity,
+        "captured": slow_log.captured,
+        "entries": slow_log.entries(limit),
+    }
+
+
+@router.delete("/slow-requests")
+def clear_slow_requests() -> dict:
+    """Drop all captured slow requests."""
+    if routes.slow_log is None:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled")
+    routes.slow_log.clear()
+    return {"cleared": True}
@@ -1,27 +1,86 @@
 from fastapi import APIRouter, HTTPException
+from time import perf_counter_ns
 from typing import Optional
-from ..models.risk_models import RiskInput, RiskOutput, BreakdownData
-from ..scoring import ScoringEngine
-from ..rules import RuleEngine
+from ..models.risk_models import RiskInput, RiskOutput
+from ..scoring import MicroBatcher
+from ..config import load_service_config
+from ..services import ScoringServices
+from ..diagnostics import SamplingProfiler, SlowRequestLog
+from ..notifications import NotificationDispatcher
+from ..tracing import Tracer, build_exporters, current_trace
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize engines
-scoring_engine = ScoringEngine()
-rule_engine = RuleEngine()
+service_config = load_service_config()
 
+# Scoring core shared with the framed transport
+services = ScoringServices(service_config)
+baseline_store = services.baseline_store
+rolling_stats = services.rolling_stats
+stats_publisher = services.stats_publisher
+scoring_engine = services.scoring_engine
+rule_engine = services.rule_engine
+notification_dispatcher = services.notification_dispatcher
+risk_notifier = services.risk_notifier
+correlator = services.correlator
+pipeline = services.pipeline
+snapshot_manager = services.snapshot_manager
 
-@router.post("/calculate-risk", response_model=RiskOutput)
-def calculate_risk(risk_input: RiskInput) -> RiskOutput:
+# Coalesce concurrent single-event requests into batches
+batching_config = service_config.get("batching", {})
+batcher: Optional[MicroBatcher] = None
+if batching_config.get("enabled", False):
+    batcher = MicroBatcher(
+        pipeline,
+        max_batch_size=batching_config.get("max_batch_size", 64),
+        max_wait_us=batching_config.get("max_wait_us", 250),
+    )
+
+# Opt-in diagnostics; when disabled no per-request timing is collected
+diagnostics_config = service_config.get("diagnostics", {})
+slow_log: Optional[SlowRequestLog] = None
+profiler: Optional[SamplingProfiler] = None
+if diagnostics_config.get("enabled", False):
+    slow_log = SlowRequestLog(
+        threshold_ms=diagnostics_config.get("slow_request_ms", 50),
+        capacity=diagnostics_config.get("slow_request_capacity", 100),
+    )
+    profiler = SamplingProfiler(max_seconds=diagnostics_config.get("max_profile_seconds", 60))
+
+# Request tracing, exported as OTLP/JSON off the request path
+tracing_config = service_config.get("tracing", {})
+trace_dispatcher: Optional[NotificationDispatcher] = None
+tracer: Optional[Tracer] = None
+if tracing_config.get("enabled", False):
+    trace_dispatcher = NotificationDispatcher(
+        build_exporters(tracing_config.get("exporters", []), tracing_config.get("service_name", "riskradar")),
+        buffer_size=tracing_config.get("buffer_size", 10000),
+        batch_size=tracing_config.get("batch_size", 512),
+        flush_interval_ms=tracing_config.get("flush_interval_ms", 1000),
+        max_retries=tracing_config.get("max_retries", 3),
+        retry_backoff_ms=tracing_config.get("retry_backoff_ms", 100),
+        thread_name="trace-exporter",
+    )
+    tracer = Tracer(
+        trace_dispatcher,
+        sample_ratio=tracing_config.get("sample_ratio", 0.01),
+        latency_threshold_ms=tracing_config.get("latency_threshold_ms"),
+    )
+
+
+@router.post("/calculate-risk", response_model=RiskOutput, response_model_exclude_none=True)
+async def calculate_risk(risk_input: RiskInput) -> RiskOutput:
     """
     Calculate risk score from structured input.
     
     This endpoint computes a risk score (0-100) using a weighted formula
     that combines severity, confidence, and frequency. It also evaluates
-    security rules to provide explainability.
+    security rules to provide explainability. When batching is enabled,
+    concurrent requests are scored together by the micro-batcher. Stage
+    timings are only collected for slow-request capture or a traced request.
     
     Args:
         risk_input: RiskInput containing severity, confidence, frequency, and optional context
@@ -33,39 +92,26 @@ def calculate_risk(risk_input: RiskInput) -> RiskOutput:
         HTTPException: If input validation fails
     """
     try:
-        # Validate input
-        severity = risk_input.severity
-        confidence = risk_input.confidence
-        frequency = risk_input.frequency
-        context = risk_input.context or {}
-        
-        # Calculate risk score
-        risk_score = scoring_engine.calculate_risk_score(severity, confidence, frequency)
-        
-        # Determine risk level
-        risk_level = scoring_engine.get_risk_level(risk_score)
+        timings = None
+        trace = current_trace.get()
+        if slow_log is not None or trace is not None:
+            start_ns = perf_counter_ns()
+            timings = {}
         
-        # Evaluate rules for explainability
-        triggered_rules = rule_engine.evaluate_rules(
-            severity=severity,
-            confidence=confidence,
-            frequency=frequency,
-            context=context,
-        )
+        if batcher is not None:
+            response = await batcher.submit(risk_input, timings)
+        else:
+            response = pipeline.score(risk_input, timings)
         
-        # Create response
-        response = RiskOutput(
-            risk_score=round(risk_score, 2),
-            risk_level=risk_level,
-            breakdown=BreakdownData(
-                severity=severity,
-                confidence=confidence,
-                frequency=frequency,
-            ),
-            triggered_rules=triggered_rules,
-        )
+        if slow_log is not None:
+            slow_log.observe(start_ns, perf_counter_ns(), risk_input, timings)
+        if trace is not None:
+            trace.handler_start = start_ns
+            trace.timings = timings
+            trace.result = response
+            trace.handler_end = perf_counter_ns()
         
-        logger.info(f"Risk calculated: {risk_score:.2f} ({risk_level}), triggered {len(triggered_rules)} rules")
+        logger.info(f"Risk calculated: {response.risk_score:.2f} ({response.risk_level}), triggered {len(response.triggered_rules)} rules")
         return response
         
     except ValueError as e:
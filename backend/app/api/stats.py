@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from . import routes
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Only mounted when stats are enabled in service.yaml
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("")
+def get_stats(
+    minutes: Optional[float] = Query(None, gt=0, description="Span to summarize (defaults to the whole window)"),
+    percentiles: List[float] = Query([50, 90, 95, 99], description="Score percentiles to report (0-100)"),
+) -> dict:
+    """
+    Summarize recently scored events across all workers.
+    
+    Returns the risk_score histogram and percentiles, the risk-level mix and
+    per-rule trigger counts and rates over the last N minutes.
+    
+    Raises:
+        HTTPException: 404 if stats are disabled, 422 if minutes exceeds the window or a percentile is out of range
+    """
+    stats = routes.rolling_stats
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Stats are disabled")
+    if any(not 0 <= q <= 100 for q in percentiles):
+        raise HTTPException(status_code=422, detail="percentiles must be between 0 and 100")
+    exports = routes.stats_publisher.peer_exports() if routes.stats_publisher is not None else ()
+    try:
+        summary = stats.summary(minutes, exports)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return summary.to_dict(percentiles)
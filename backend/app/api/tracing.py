@@ -0,0 +1,70 @@
+from time import perf_counter_ns
+from typing import Awaitable, Iterable
+from ..tracing import TraceContext, Tracer, current_trace
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware tracing selected paths with a Tracer.
+
+    The head decision is made before the request is handed on. __call__ is
+    a plain function: for requests that are not traced it returns the inner
+    app's coroutine for the server to await directly, so an unsampled
+    request (with tail sampling off) adds no coroutine layer, only a header
+    scan and one inline random draw, or just the header scan when the
+    tracer is parent_only. For traced requests the TraceContext is
+    published through current_trace so the endpoint can record stage
+    timings, and the start of the response is timed to close the
+    serialization span.
+    """
+
+    def __init__(self, app, tracer: Tracer, traced_paths: Iterable[str] = ("/calculate-risk",)):
+        self.app = app
+        self.tracer = tracer
+        self.traced_paths = frozenset(traced_paths)
+
+    def __call__(self, scope, receive, send) -> Awaitable[None]:
+        if scope["type"] != "http" or scope["path"] not in self.traced_paths:
+            return self.app(scope, receive, send)
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        tracer = self.tracer
+        sampled = None
+        if traceparent is None and tracer.head_only:
+            if tracer.parent_only or tracer.random_source() >= tracer.sample_ratio:
+                return self.app(scope, receive, send)
+            sampled = True
+
+        trace = tracer.start(scope["method"], scope["path"], traceparent, sampled)
+        if trace is None:
+            return self.app(scope, receive, send)
+        return self._traced(scope, receive, send, trace)
+
+    async def _traced(self, scope, receive, send, trace: TraceContext) -> None:
+        """Run a traced request and hand the trace to the tracer."""
+        async def traced_send(message):
+            if message["type"] == "http.response.start":
+                trace.response_start = perf_counter_ns()
+                trace.status_code = message["status"]
+            await send(message)
+
+        token = current_trace.set(trace)
+        try:
+            await self.app(scope, receive, traced_send)
+        except Exception:
+            trace.status_code = trace.status_code or 500
+            raise
+        finally:
+            current_trace.reset(token)
+            try:
+                self.tracer.finish(trace)
+            except Exception as e:
+                logger.warning(f"Failed to export trace {trace.trace_id}: {str(e)}")
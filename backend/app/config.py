@@ -0,0 +1,29 @@
+import yaml
+from pathlib import Path
+from typing import Any, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVICE_CONFIG_PATH = Path(__file__).parent.parent / "config" / "service.yaml"
+
+
+def load_service_config(config_path: Path = None) -> Dict[str, Any]:
+    """
+    Load runtime service settings from YAML.
+
+    Args:
+        config_path: Path to service.yaml. Defaults to backend/config/service.yaml
+
+    Returns:
+        Settings dictionary keyed by section name; empty if the file is missing
+    """
+    if config_path is None:
+        config_path = DEFAULT_SERVICE_CONFIG_PATH
+
+    if not Path(config_path).exists():
+        logger.warning(f"Service config {config_path} not found. Using defaults.")
+        return {}
+
+    with open(config_path, "r") as f:
+        return yaml.safe_load(f) or {}
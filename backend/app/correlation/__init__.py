@@ -0,0 +1,3 @@
+from .correlator import IncidentCorrelator, EntityWindow
+
+__all__ = ["IncidentCorrelator", "EntityWindow"]
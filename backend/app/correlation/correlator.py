@@ -0,0 +1,314 @@
+import math
+import threading
+import time
+from bisect import bisect_right, insort
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from ..models.risk_models import IncidentData, RiskInput
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Entity fields of ContextData that events are grouped by
+ENTITY_FIELDS = ("user_id", "source_ip")
+
+# Keeps log(1 - p) finite when an event alone is certain evidence
+MAX_PROBABILITY = 1.0 - 1e-9
+
+
+class EntityWindow:
+    """
+    Events of one entity inside the correlation window, oldest first.
+
+    Each event is stored as (timestamp, log(1 - p), rules, risk_score). The
+    running sum of log(1 - p) and a count per triggered rule are updated as
+    events are added and expired, so the incident score never needs a
+    rescan. The strongest event is tracked with a monotonic deque: the
+    events, in window order, that no later event matches or beats.
+    """
+
+    __slots__ = ("events", "log_miss", "rule_counts", "strongest")
+
+    def __init__(self):
+        self.events: Deque[Tuple[float, float, Tuple[str, ...], float]] = deque()
+        self.log_miss = 0.0
+        self.rule_counts: Dict[str, int] = {}
+        self.strongest: Deque[Tuple[float, float, Tuple[str, ...], float]] = deque()
+
+    @property
+    def max_score(self) -> float:
+        """Highest risk score in the window (0 when empty)."""
+        return self.strongest[0][3] if self.strongest else 0.0
+
+    def add(self, timestamp: float, log_miss: float, rules: Tuple[str, ...], risk_score: float) -> None:
+        """Add one event's contributions."""
+        event = (timestamp, log_miss, rules, risk_score)
+        strongest = self.strongest
+        if not self.events or timestamp >= self.events[-1][0]:
+            self.events.append(event)
+            while strongest and strongest[-1][3] <= risk_score:
+                strongest.pop()
+            strongest.append(event)
+        else:
+            # Late arrival: keep the window time-ordered
+            insort(self.events, event)
+            position = bisect_right(strongest, event)
+            if position == len(strongest) or strongest[position][3] < risk_score:
+                strongest.insert(position, event)
+                while position and strongest[position - 1][3] <= risk_score:
+                    del strongest[position - 1]
+                    position -= 1
+        self.log_miss += log_miss
+        for rule in rules:
+            self.rule_counts[rule] = self.rule_counts.get(rule, 0) + 1
+
+    def expire(self, cutoff: float) -> None:
+        """Drop events older than cutoff."""
+        events = self.events
+        while events and events[0][0] < cutoff:
+            self.pop_oldest()
+
+    def pop_oldest(self) -> None:
+        """Remove the oldest event and its contributions."""
+        event = self.events.popleft()
+        _, log_miss, rules, _ = event
+        if self.strongest and self.strongest[0] is event:
+            self.strongest.popleft()
+        if self.events:
+            self.log_miss -= log_miss
+        else:
+            # Reset rather than subtract so rounding error cannot accumulate
+            self.log_miss = 0.0
+        for rule in rules:
+            count = self.rule_counts[rule] - 1
+            if count:
+                self.rule_counts[rule] = count
+            else:
+                del self.rule_counts[rule]
+
+
+class IncidentCorrelator:
+    """
+    Groups events by context.user_id and context.source_ip within a sliding
+    time window and scores each group as an incident.
+
+    The incident score is a noisy-OR over the window, floored at the
+    strongest event: every event is independent evidence with probability
+    event_weight * risk_score / 100, and every distinct rule triggered in
+    the window adds rule_weight, so
+
+        incident_score = max(max(risk_score),
+                             100 * (1 - prod(1 - p_event) * (1 - rule_weight) ** rules))
+
+    Ten medium events (score 45) from one IP within the window reach a HIGH
+    incident with the default weights, while a single event scores exactly
+    its own risk score: correlation can only raise severity.
+
+    Each entity keeps a time-ordered deque with running sums, and entities
+    sit in a table ordered by last activity. Expiry pops from the front of
+    both, so the cost per event is amortized O(1) however long the history.
+    Memory is bounded by max_entities and max_events_per_key.
+
+    Event timestamps come from the client, so they are bounded by the
+    arrival clock: timestamps more than max_clock_skew_seconds ahead are
+    clamped, and events already older than the window at arrival are not
+    added. Every window therefore only holds events inside
+    [now - window_seconds, now + max_clock_skew_seconds], an entity's
+    result never depends on when unrelated entities were swept, and a
+    bogus timestamp cannot expire other entities.
+    """
+
+    def __init__(
+        self,
+        level_for: Callable[[float], str],
+        window_seconds: float = 60.0,
+        event_weight: float = 0.3,
+        rule_weight: float = 0.05,
+        max_entities: int = 100000,
+        max_events_per_key: int = 10000,
+        max_clock_skew_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the correlator.
+
+        Args:
+            level_for: Maps an incident score to a risk level (ScoringEngine.get_risk_level)
+            window_seconds: Length of the correlation window
+            event_weight: Scales an event's risk score into its evidence probability
+            rule_weight: Evidence probability of each distinct rule in the window
+            max_entities: Maximum number of entities tracked (least recently active evicted)
+            max_events_per_key: Maximum events kept per entity (oldest dropped first)
+            max_clock_skew_seconds: How far event timestamps may run ahead of the clock
+            clock: Arrival time source; used for events without a timestamp and for expiry
+        """
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        if not 0 <= event_weight <= 1 or not 0 <= rule_weight < 1:
+            raise ValueError("event_weight must be in [0, 1] and rule_weight in [0, 1)")
+        if max_entities < 1 or max_events_per_key < 1:
+            raise ValueError("max_entities and max_events_per_key must be at least 1")
+        if max_clock_skew_seconds < 0:
+            raise ValueError("max_clock_skew_seconds must not be negative")
+
+        self.level_for = level_for
+        self.window_seconds = window_seconds
+        self.event_weight = event_weight
+        self.rule_log_miss = math.log1p(-rule_weight)
+        self.max_entities = max_entities
+        self.max_events_per_key = max_events_per_key
+        self.max_clock_skew_seconds = max_clock_skew_seconds
+        self.clock = clock
+
+        self._windows: "OrderedDict[Tuple[str, str], EntityWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def correlate(self, risk_input: RiskInput, risk_score: float, triggered_rules: Sequence[str]) -> Optional[IncidentData]:
+        """
+        Add a scored event to its entities' windows and return the incident.
+
+        Args:
+            risk_input: Validated RiskInput
+            risk_score: Event risk score (0-100)
+            triggered_rules: Rules triggered by the event
+
+        Returns:
+            The highest-scoring incident among the event's entities, or None
+            if the event has no user_id or source_ip
+        """
+        context = risk_input.context
+        if context is None:
+            return None
+        keys = [(field, getattr(context, field)) for field in ENTITY_FIELDS if getattr(context, field) is not None]
+        if not keys:
+            return None
+
+        now = self.clock()
+        timestamp = self._event_time(risk_input, now)
+        oldest = now - self.window_seconds
+        probability = min(self.event_weight * risk_score / 100.0, MAX_PROBABILITY)
+        log_miss = math.log1p(-probability)
+        rules = tuple(triggered_rules)
+
+        best = None
+        with self._lock:
+            for key in keys:
+                window = self._add(key, timestamp, log_miss, rules, risk_score, oldest)
+                if not window.events:
+                    continue
+                incident_score = self._incident_score(window)
+                if best is None or incident_score > best[0]:
+                    best = (incident_score, key, window)
+            self._sweep(oldest)
+            if best is None:
+                return None
+            return self._incident(*best)
+
+    def correlate_batch(
+        self,
+        risk_inputs: Sequence[RiskInput],
+        risk_scores: Sequence[float],
+        triggered: Sequence[Sequence[str]],
+    ) -> List[Optional[IncidentData]]:
+        """Correlate several scored events in input order."""
+        return [
+            self.correlate(risk_input, risk_score, triggered_rules)
+            for risk_input, risk_score, triggered_rules in zip(risk_inputs, risk_scores, triggered)
+        ]
+
+    def _event_time(self, risk_input: RiskInput, now: float) -> float:
+        """
+        Event time in seconds since the epoch.
+
+        Naive timestamps are taken as UTC; timestamps further ahead of now
+        than max_clock_skew_seconds are clamped.
+        """
+        timestamp = risk_input.timestamp
+        if timestamp is None:
+            return now
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        latest = now + self.max_clock_skew_seconds
+        event_time = timestamp.timestamp()
+        if event_time > latest:
+            logger.debug(f"Clamping event timestamp {timestamp.isoformat()} to the allowed clock skew")
+            return latest
+        return event_time
+
+    def _add(
+        self,
+        key: Tuple[str, str],
+        timestamp: float,
+        log_miss: float,
+        rules: Tuple[str, ...],
+        risk_score: float,
+        oldest: float,
+    ) -> EntityWindow:
+        """
+        Add an event to an entity's window and expire what fell out of it.
+
+        The window ends at the newest of the event, the entity's latest event
+        and arrival time; oldest is the start of the window at arrival time.
+        Windows left empty are removed from the table.
+        """
+        window = self._windows.get(key)
+        if window is None:
+            if timestamp < oldest:
+                # Too old to count; do not let it evict another entity
+                return EntityWindow()
+            window = EntityWindow()
+            self._windows[key] = window
+            if len(self._windows) > self.max_entities:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+
+        newest = window.events[-1][0] if window.events else timestamp
+        cutoff = max(newest - self.window_seconds, timestamp - self.window_seconds, oldest)
+        # Events already outside the window do not contribute
+        if timestamp >= cutoff:
+            window.add(timestamp, log_miss, rules, risk_score)
+            if len(window.events) > self.max_events_per_key:
+                window.pop_oldest()
+        window.expire(cutoff)
+        if not window.events:
+            del self._windows[key]
+        return window
+
+    def _sweep(self, cutoff: float) -> None:
+        """
+        Drop entities whose newest event is older than cutoff, oldest activity first.
+
+        Only frees memory: a stale entity left behind is emptied by _add the
+        next time it is seen, exactly as if it had been swept.
+        """
+        windows = self._windows
+        while windows:
+            key, window = next(iter(windows.items()))
+            if window.events and window.events[-1][0] >= cutoff:
+                break
+            del windows[key]
+
+    def _incident_score(self, window: EntityWindow) -> float:
+        """Noisy-OR of the window's events and distinct rules, floored at its strongest event."""
+        miss = math.exp(window.log_miss + len(window.rule_counts) * self.rule_log_miss)
+        return min(100.0, max(window.max_score, 100.0 * (1.0 - miss)))
+
+    def _incident(self, incident_score: float, key: Tuple[str, str], window: EntityWindow) -> IncidentData:
+        """Build the incident for one entity window."""
+        incident_score = round(incident_score, 2)
+        return IncidentData(
+            entity_type=key[0],
+            entity_id=key[1],
+            incident_score=incident_score,
+            incident_level=self.level_for(incident_score),
+            event_count=len(window.events),
+            window_seconds=self.window_seconds,
+            first_seen=datetime.fromtimestamp(window.events[0][0], timezone.utc),
+            last_seen=datetime.fromtimestamp(window.events[-1][0], timezone.utc),
+            triggered_rules=list(window.rule_counts),
+        )
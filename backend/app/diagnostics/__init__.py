@@ -0,0 +1,4 @@
+from .profiler import SamplingProfiler, ProfilerBusyError
+from .slowlog import SlowRequestLog
+
+__all__ = ["SamplingProfiler", "ProfilerBusyError", "SlowRequestLog"]
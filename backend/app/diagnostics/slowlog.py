@@ -0,0 +1,75 @@
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from ..models.risk_models import RiskInput
+from ..scoring.pipeline import StageTimings
+
+
+class SlowRequestLog:
+    """
+    Bounded ring buffer of requests that exceeded a latency threshold.
+
+    Each entry keeps the full validated input and per-stage timings so a slow
+    request can be replayed and attributed to a stage. Once capacity is
+    reached the oldest entry is dropped.
+    """
+
+    def __init__(self, threshold_ms: float = 50.0, capacity: int = 100):
+        """
+        Initialize the log.
+
+        Args:
+            threshold_ms: Requests at or above this latency are captured
+            capacity: Maximum number of entries retained
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.threshold_ms = threshold_ms
+        self.capacity = capacity
+        self._entries: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.captured = 0
+
+    def observe(self, start_ns: int, end_ns: int, risk_input: RiskInput, timings: StageTimings) -> bool:
+        """
+        Capture a request if it was slow.
+
+        Args:
+            start_ns: Request start from time.perf_counter_ns
+            end_ns: Request end from time.perf_counter_ns
+            risk_input: Validated input of the request
+            timings: Per-stage (start_ns, end_ns) pairs
+
+        Returns:
+            True if the request was captured
+        """
+        total_ms = (end_ns - start_ns) / 1e6
+        if total_ms < self.threshold_ms:
+            return False
+
+        entry = {
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "total_ms": round(total_ms, 3),
+            "stages_ms": {
+                stage: round((stage_end - stage_start) / 1e6, 3)
+                for stage, (stage_start, stage_end) in sorted(timings.items(), key=lambda item: item[1][0])
+            },
+            "input": risk_input.model_dump(mode="json"),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self.captured += 1
+        return True
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return captured entries, newest first."""
+        with self._lock:
+            entries = list(self._entries)
+        entries.reverse()
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        """Drop all captured entries."""
+        with self._lock:
+            self._entries.clear()
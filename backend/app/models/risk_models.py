@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, ConfigDict
+from datetime import datetime
 from typing import Optional, List
 
 
@@ -33,6 +34,7 @@ class RiskInput(BaseModel):
     confidence: float = Field(..., ge=0, le=100, description="Confidence score (0-100)")
     frequency: float = Field(..., ge=0, le=100, description="Frequency score (0-100)")
     context: Optional[ContextData] = Field(default_factory=ContextData, description="Optional context data")
+    timestamp: Optional[datetime] = Field(None, description="Event time used for correlation (defaults to arrival time)")
 
     @field_validator("severity", "confidence", "frequency", mode="before")
     @classmethod
@@ -50,6 +52,21 @@ class BreakdownData(BaseModel):
     frequency: float = Field(..., description="Frequency component")
 
 
+class IncidentData(BaseModel):
+    """Incident formed by correlated events from one entity within a time window."""
+    model_config = ConfigDict(json_schema_extra={})
+
+    entity_type: str = Field(..., description="Entity field the events were grouped by (user_id or source_ip)")
+    entity_id: str = Field(..., description="Entity identifier")
+    incident_score: float = Field(..., ge=0, le=100, description="Combined score of the correlated events (0-100)")
+    incident_level: str = Field(..., description="Risk level of the incident score")
+    event_count: int = Field(..., ge=1, description="Events from the entity inside the window")
+    window_seconds: float = Field(..., description="Correlation window length")
+    first_seen: datetime = Field(..., description="Time of the oldest event in the window")
+    last_seen: datetime = Field(..., description="Time of the newest event in the window")
+    triggered_rules: List[str] = Field(default_factory=list, description="Rules triggered by any event in the window")
+
+
 class RiskOutput(BaseModel):
     """Output model for risk calculation."""
     model_config = ConfigDict(
@@ -74,6 +91,7 @@ class RiskOutput(BaseModel):
     risk_level: str = Field(..., description="Risk level (LOW, MEDIUM, HIGH, CRITICAL)")
     breakdown: BreakdownData = Field(..., description="Component breakdown")
     triggered_rules: List[str] = Field(default_factory=list, description="List of triggered rules")
+    incident: Optional[IncidentData] = Field(None, description="Correlated incident for this event's entity, when correlation is enabled")
 
 
 class RuleResult(BaseModel):
@@ -0,0 +1,15 @@
+from .sinks import NotificationSink, FileSink, WebhookSink, QueueSink, LocalWebhookReceiver, build_sinks
+from .dispatcher import NotificationDispatcher
+from .notifier import RiskNotifier, LEVEL_RANK
+
+__all__ = [
+    "NotificationSink",
+    "FileSink",
+    "WebhookSink",
+    "QueueSink",
+    "LocalWebhookReceiver",
+    "build_sinks",
+    "NotificationDispatcher",
+    "RiskNotifier",
+    "LEVEL_RANK",
+]
@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+from .sinks import NotificationSink
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Bounded, batching fan-out from the request path to notification sinks.
+
+    emit() only performs a non-blocking put on a bounded queue, so sink I/O
+    never adds latency to scoring; when the queue is full the record is
+    dropped and counted. A single worker thread drains the queue in batches
+    of up to batch_size records (or whatever arrived within
+    flush_interval_ms) and delivers each batch to every sink, retrying
+    failures with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        sinks: List[NotificationSink],
+        buffer_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval_ms: float = 200.0,
+        max_retries: int = 3,
+        retry_backoff_ms: float = 100.0,
+        thread_name: str = "notification-dispatcher",
+    ):
+        """
+        Initialize the dispatcher and start its worker thread.
+
+        Args:
+            sinks: Destinations for every record
+            buffer_size: Maximum records waiting for delivery
+            batch_size: Maximum records per delivered batch
+            flush_interval_ms: Longest time a partial batch waits for more records
+            max_retries: Retries per sink per batch after the first attempt
+            retry_backoff_ms: Delay before the first retry; doubles on each retry
+            thread_name: Name of the worker thread
+        """
+        if buffer_size < 1 or batch_size < 1:
+            raise ValueError("buffer_size and batch_size must be at least 1")
+
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000.0
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=buffer_size)
+        self._stop = threading.Event()
+
+        self.emitted = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+
+        self._worker = threading.Thread(target=self._run, name=thread_name, daemon=True)
+        self._worker.start()
+
+    def emit(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue a record for delivery without blocking.
+
+        Args:
+            record: JSON-serializable notification
+
+        Returns:
+            True if queued, False if dropped because the buffer is full
+        """
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.emitted += 1
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Deliver what is already queued, stop the worker and close the sinks.
+
+        Args:
+            timeout: Longest time to wait for the worker to drain
+        """
+        self._stop.set()
+        self._worker.join(timeout)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.warning(f"Error closing {sink.name} sink: {str(e)}")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Delivery counters for monitoring; delivered and failed count once per sink."""
+        return {
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "pending": self._queue.qsize(),
+        }
+
+    def _run(self) -> None:
+        """Worker loop: gather a batch, deliver it, repeat until stopped and drained."""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0 and not self._stop.is_set():
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._deliver(batch)
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        """Send one batch to every sink with retries."""
+        for sink in self.sinks:
+            delay = self.retry_backoff
+            for attempt in range(self.max_retries + 1):
+                try:
+                    sink.send_batch(batch)
+                    self.delivered += len(batch)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        self.failed += len(batch)
+                        logger.error(f"Dropping {len(batch)} notifications after {attempt + 1} attempts to {sink.name} sink: {str(e)}")
+                        break
+                    logger.warning(f"Notification delivery to {sink.name} sink failed ({str(e)}); retrying")
+                    time.sleep(delay)
+                    delay *= 2
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from ..models.risk_models import RiskInput, RiskOutput
+from .dispatcher import NotificationDispatcher
+
+# Severity order of risk levels, lowest first
+LEVEL_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+
+class RiskNotifier:
+    """
+    Emits notifications for scored events that need attention.
+
+    A record is emitted when the event's risk level is at or above
+    min_level, or (with escalation enabled) when the level of an entity
+    (context.user_id or context.source_ip) rises above the last level seen
+    for it. Per-entity levels live in an LRU table bounded by max_entities,
+    so each observation is O(1). Records are handed to the dispatcher, which
+    never blocks the caller.
+    """
+
+    def __init__(
+        self,
+        dispatcher: NotificationDispatcher,
+        min_level: str = "CRITICAL",
+        escalation: bool = True,
+        max_entities: int = 10000,
+    ):
+        """
+        Initialize the notifier.
+
+        Args:
+            dispatcher: Queue feeding the notification sinks
+            min_level: Lowest risk level that always notifies
+            escalation: Also notify when an entity's level increases
+            max_entities: Maximum number of entities whose last level is tracked
+        """
+        min_level = min_level.upper()
+        if min_level not in LEVEL_RANK:
+            raise ValueError(f"Unknown risk level: {min_level}")
+
+        self.dispatcher = dispatcher
+        self.min_rank = LEVEL_RANK[min_level]
+        self.escalation = escalation
+        self.max_entities = max_entities
+        self._levels: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def observe(self, risk_input: RiskInput, output: RiskOutput) -> None:
+        """
+        Check one scored event and emit a notification if needed.
+
+        Args:
+            risk_input: Event that was scored
+            output: Its scoring result
+        """
+        level = output.risk_level
+        rank = LEVEL_RANK.get(level, LEVEL_RANK["CRITICAL"])
+        context = risk_input.context
+
+        escalated_from: Optional[Dict[str, str]] = None
+        entities: Dict[str, str] = {}
+        if context is not None:
+            for field in ("user_id", "source_ip"):
+                value = getattr(context, field)
+                if value is None:
+                    continue
+                entities[field] = value
+                previous = self._remember((field, value), level)
+                if self.escalation and previous is not None and LEVEL_RANK.get(previous, 0) < rank:
+                    escalated_from = escalated_from or {}
+                    escalated_from[field] = previous
+
+        if rank < self.min_rank and escalated_from is None:
+            return
+
+        record: Dict[str, Any] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "reason": "threshold" if rank >= self.min_rank else "escalation",
+            "risk_score": output.risk_score,
+            "risk_level": level,
+            "triggered_rules": output.triggered_rules,
+            "entities": entities,
+        }
+        if escalated_from is not None:
+            record["escalated_from"] = escalated_from
+        self.dispatcher.emit(record)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialize the per-entity levels, least recently seen first."""
+        return {"levels": [[field, value, level] for (field, value), level in self._levels.copy().items()]}
+
+    def restore(self, snapshot: Dict[str, Any]) -> int:
+        """
+        Replace the per-entity levels with a snapshot.
+
+        Returns:
+            Number of entities restored
+        """
+        levels: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        for field, value, level in snapshot["levels"][-self.max_entities:]:
+            levels[(field, value)] = level
+        self._levels = levels
+        return len(levels)
+
+    def _remember(self, key: Tuple[str, str], level: str) -> Optional[str]:
+        """Store an entity's latest level and return the previous one."""
+        previous = self._levels.get(key)
+        if previous is None:
+            if len(self._levels) >= self.max_entities:
+                self._levels.popitem(last=False)
+        else:
+            self._levels.move_to_end(key)
+        self._levels[key] = level
+        return previous
@@ -0,0 +1,209 @@
+import json
+import queue
+import threading
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationSink:
+    """
+    Destination for risk notifications.
+
+    Sinks receive records in batches from the dispatcher's worker thread and
+    never from a request thread. Raising from send_batch marks the batch as
+    failed so the dispatcher can retry it.
+    """
+
+    name = "sink"
+
+    def send_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Deliver a batch of records."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+
+
+class FileSink(NotificationSink):
+    """Appends one JSON record per line to a local file."""
+
+    name = "file"
+
+    def __init__(self, path: Path):
+        """
+        Initialize the sink.
+
+        Args:
+            path: JSON Lines file to append to (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def send_batch(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class WebhookSink(NotificationSink):
+    """POSTs each batch as a JSON array to an HTTP endpoint."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: Dict[str, str] = None):
+        """
+        Initialize the sink.
+
+        Args:
+            url: Endpoint receiving the POST
+            timeout: Request timeout in seconds
+            headers: Extra HTTP headers (e.g. authorization)
+        """
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json"}
+        self.headers.update(headers or {})
+
+    def send_batch(self, records: List[Dict[str, Any]]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(records).encode("utf-8"),
+            headers=self.headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status >= 300:
+                raise IOError(f"Webhook returned HTTP {response.status}")
+
+
+class QueueSink(NotificationSink):
+    """
+    Hands records to an in-process queue for another component to consume.
+
+    If the queue stays full, send_batch raises so the dispatcher retries;
+    the retry resumes after the records that were already put, so none
+    are delivered twice.
+    """
+
+    name = "queue"
+
+    def __init__(self, target: "queue.Queue" = None, timeout: float = 1.0):
+        """
+        Initialize the sink.
+
+        Args:
+            target: Queue receiving individual records; a new unbounded one if omitted
+            timeout: Longest wait for room in a bounded queue, per record
+        """
+        self.queue = target if target is not None else queue.Queue()
+        self.timeout = timeout
+        # (batch, records already put) of a partially delivered batch
+        self._partial = None
+
+    def send_batch(self, records: List[Dict[str, Any]]) -> None:
+        start = self._partial[1] if self._partial is not None and self._partial[0] is records else 0
+        for index in range(start, len(records)):
+            try:
+                self.queue.put(records[index], timeout=self.timeout)
+            except queue.Full:
+                self._partial = (records, index)
+                raise
+        self._partial = None
+
+
+def build_sinks(sink_configs: List[Dict[str, Any]], queues: Optional[Dict[str, "queue.Queue"]] = None) -> List[NotificationSink]:
+    """
+    Build sinks from the notifications.sinks section of service.yaml.
+
+    Args:
+        sink_configs: List of {"type": "file" | "webhook" | "queue", ...options}
+        queues: In-process queues that "queue" sinks may target, by name;
+            a queue sink must name one ({"type": "queue", "name": ...})
+
+    Returns:
+        Configured sinks
+
+    Raises:
+        ValueError: If a sink type is unknown or a queue sink names no registered queue
+    """
+    sinks = []
+    for sink_config in sink_configs:
+        options = dict(sink_config)
+        sink_type = options.pop("type", None)
+        if sink_type == "file":
+            sinks.append(FileSink(**options))
+        elif sink_type == "webhook":
+            sinks.append(WebhookSink(**options))
+        elif sink_type == "queue":
+            # A queue nobody consumes would only grow, so the target must be supplied
+            target = (queues or {}).get(options.get("name"))
+            if target is None:
+                raise ValueError(f"Queue sink needs a registered queue name, got {options.get('name')!r}")
+            sinks.append(QueueSink(target))
+        else:
+            raise ValueError(f"Unknown notification sink type: {sink_type}")
+    return sinks
+
+
+class LocalWebhookReceiver:
+    """
+    Local stand-in for a webhook endpoint.
+
+    Runs a small HTTP server on a background thread and keeps every record
+    it receives, so the webhook sink can be exercised without external
+    services. Intended for development and tests.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, fail_first: int = 0):
+        """
+        Start the receiver.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            fail_first: Number of initial requests answered with HTTP 503
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        receiver = self
+        self.records: List[Dict[str, Any]] = []
+        self.requests = 0
+        self._fail_remaining = fail_first
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with receiver._lock:
+                    receiver.requests += 1
+                    failing = receiver._fail_remaining > 0
+                    if failing:
+                        receiver._fail_remaining -= 1
+                    else:
+                        receiver.accept(json.loads(body))
+                self.send_response(503 if failing else 204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_address[1]}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="webhook-receiver", daemon=True)
+        self._thread.start()
+
+    def accept(self, payload: Any) -> None:
+        """Keep the records of one successful request (called with the lock held)."""
+        self.records.extend(payload)
+
+    def close(self) -> None:
+        """Stop the receiver."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,3 +1,4 @@
 from .engine import RuleEngine
+from .baselines import BaselineStore, MetricStats
 
-__all__ = ["RuleEngine"]
+__all__ = ["RuleEngine", "BaselineStore", "MetricStats"]
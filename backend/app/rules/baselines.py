@@ -0,0 +1,317 @@
+import json
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from ..models.risk_models import ContextData, RiskInput, RiskOutput
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Entity fields of ContextData that get their own baseline
+ENTITY_FIELDS = ("user_id", "source_ip")
+
+# Per-event metrics tracked for every entity
+METRICS = ("severity", "frequency", "failed_logins")
+
+# Fixed-bin histogram over [0, upper] per metric; an extra bin absorbs values above upper.
+# Scores span 0-100, while failed logins are small counts and need unit-wide bins.
+HISTOGRAM_BINS = 25
+HISTOGRAM_UPPER = {"severity": 100.0, "frequency": 100.0, "failed_logins": 25.0}
+
+SNAPSHOT_VERSION = 2
+
+# Entities encoded between GIL releases in snapshot_json()
+SNAPSHOT_CHUNK = 500
+
+
+class MetricStats:
+    """
+    Streaming statistics for one metric of one entity.
+
+    Mean and variance use Welford's algorithm; a fixed-bin histogram over
+    [0, upper] gives approximate quantiles. Updates are O(1) and the state
+    never grows.
+    """
+
+    __slots__ = ("count", "mean", "m2", "bins", "upper", "width")
+
+    def __init__(self, upper: float = 100.0):
+        """
+        Initialize empty statistics.
+
+        Args:
+            upper: Top of the histogram range; larger values share the overflow bin
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.bins = array("L", [0]) * (HISTOGRAM_BINS + 1)
+        self.upper = upper
+        self.width = upper / HISTOGRAM_BINS
+
+    def update(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        index = int(value / self.width) if value > 0 else 0
+        self.bins[min(index, HISTOGRAM_BINS)] += 1
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0 with fewer than two observations)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate quantile by linear interpolation inside histogram bins.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or None with no observations (values in the
+            overflow bin are reported as upper)
+        """
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.bins):
+            if count and cumulative + count >= target:
+                if index == HISTOGRAM_BINS:
+                    return self.upper
+                fraction = (target - cumulative) / count
+                return (index + fraction) * self.width
+            cumulative += count
+        return self.upper
+
+    def to_list(self) -> List[Any]:
+        return [self.count, self.mean, self.m2, list(self.bins)]
+
+    @classmethod
+    def from_list(cls, data: List[Any], upper: float = 100.0) -> "MetricStats":
+        stats = cls(upper)
+        stats.count, stats.mean, stats.m2 = int(data[0]), float(data[1]), float(data[2])
+        stats.bins = array("L", data[3])
+        if len(stats.bins) != HISTOGRAM_BINS + 1:
+            raise ValueError("Histogram size does not match this version")
+        return stats
+
+
+def _metric_values(severity: float, frequency: float, context: ContextData) -> Tuple[float, float, float]:
+    """Values of METRICS for one event, in METRICS order."""
+    return severity, frequency, float(context.failed_logins or 0)
+
+
+class BaselineStore:
+    """
+    Per-entity behavioural baselines keyed by context.user_id and context.source_ip.
+
+    Each entity keeps a MetricStats for severity, frequency and failed
+    logins. An event is anomalous for an entity when any metric is at least
+    z_threshold standard deviations above that entity's mean and above the
+    entity's historical quantile, once the entity has min_samples
+    observations. The quantile check keeps entities with a routinely spiky
+    history (where mean and standard deviation describe the data poorly)
+    from flagging values they produce all the time. Entities live in an LRU
+    table bounded by max_entities.
+
+    The store is a pipeline observer: events are added to the baselines
+    after their rules have been evaluated, so an event is always compared
+    with its entity's history rather than with itself. RiskPipeline uses
+    batch_runs() to keep micro-batched results identical to scoring one
+    event at a time.
+    """
+
+    def __init__(
+        self,
+        min_samples: int = 20,
+        z_threshold: float = 3.0,
+        min_std: float = 1.0,
+        quantile: float = 0.99,
+        max_entities: int = 10000,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            min_samples: Observations needed before an entity can be anomalous
+            z_threshold: Standard deviations above the mean that count as anomalous
+            min_std: Floor on the standard deviation, so near-constant history
+                does not turn tiny changes into anomalies
+            quantile: Quantile of the entity's history an anomalous value must exceed
+            max_entities: Maximum number of entities kept (LRU evicted)
+        """
+        if min_samples < 2:
+            raise ValueError("min_samples must be at least 2")
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self.min_samples = min_samples
+        self.z_threshold = z_threshold
+        self.min_std = min_std
+        self.quantile = quantile
+        self.max_entities = max_entities
+        self._entities: "OrderedDict[Tuple[str, str], List[MetricStats]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def get(self, field: str, value: str) -> Optional[Dict[str, MetricStats]]:
+        """Return an entity's statistics by metric name, or None if unknown."""
+        stats = self._entities.get((field, value))
+        return dict(zip(METRICS, stats)) if stats is not None else None
+
+    def deviations(self, field: str, value: Optional[str], severity: float, frequency: float, context: ContextData) -> List[str]:
+        """
+        List the metrics on which an event deviates from an entity's baseline.
+
+        Args:
+            field: Entity field ("user_id" or "source_ip")
+            value: Entity identifier (None means no entity, hence no deviation)
+            severity: Event severity
+            frequency: Event frequency
+            context: Event context
+
+        Returns:
+            Names of anomalous metrics (empty if none or not enough history)
+        """
+        if value is None:
+            return []
+        stats = self._entities.get((field, value))
+        if stats is None or stats[0].count < self.min_samples:
+            return []
+
+        anomalous = []
+        for name, metric, observed in zip(METRICS, stats, _metric_values(severity, frequency, context)):
+            std = max(metric.std, self.min_std)
+            if (observed - metric.mean) / std >= self.z_threshold and observed > metric.quantile(self.quantile):
+                anomalous.append(name)
+        return anomalous
+
+    def batch_runs(self, contexts: Sequence[Optional[ContextData]]) -> List[Tuple[int, int]]:
+        """
+        Split a batch into runs that may be evaluated together.
+
+        Within a run no entity appears twice and no new entity can evict a
+        baseline from the LRU table, so evaluating the rules of a whole run
+        before observing it gives the same results as scoring its events one
+        at a time.
+
+        Args:
+            contexts: Event contexts in batch order
+
+        Returns:
+            (start, end) index ranges covering the batch in order
+        """
+        runs = []
+        start = 0
+        seen: set = set()
+        added: set = set()
+        entities = self._entities
+        for index, context in enumerate(contexts):
+            keys = []
+            if context is not None:
+                keys = [(field, getattr(context, field)) for field in ENTITY_FIELDS if getattr(context, field) is not None]
+            new_keys = {key for key in keys if key not in entities} - added
+            # Nothing is evicted until the table is full, so the membership checks stay exact
+            if index > start and (
+                not seen.isdisjoint(keys) or len(entities) + len(added) + len(new_keys) > self.max_entities
+            ):
+                runs.append((start, index))
+                start = index
+                seen = set()
+            seen.update(keys)
+            added |= new_keys
+        if start < len(contexts):
+            runs.append((start, len(contexts)))
+        return runs
+
+    def observe(self, risk_input: RiskInput, output: RiskOutput) -> None:
+        """Add a scored event to the baselines of its entities."""
+        context = risk_input.context
+        if context is None:
+            return
+        values = _metric_values(risk_input.severity, risk_input.frequency, context)
+        with self._lock:
+            for field in ENTITY_FIELDS:
+                value = getattr(context, field)
+                if value is None:
+                    continue
+                stats = self._entry((field, value))
+                for metric, observed in zip(stats, values):
+                    metric.update(observed)
+
+    def _entry(self, key: Tuple[str, str]) -> List[MetricStats]:
+        """Fetch or create an entity's statistics, maintaining LRU order."""
+        stats = self._entities.get(key)
+        if stats is None:
+            stats = [MetricStats(HISTOGRAM_UPPER[name]) for name in METRICS]
+            self._entities[key] = stats
+            if len(self._entities) > self.max_entities:
+                self._entities.popitem(last=False)
+        else:
+            self._entities.move_to_end(key)
+        return stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialize all baselines to a JSON-compatible dict."""
+        return json.loads(self.snapshot_json())
+
+    def snapshot_json(self) -> bytes:
+        """
+        Serialize all baselines directly to compact JSON.
+
+        Used by SnapshotManager on its background thread. Each entity is
+        captured under the lock on its own, and the GIL is released every
+        SNAPSHOT_CHUNK entities, so observe() on the request path waits for
+        at most one entity. Producing text instead of nested lists also keeps
+        the capture from triggering full garbage collections. Entities
+        updated while the capture runs may reflect either side of the update.
+        """
+        separators = (",", ":")
+        lock = self._lock
+        entities = self._entities
+        with lock:
+            keys = list(entities)
+        pieces = []
+        for index, key in enumerate(keys, 1):
+            with lock:
+                stats = entities.get(key)
+                metrics = [metric.to_list() for metric in stats] if stats is not None else None
+            if metrics is not None:
+                pieces.append(json.dumps([key[0], key[1], metrics], separators=separators))
+            if index % SNAPSHOT_CHUNK == 0:
+                time.sleep(0)
+        header = json.dumps({"version": SNAPSHOT_VERSION, "metrics": list(METRICS)}, separators=separators)
+        return (header[:-1] + ',"entities":[' + ",".join(pieces) + "]}").encode("utf-8")
+
+    def restore(self, snapshot: Dict[str, Any]) -> int:
+        """
+        Replace all baselines with a snapshot.
+
+        Args:
+            snapshot: Output of snapshot()
+
+        Returns:
+            Number of entities restored
+
+        Raises:
+            ValueError: If the snapshot version or layout is incompatible
+        """
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("metrics") != list(METRICS):
+            raise ValueError("Incompatible baseline snapshot")
+
+        entities: "OrderedDict[Tuple[str, str], List[MetricStats]]" = OrderedDict()
+        for field, value, metrics in snapshot["entities"][-self.max_entities:]:
+            entities[(field, value)] = [
+                MetricStats.from_list(metric, HISTOGRAM_UPPER[name]) for name, metric in zip(METRICS, metrics)
+            ]
+        with self._lock:
+            self._entities = entities
+        return len(entities)
@@ -1,5 +1,6 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from ..models.risk_models import ContextData, RuleResult
+from .baselines import BaselineStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,10 +16,22 @@ class RuleEngine:
     - Privileged account activity
     - High event frequency (frequency > 85)
     - Low confidence with high severity (suspicious pattern)
+    
+    With a BaselineStore, two deviation rules are added that compare the
+    event with the history of its user and source IP instead of fixed
+    thresholds:
+    - Anomalous activity for user
+    - Anomalous activity from source IP
     """
     
-    def __init__(self):
-        """Initialize the rule engine."""
+    def __init__(self, baselines: Optional[BaselineStore] = None):
+        """
+        Initialize the rule engine.
+        
+        Args:
+            baselines: Optional per-entity baselines enabling the deviation rules
+        """
+        self.baselines = baselines
         self.rules = [
             {
                 "name": "Multiple failed login attempts",
@@ -46,6 +59,20 @@ class RuleEngine:
                 "check": self._check_confidence_severity_mismatch,
             },
         ]
+        
+        if baselines is not None:
+            self.rules.extend([
+                {
+                    "name": "Anomalous activity for user",
+                    "description": "Event deviates from this user's baseline",
+                    "check": self._check_user_baseline,
+                },
+                {
+                    "name": "Anomalous activity from source IP",
+                    "description": "Event deviates from this source IP's baseline",
+                    "check": self._check_source_ip_baseline,
+                },
+            ])
     
     def evaluate_rules(
         self,
@@ -77,6 +104,32 @@ class RuleEngine:
         
         return triggered
     
+    def evaluate_rules_batch(
+        self,
+        rows: Sequence[Tuple[float, float, float, Optional[ContextData]]],
+    ) -> List[List[str]]:
+        """
+        Evaluate all rules against a batch of inputs.
+
+        Args:
+            rows: Sequence of (severity, confidence, frequency, context) tuples
+
+        Returns:
+            One list of triggered rule names per row, in rule order
+        """
+        default_context = ContextData()
+        checks = [(rule["name"], rule["check"]) for rule in self.rules]
+
+        results = []
+        for severity, confidence, frequency, context in rows:
+            if context is None:
+                context = default_context
+            results.append([
+                name for name, check in checks
+                if check(severity, confidence, frequency, context)
+            ])
+        return results
+    
     @staticmethod
     def _check_failed_logins(
         severity: float,
@@ -126,3 +179,23 @@ class RuleEngine:
     ) -> bool:
         """Check for suspicious pattern: high severity but low confidence."""
         return severity >= 75 and confidence <= 40
+    
+    def _check_user_baseline(
+        self,
+        severity: float,
+        confidence: float,
+        frequency: float,
+        context: ContextData,
+    ) -> bool:
+        """Check if the event deviates from the user's baseline."""
+        return bool(self.baselines.deviations("user_id", context.user_id, severity, frequency, context))
+    
+    def _check_source_ip_baseline(
+        self,
+        severity: float,
+        confidence: float,
+        frequency: float,
+        context: ContextData,
+    ) -> bool:
+        """Check if the event deviates from the source IP's baseline."""
+        return bool(self.baselines.deviations("source_ip", context.source_ip, severity, frequency, context))
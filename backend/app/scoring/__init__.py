@@ -1,3 +1,14 @@
 from .calculator import ScoringEngine
+from .pipeline import RiskPipeline, BatchCommitError
+from .batcher import MicroBatcher
+from .registry import EngineImplementation, EngineRegistry, EngineNotQualifiedError
 
-__all__ = ["ScoringEngine"]
+__all__ = [
+    "ScoringEngine",
+    "RiskPipeline",
+    "BatchCommitError",
+    "MicroBatcher",
+    "EngineImplementation",
+    "EngineRegistry",
+    "EngineNotQualifiedError",
+]
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from ..models.risk_models import RiskInput, RiskOutput
+from .pipeline import BatchCommitError, RiskPipeline, StageTimings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Server-side micro-batcher for single-event requests.
+
+    Concurrent callers submit one RiskInput each; the batcher gathers them
+    for a short window (or until max_batch_size events are waiting), scores
+    them together through RiskPipeline.score_batch and resolves each caller's
+    future with its own result.
+
+    The window adapts to load: it is derived from an exponentially weighted
+    moving average of the gap between arrivals. When the next request is not
+    expected within max_wait_us the window drops to zero and the batch is
+    flushed on the next event loop iteration, so low traffic sees no added
+    latency. Must be used from a single event loop.
+
+    Event loop timers round up to the selector's millisecond resolution, so
+    a 250us call_later() fires after about a millisecond. The last
+    TIMER_TICK of a window is therefore spent yielding to the loop with
+    call_soon() (at most MAX_YIELDS times), checking the clock between
+    iterations; requests read by those iterations still join the batch.
+    """
+
+    # Smoothing factor for the inter-arrival EWMA
+    EWMA_ALPHA = 0.2
+
+    # Resolution of asyncio timers (epoll/select timeouts are whole milliseconds)
+    TIMER_TICK = 0.001
+
+    # Loop iterations yielded at most before a window is flushed regardless of the clock
+    MAX_YIELDS = 64
+
+    def __init__(self, pipeline: RiskPipeline, max_batch_size: int = 64, max_wait_us: float = 250):
+        """
+        Initialize the batcher.
+
+        Args:
+            pipeline: Scoring core used to score each batch
+            max_batch_size: Flush as soon as this many events are pending
+            max_wait_us: Longest time the first event of a batch may wait, in microseconds
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_us < 0:
+            raise ValueError("max_wait_us cannot be negative")
+
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+
+        self._pending: List[Tuple[RiskInput, asyncio.Future, Optional[StageTimings]]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._last_arrival: Optional[float] = None
+        # Start by assuming idle traffic so the first requests are never delayed
+        self._mean_gap = float("inf")
+
+        self.batches_flushed = 0
+        self.events_scored = 0
+
+    @property
+    def current_window(self) -> float:
+        """Batching window in seconds for the current load estimate."""
+        if self._mean_gap >= self.max_wait:
+            return 0.0
+        # Wait only as long as it should take to fill the batch
+        return min(self.max_wait, self._mean_gap * (self.max_batch_size - 1))
+
+    async def submit(self, risk_input: RiskInput, timings: Optional[StageTimings] = None) -> RiskOutput:
+        """
+        Queue one event for the next batch and wait for its result.
+
+        Args:
+            risk_input: Validated RiskInput
+            timings: Optional dict that receives the batch's stage timings plus
+                a "queue_wait" stage for this event
+
+        Returns:
+            RiskOutput for this event
+
+        Raises:
+            Exception: Whatever the pipeline raised while scoring this event
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._record_arrival(time.perf_counter())
+        if timings is not None:
+            timings["queue_wait"] = (time.perf_counter_ns(), 0)
+        self._pending.append((risk_input, future, timings))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            window = self.current_window
+            if window <= 0:
+                # Still coalesces requests that arrive in the same loop iteration
+                self._flush_handle = loop.call_soon(self._flush)
+            else:
+                deadline = time.perf_counter() + window
+                if window > self.TIMER_TICK:
+                    self._flush_handle = loop.call_later(window - self.TIMER_TICK, self._yield, deadline, 0)
+                else:
+                    self._flush_handle = loop.call_soon(self._yield, deadline, 0)
+
+        return await future
+
+    def _record_arrival(self, now: float) -> None:
+        """Update the inter-arrival EWMA."""
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            if self._mean_gap == float("inf"):
+                self._mean_gap = gap
+            else:
+                self._mean_gap += self.EWMA_ALPHA * (gap - self._mean_gap)
+        self._last_arrival = now
+
+    def _yield(self, deadline: float, yields: int) -> None:
+        """Flush at the deadline, or let the loop run another iteration first."""
+        if yields >= self.MAX_YIELDS or time.perf_counter() >= deadline:
+            self._flush()
+        else:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._yield, deadline, yields + 1)
+
+    def _flush(self) -> None:
+        """Score all pending events and resolve their futures."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        # Callers that went away (e.g. client disconnects) do not need scoring
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+
+        self.batches_flushed += 1
+        self.events_scored += len(batch)
+
+        batch_timings = None
+        if any(timings is not None for _, _, timings in batch):
+            batch_timings = {}
+            flush_start = time.perf_counter_ns()
+            for _, _, timings in batch:
+                if timings is not None:
+                    timings["queue_wait"] = (timings["queue_wait"][0], flush_start)
+
+        try:
+            outputs = self.pipeline.score_batch([risk_input for risk_input, _, _ in batch], batch_timings)
+        except BatchCommitError as e:
+            # Part of the batch may already be correlated and observed; scoring it again would count it twice
+            logger.error(f"Batch of {len(batch)} failed after updating state: {str(e)}")
+            for _, future, _ in batch:
+                future.set_exception(e.error)
+            return
+        except Exception as e:
+            # Nothing was applied yet, so isolate the failure: one bad event cannot fail its batch mates
+            logger.warning(f"Batch of {len(batch)} failed ({str(e)}); scoring individually")
+            for risk_input, future, timings in batch:
+                try:
+                    future.set_result(self.pipeline.score(risk_input, timings))
+                except Exception as item_error:
+                    future.set_exception(item_error)
+            return
+
+        for (_, future, timings), output in zip(batch, outputs):
+            if timings is not None:
+                timings.update(batch_timings)
+            future.set_result(output)
@@ -1,6 +1,6 @@
 import yaml
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Sequence, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -76,6 +76,58 @@ class ScoringEngine:
         # Clamp result to 0-100
         return max(0, min(100, risk_score))
     
+    def calculate_risk_scores(self, rows: Sequence[Tuple[float, float, float]]) -> List[float]:
+        """
+        Calculate risk scores for a batch of (severity, confidence, frequency) rows.
+
+        Uses exactly the same arithmetic as calculate_risk_score, so each result
+        is bit-identical to the scalar path; weights are looked up once per batch.
+
+        Args:
+            rows: Sequence of (severity, confidence, frequency) tuples
+
+        Returns:
+            Risk scores (0-100), in input order
+        """
+        w_severity = self.weights["severity"]
+        w_confidence = self.weights["confidence"]
+        w_frequency = self.weights["frequency"]
+
+        scores = []
+        for severity, confidence, frequency in rows:
+            severity = max(0, min(100, severity))
+            confidence = max(0, min(100, confidence))
+            frequency = max(0, min(100, frequency))
+            risk_score = (
+                (severity / 100.0) * w_severity * 100 +
+                (confidence / 100.0) * w_confidence * 100 +
+                (frequency / 100.0) * w_frequency * 100
+            )
+            scores.append(max(0, min(100, risk_score)))
+        return scores
+
+    def get_risk_levels(self, risk_scores: Sequence[float]) -> List[str]:
+        """
+        Determine risk levels for a batch of scores.
+
+        Args:
+            risk_scores: Risk scores (0-100)
+
+        Returns:
+            Risk level strings, in input order
+        """
+        bands = [(bounds["min"], bounds["max"], level.upper()) for level, bounds in self.risk_levels.items()]
+
+        levels = []
+        for risk_score in risk_scores:
+            for low, high, level in bands:
+                if low <= risk_score <= high:
+                    levels.append(level)
+                    break
+            else:
+                levels.append("CRITICAL")
+        return levels
+
     def get_risk_level(self, risk_score: float) -> str:
         """
         Determine risk level based on score.
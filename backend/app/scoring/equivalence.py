@@ -0,0 +1,177 @@
+import math
+import random
+import struct
+import time
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from ..models.risk_models import ContextData, RiskInput
+
+# (severity, confidence, frequency, context)
+Case = Tuple[float, float, float, Optional[ContextData]]
+
+# Values around every rule threshold and default risk band edge, plus clamping extremes
+BOUNDARY_VALUES = (
+    0, 0.0, -0.0, 1e-9, 30, 30.0, 30.5, 31, 39.999999, 40, 40.0000001, 60, 60.5, 61,
+    74.999999, 75, 79.999999, 80, 80.0, 80.5, 81, 85, 85.0000001, 99.999999, 100, 100.0,
+)
+CLAMP_VALUES = (-1e308, -1e9, -100, -1, -1e-12, 100 + 1e-12, 101, 1e9, 1e308, math.inf, -math.inf)
+
+# Scores fed straight to get_risk_level, including values between integer bands
+SCORE_EDGES = (
+    0, 0.0, 0.004, 30, 30.0, 30.004, 30.5, 30.999, 31, 60, 60.5, 61, 80, 80.0, 80.004, 80.5, 81, 99.995, 100, 100.0,
+)
+
+
+def generate_cases(count: int = 1000, seed: int = 0) -> List[Case]:
+    """
+    Build deterministic randomized and edge-case inputs for differential testing.
+
+    Args:
+        count: Number of random cases appended after the edge cases
+        seed: Random seed
+
+    Returns:
+        List of (severity, confidence, frequency, context) tuples
+    """
+    rng = random.Random(seed)
+    contexts = [
+        None,
+        ContextData(),
+        ContextData(failed_logins=5),
+        ContextData(failed_logins=6, is_privileged=True),
+        ContextData(is_privileged=False, user_id="alice", source_ip="10.0.0.1"),
+    ]
+
+    cases: List[Case] = []
+    edges = BOUNDARY_VALUES + CLAMP_VALUES
+    for value in edges:
+        for context in contexts[:2]:
+            cases.append((value, 50, 50, context))
+            cases.append((50, value, 50, context))
+            cases.append((50, 50, value, context))
+        cases.append((value, value, value, contexts[3]))
+    for severity in (74.999999, 75, 80):
+        for confidence in (40, 40.0000001):
+            cases.append((severity, confidence, 85.0000001, contexts[4]))
+
+    def draw() -> float:
+        roll = rng.random()
+        if roll < 0.1:
+            return rng.choice(edges)
+        if roll < 0.3:
+            return float(rng.randint(0, 100))
+        if roll < 0.4:
+            return round(rng.uniform(0, 100), 1)
+        return rng.uniform(0, 100)
+
+    for _ in range(count):
+        context = rng.choice(contexts)
+        if rng.random() < 0.3:
+            context = ContextData(failed_logins=rng.randint(0, 12), is_privileged=rng.random() < 0.5)
+        cases.append((draw(), draw(), draw(), context))
+    return cases
+
+
+def baseline_cases(count: int = 500, seed: int = 0) -> Tuple[List[RiskInput], List[Case]]:
+    """
+    Build an entity history and cases that exercise the deviation rules.
+
+    Replaying the history into a BaselineStore gives every entity enough
+    samples to be judged; one entity has a routinely spiky history. The
+    cases mix those entities with an unknown one and span values on both
+    sides of the deviation thresholds.
+
+    Args:
+        count: Number of cases
+        seed: Random seed
+
+    Returns:
+        (history, cases): events to observe, then (severity, confidence, frequency, context) tuples
+    """
+    rng = random.Random(seed)
+    entities = [(f"user{index}", f"10.0.1.{index}") for index in range(6)]
+    history: List[RiskInput] = []
+    for index, (user_id, source_ip) in enumerate(entities):
+        context = ContextData(failed_logins=index % 3, user_id=user_id, source_ip=source_ip)
+        for _ in range(40):
+            severity = 90.0 if index == 0 and rng.random() < 0.1 else rng.uniform(20, 30)
+            history.append(RiskInput(
+                severity=severity, confidence=60, frequency=rng.uniform(40, 60), context=context,
+            ))
+
+    contexts = [
+        ContextData(failed_logins=failed_logins, user_id=user_id, source_ip=source_ip)
+        for user_id, source_ip in entities + [("unknown", "10.0.2.1")]
+        for failed_logins in (0, 2, 6)
+    ]
+    cases: List[Case] = []
+    for _ in range(count):
+        severity = rng.choice(BOUNDARY_VALUES) if rng.random() < 0.2 else rng.uniform(0, 100)
+        cases.append((severity, rng.uniform(0, 100), rng.uniform(0, 100), rng.choice(contexts)))
+    return history, cases
+
+
+def canonical(value: Any) -> Any:
+    """
+    Bit-exact comparison key.
+
+    Floats are compared by type and IEEE-754 bytes, so 0 vs 0.0, 0.0 vs -0.0
+    and differently rounded results are all distinguished.
+    """
+    if isinstance(value, float):
+        return ("float", struct.pack("<d", value))
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(canonical(item) for item in value)
+    return type(value).__name__, value
+
+
+def find_mismatches(expected: Sequence[Any], actual: Sequence[Any], inputs: Sequence[Any], limit: int = 10) -> List[dict]:
+    """
+    Compare two result sequences bit-exactly.
+
+    Args:
+        expected: Reference results
+        actual: Results under test
+        inputs: Inputs that produced them (for reporting)
+        limit: Maximum mismatches reported
+
+    Returns:
+        Up to limit {"input", "expected", "actual"} records
+    """
+    if len(expected) != len(actual):
+        return [{"input": None, "expected": f"{len(expected)} results", "actual": f"{len(actual)} results"}]
+    mismatches = []
+    for item, want, got in zip(inputs, expected, actual):
+        if canonical(want) != canonical(got):
+            mismatches.append({"input": repr(item), "expected": repr(want), "actual": repr(got)})
+            if len(mismatches) >= limit:
+                break
+    return mismatches
+
+
+def measure_throughput(
+    runs: Sequence[Callable[[], Any]],
+    events: int,
+    repeats: int = 7,
+) -> List[float]:
+    """
+    Best-of-N throughput of callables processing the same events.
+
+    Runs are interleaved within each repetition so that all of them see the
+    same machine conditions, which keeps relative comparisons stable on a
+    noisy host.
+
+    Args:
+        runs: Callables to time
+        events: Number of events each call processes
+        repeats: Repetitions; the fastest one counts
+
+    Returns:
+        Events per second for each callable, in order
+    """
+    best = [math.inf] * len(runs)
+    for _ in range(repeats):
+        for index, run in enumerate(runs):
+            start = time.perf_counter()
+            run()
+            best[index] = min(best[index], time.perf_counter() - start)
+    return [events / elapsed if elapsed > 0 else math.inf for elapsed in best]
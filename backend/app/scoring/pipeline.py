@@ -0,0 +1,245 @@
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Protocol, Tuple
+from ..models.risk_models import RiskInput, RiskOutput, BreakdownData
+from .calculator import ScoringEngine
+from ..rules.engine import RuleEngine
+from .registry import EngineImplementation, batch_implementation
+from ..correlation import IncidentCorrelator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Stage name -> (start_ns, end_ns) from time.perf_counter_ns
+StageTimings = Dict[str, Tuple[int, int]]
+
+
+class BatchCommitError(Exception):
+    """
+    Raised by RiskPipeline.score_batch when a stateful stage fails.
+
+    Some events of the batch may already be applied to the correlator and
+    observers, so the batch must not be scored again; the original error is
+    in ``error``.
+    """
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+class ResultObserver(Protocol):
+    """Component notified of every scored event (e.g. RiskNotifier)."""
+
+    def observe(self, risk_input: RiskInput, output: RiskOutput) -> None:
+        ...
+
+
+class RiskPipeline:
+    """
+    Transport-independent scoring core.
+
+    Runs an already-validated RiskInput through the scoring engine and the
+    rule engine and builds the RiskOutput. The HTTP router and the framed
+    socket transport both delegate here so every entry point returns
+    identical results.
+
+    With a correlator, each result also carries the incident its entity is
+    part of. Observers are called with every (input, result) pair once
+    scoring is complete; they must not block, since they run on the request
+    path.
+
+    Callers may pass a ``timings`` dict to record per-stage (start_ns, end_ns)
+    pairs from time.perf_counter_ns for the stages calculate_risk_score,
+    get_risk_level, evaluate_rules, correlate (with a correlator),
+    build_response and (when observers are registered) observers. When it is
+    omitted no clock is read.
+    """
+
+    def __init__(
+        self,
+        scoring_engine: ScoringEngine,
+        rule_engine: RuleEngine,
+        observers: Optional[List[ResultObserver]] = None,
+        implementation: Optional[EngineImplementation] = None,
+        correlator: Optional[IncidentCorrelator] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            scoring_engine: Engine used for the weighted score and risk level
+            rule_engine: Engine used for explainability rules
+            observers: Components notified of every scored event
+            implementation: Batch implementation used by score_batch, normally
+                selected from an EngineRegistry. Defaults to the engines' batch methods.
+            correlator: Groups events by entity into incidents; None disables correlation
+        """
+        self.scoring_engine = scoring_engine
+        self.rule_engine = rule_engine
+        self.implementation = implementation or batch_implementation(scoring_engine, rule_engine)
+        self.observers: List[ResultObserver] = list(observers or [])
+        self.correlator = correlator
+
+    def score(self, risk_input: RiskInput, timings: Optional[StageTimings] = None) -> RiskOutput:
+        """
+        Score a single event.
+
+        Args:
+            risk_input: Validated RiskInput
+            timings: Optional dict that receives per-stage timings
+
+        Returns:
+            RiskOutput with risk score, risk level, breakdown and triggered rules
+        """
+        if timings is not None:
+            try:
+                return self.score_batch([risk_input], timings)[0]
+            except BatchCommitError as e:
+                raise e.error
+
+        severity = risk_input.severity
+        confidence = risk_input.confidence
+        frequency = risk_input.frequency
+        context = risk_input.context
+
+        # Calculate risk score
+        risk_score = self.scoring_engine.calculate_risk_score(severity, confidence, frequency)
+
+        # Determine risk level
+        risk_level = self.scoring_engine.get_risk_level(risk_score)
+
+        # Evaluate rules for explainability
+        triggered_rules = self.rule_engine.evaluate_rules(
+            severity=severity,
+            confidence=confidence,
+            frequency=frequency,
+            context=context,
+        )
+
+        # Correlate with recent events from the same entities
+        incident = None
+        if self.correlator is not None:
+            incident = self.correlator.correlate(risk_input, risk_score, triggered_rules)
+
+        logger.debug(f"Risk calculated: {risk_score:.2f} ({risk_level}), triggered {len(triggered_rules)} rules")
+
+        output = RiskOutput(
+            risk_score=round(risk_score, 2),
+            risk_level=risk_level,
+            breakdown=BreakdownData(
+                severity=severity,
+                confidence=confidence,
+                frequency=frequency,
+            ),
+            triggered_rules=triggered_rules,
+            incident=incident,
+        )
+
+        for observer in self.observers:
+            observer.observe(risk_input, output)
+        return output
+
+    def score_batch(self, risk_inputs: List[RiskInput], timings: Optional[StageTimings] = None) -> List[RiskOutput]:
+        """
+        Score several events through the selected batch implementation.
+
+        Results are identical to calling score() on each input in turn. When
+        the rule engine has entity baselines, which observers update, the
+        batch is split into runs (BaselineStore.batch_runs) and each run is
+        evaluated and applied before the next one is evaluated, so every
+        event sees the baselines of all events before it.
+
+        Scoring runs before any state changes, and so does everything else
+        for the first run. If a later stage fails once state has changed
+        (correlation or observers of any run, or the rules of a later run),
+        BatchCommitError is raised and the batch must not be retried.
+
+        Args:
+            risk_inputs: Validated RiskInput list
+            timings: Optional dict that receives per-stage timings for the whole
+                batch; a stage split over several runs spans from its first
+                start to its last end
+
+        Returns:
+            List of RiskOutput, one per input, in input order
+
+        Raises:
+            BatchCommitError: If a stage failed after state had changed
+        """
+        timed = timings is not None
+        if timed:
+            start = perf_counter_ns()
+
+        rows = [(r.severity, r.confidence, r.frequency) for r in risk_inputs]
+        implementation = self.implementation
+        risk_scores = implementation.calculate_risk_scores(rows)
+        if timed:
+            start = self._mark(timings, "calculate_risk_score", start)
+
+        risk_levels = implementation.get_risk_levels(risk_scores)
+        if timed:
+            start = self._mark(timings, "get_risk_level", start)
+
+        baselines = self.rule_engine.baselines
+        if baselines is None:
+            runs = [(0, len(risk_inputs))]
+        else:
+            runs = baselines.batch_runs([r.context for r in risk_inputs])
+
+        outputs: List[RiskOutput] = []
+        for begin, end in runs:
+            run_inputs = risk_inputs[begin:end]
+            try:
+                triggered = implementation.evaluate_rules_batch(
+                    [(s, c, f, r.context) for (s, c, f), r in zip(rows[begin:end], run_inputs)]
+                )
+                if timed:
+                    start = self._mark(timings, "evaluate_rules", start)
+
+                run_outputs = [
+                    RiskOutput(
+                        risk_score=round(risk_score, 2),
+                        risk_level=risk_level,
+                        breakdown=BreakdownData(
+                            severity=severity,
+                            confidence=confidence,
+                            frequency=frequency,
+                        ),
+                        triggered_rules=triggered_rules,
+                    )
+                    for (severity, confidence, frequency), risk_score, risk_level, triggered_rules
+                    in zip(rows[begin:end], risk_scores[begin:end], risk_levels[begin:end], triggered)
+                ]
+                if timed:
+                    start = self._mark(timings, "build_response", start)
+            except Exception as e:
+                if outputs:
+                    raise BatchCommitError(e) from e
+                raise
+            outputs.extend(run_outputs)
+
+            # State changes start here
+            try:
+                if self.correlator is not None:
+                    incidents = self.correlator.correlate_batch(run_inputs, risk_scores[begin:end], triggered)
+                    for output, incident in zip(run_outputs, incidents):
+                        output.incident = incident
+                    if timed:
+                        start = self._mark(timings, "correlate", start)
+
+                if self.observers:
+                    for observer in self.observers:
+                        for risk_input, output in zip(run_inputs, run_outputs):
+                            observer.observe(risk_input, output)
+                    if timed:
+                        start = self._mark(timings, "observers", start)
+            except Exception as e:
+                raise BatchCommitError(e) from e
+        return outputs
+
+    @staticmethod
+    def _mark(timings: StageTimings, stage: str, start: int) -> int:
+        """Record a finished stage, extending it if it already ran, and return its end time."""
+        end = perf_counter_ns()
+        timings[stage] = (timings[stage][0] if stage in timings else start, end)
+        return end
@@ -0,0 +1,200 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from ..rules.baselines import BaselineStore
+from ..rules.engine import RuleEngine
+from .calculator import ScoringEngine
+from .equivalence import Case, SCORE_EDGES, baseline_cases, find_mismatches, generate_cases, measure_throughput
+import logging
+
+logger = logging.getLogger(__name__)
+
+REFERENCE = "reference"
+
+
+class EngineNotQualifiedError(ValueError):
+    """Raised when selecting an implementation that has not passed qualification."""
+
+
+class EngineImplementation:
+    """
+    One implementation of the three scoring stages, in batch form.
+
+    Every implementation takes whole batches so that vectorized, compiled or
+    cached variants can be swapped in behind RiskPipeline.score_batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        calculate_risk_scores: Callable[[Sequence[Tuple[float, float, float]]], List[float]],
+        get_risk_levels: Callable[[Sequence[float]], List[str]],
+        evaluate_rules_batch: Callable[[Sequence[Case]], List[List[str]]],
+    ):
+        self.name = name
+        self.calculate_risk_scores = calculate_risk_scores
+        self.get_risk_levels = get_risk_levels
+        self.evaluate_rules_batch = evaluate_rules_batch
+
+    def run(self, cases: Sequence[Case]) -> Tuple[List[float], List[str], List[List[str]]]:
+        """Run all three stages over a batch of cases."""
+        scores = self.calculate_risk_scores([(s, c, f) for s, c, f, _ in cases])
+        return scores, self.get_risk_levels(scores), self.evaluate_rules_batch(cases)
+
+
+def reference_implementation(scoring_engine: ScoringEngine, rule_engine: RuleEngine) -> EngineImplementation:
+    """The scalar engine methods, looped; the definition of correct results."""
+    return EngineImplementation(
+        REFERENCE,
+        lambda rows: [scoring_engine.calculate_risk_score(s, c, f) for s, c, f in rows],
+        lambda scores: [scoring_engine.get_risk_level(score) for score in scores],
+        lambda cases: [rule_engine.evaluate_rules(s, c, f, ctx) for s, c, f, ctx in cases],
+    )
+
+
+def batch_implementation(scoring_engine: ScoringEngine, rule_engine: RuleEngine) -> EngineImplementation:
+    """The batched engine methods used by the micro-batcher."""
+    return EngineImplementation(
+        "batch",
+        scoring_engine.calculate_risk_scores,
+        scoring_engine.get_risk_levels,
+        rule_engine.evaluate_rules_batch,
+    )
+
+
+class EngineRegistry:
+    """
+    Registry gating alternative engine implementations.
+
+    An implementation can only be selected after qualify() has shown that it
+    produces bit-identical results to the reference on randomized and
+    edge-case inputs and that its throughput is at least min_speedup times
+    the reference's. When the rule engine has entity baselines, the rules
+    are also compared against a warmed copy of the store, since the live
+    store is usually still empty when qualification runs. Qualification
+    results, including measured throughput, are kept in ``results``.
+    """
+
+    def __init__(self, scoring_engine: ScoringEngine, rule_engine: RuleEngine):
+        """
+        Initialize the registry with the reference and batch implementations.
+
+        Args:
+            scoring_engine: Engine backing the built-in implementations
+            rule_engine: Engine backing the built-in implementations
+        """
+        self.rule_engine = rule_engine
+        self.implementations: Dict[str, EngineImplementation] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.register(reference_implementation(scoring_engine, rule_engine))
+        self.register(batch_implementation(scoring_engine, rule_engine))
+
+    def register(self, implementation: EngineImplementation) -> None:
+        """Add an implementation; it must still be qualified before selection."""
+        self.implementations[implementation.name] = implementation
+        self.results.pop(implementation.name, None)
+
+    def names(self) -> List[str]:
+        return list(self.implementations)
+
+    def qualify(
+        self,
+        name: str,
+        cases: Optional[Sequence[Case]] = None,
+        min_speedup: float = 1.0,
+        repeats: int = 7,
+    ) -> Dict[str, Any]:
+        """
+        Check an implementation against the reference.
+
+        With entity baselines, the rule engine's store is swapped for a
+        warmed one while the baseline-backed cases run, so this must not be
+        called while the engines are scoring live traffic.
+
+        Args:
+            name: Registered implementation name
+            cases: Inputs to compare on; generate_cases() if omitted
+            min_speedup: Required throughput relative to the reference
+            repeats: Timing repetitions (best run counts)
+
+        Returns:
+            Result dict with equivalence, mismatches, throughput and the verdict
+
+        Raises:
+            KeyError: If the implementation is not registered
+        """
+        candidate = self.implementations[name]
+        reference = self.implementations[REFERENCE]
+        if cases is None:
+            cases = generate_cases()
+
+        expected = reference.run(cases)
+        actual = candidate.run(cases)
+        mismatches = []
+        for stage, want, got in zip(("calculate_risk_score", "get_risk_level", "evaluate_rules"), expected, actual):
+            for mismatch in find_mismatches(want, got, cases):
+                mismatches.append(dict(mismatch, stage=stage))
+        edges = list(SCORE_EDGES)
+        for mismatch in find_mismatches(reference.get_risk_levels(edges), candidate.get_risk_levels(edges), edges):
+            mismatches.append(dict(mismatch, stage="get_risk_level"))
+        if self.rule_engine.baselines is not None:
+            for mismatch in self._compare_with_baselines(reference, candidate):
+                mismatches.append(dict(mismatch, stage="evaluate_rules"))
+
+        if name == REFERENCE:
+            (reference_eps,) = measure_throughput([lambda: reference.run(cases)], len(cases), repeats)
+            candidate_eps = reference_eps
+        else:
+            reference_eps, candidate_eps = measure_throughput(
+                [lambda: reference.run(cases), lambda: candidate.run(cases)], len(cases), repeats,
+            )
+        speedup = candidate_eps / reference_eps
+
+        result = {
+            "name": name,
+            "cases": len(cases),
+            "equivalent": not mismatches,
+            "mismatches": mismatches,
+            "events_per_second": candidate_eps,
+            "reference_events_per_second": reference_eps,
+            "speedup": speedup,
+            "qualified": not mismatches and (name == REFERENCE or speedup >= min_speedup),
+        }
+        self.results[name] = result
+        logger.info(
+            f"Engine '{name}': equivalent={result['equivalent']}, "
+            f"{candidate_eps:,.0f} events/s ({speedup:.2f}x reference), qualified={result['qualified']}"
+        )
+        return result
+
+    def _compare_with_baselines(self, reference: EngineImplementation, candidate: EngineImplementation) -> List[dict]:
+        """Compare rule results against a store warmed with baseline_cases() history."""
+        live = self.rule_engine.baselines
+        history, cases = baseline_cases()
+        warmed = BaselineStore(
+            min_samples=live.min_samples,
+            z_threshold=live.z_threshold,
+            min_std=live.min_std,
+            quantile=live.quantile,
+            max_entities=live.max_entities,
+        )
+        for risk_input in history:
+            warmed.observe(risk_input, None)
+        self.rule_engine.baselines = warmed
+        try:
+            expected = reference.evaluate_rules_batch(cases)
+            actual = candidate.evaluate_rules_batch(cases)
+        finally:
+            self.rule_engine.baselines = live
+        return find_mismatches(expected, actual, cases)
+
+    def select(self, name: str) -> EngineImplementation:
+        """
+        Return an implementation for use in the pipeline.
+
+        Raises:
+            KeyError: If the implementation is not registered
+            EngineNotQualifiedError: If it has not passed qualify()
+        """
+        implementation = self.implementations[name]
+        if name != REFERENCE and not self.results.get(name, {}).get("qualified", False):
+            raise EngineNotQualifiedError(f"Engine implementation '{name}' has not qualified against the reference")
+        return implementation
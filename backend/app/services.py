@@ -0,0 +1,157 @@
+from typing import Any, Dict, Optional
+from .scoring import ScoringEngine, RiskPipeline, EngineRegistry, EngineNotQualifiedError
+from .scoring.equivalence import generate_cases
+from .rules import RuleEngine, BaselineStore
+from .notifications import NotificationDispatcher, RiskNotifier, build_sinks
+from .state import SnapshotManager, config_fingerprint
+from .correlation import IncidentCorrelator
+from .stats import RollingStats, StatsPublisher
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringServices:
+    """
+    Scoring core and its stateful components, built from service.yaml.
+
+    Both the HTTP API and the framed transport score through the pipeline
+    built here, so baselines, correlation, notifications, rolling stats and
+    snapshots behave the same on either transport. Request-path concerns
+    (micro-batching, diagnostics, tracing) stay with the transport.
+    """
+
+    def __init__(self, service_config: Dict[str, Any]):
+        """
+        Build every component enabled in the configuration.
+
+        Args:
+            service_config: Settings as returned by load_service_config()
+        """
+        observers = []
+
+        # Per-entity baselines for the deviation rules, updated after each event is scored
+        baselines_config = service_config.get("baselines", {})
+        self.baseline_store: Optional[BaselineStore] = None
+        if baselines_config.get("enabled", False):
+            self.baseline_store = BaselineStore(
+                min_samples=baselines_config.get("min_samples", 20),
+                z_threshold=baselines_config.get("z_threshold", 3.0),
+                min_std=baselines_config.get("min_std", 1.0),
+                quantile=baselines_config.get("quantile", 0.99),
+                max_entities=baselines_config.get("max_entities", 10000),
+            )
+            observers.append(self.baseline_store)
+
+        # Rolling-window score distribution, level mix and rule counters for /stats
+        stats_config = service_config.get("stats", {})
+        self.rolling_stats: Optional[RollingStats] = None
+        self.stats_publisher: Optional[StatsPublisher] = None
+        if stats_config.get("enabled", False):
+            self.rolling_stats = RollingStats(
+                window_minutes=stats_config.get("window_minutes", 60),
+                bucket_seconds=stats_config.get("bucket_seconds", 60),
+            )
+            observers.append(self.rolling_stats)
+            if stats_config.get("shared_dir"):
+                self.stats_publisher = StatsPublisher(
+                    self.rolling_stats,
+                    stats_config["shared_dir"],
+                    interval_seconds=stats_config.get("publish_interval_seconds", 5),
+                )
+
+        self.scoring_engine = ScoringEngine()
+        self.rule_engine = RuleEngine(baselines=self.baseline_store)
+
+        # Risk-level notifications, delivered off the request path
+        notifications_config = service_config.get("notifications", {})
+        self.notification_dispatcher: Optional[NotificationDispatcher] = None
+        self.risk_notifier: Optional[RiskNotifier] = None
+        if notifications_config.get("enabled", False):
+            self.notification_dispatcher = NotificationDispatcher(
+                build_sinks(notifications_config.get("sinks", [])),
+                buffer_size=notifications_config.get("buffer_size", 10000),
+                batch_size=notifications_config.get("batch_size", 100),
+                flush_interval_ms=notifications_config.get("flush_interval_ms", 200),
+                max_retries=notifications_config.get("max_retries", 3),
+                retry_backoff_ms=notifications_config.get("retry_backoff_ms", 100),
+            )
+            self.risk_notifier = RiskNotifier(
+                self.notification_dispatcher,
+                min_level=notifications_config.get("min_level", "CRITICAL"),
+                escalation=notifications_config.get("escalation", True),
+                max_entities=notifications_config.get("max_entities", 10000),
+            )
+            observers.append(self.risk_notifier)
+
+        # Batch implementation; alternatives must match the reference bit-for-bit and be faster
+        engine_config = service_config.get("engine", {})
+        self.engine_registry = EngineRegistry(self.scoring_engine, self.rule_engine)
+        engine_name = engine_config.get("implementation", "batch")
+        try:
+            self.engine_registry.qualify(
+                engine_name,
+                cases=generate_cases(engine_config.get("qualify_cases", 1000)),
+                min_speedup=engine_config.get("min_speedup", 1.0),
+            )
+            self.engine_implementation = self.engine_registry.select(engine_name)
+        except (KeyError, EngineNotQualifiedError) as e:
+            logger.warning(f"Engine implementation '{engine_name}' unavailable ({str(e)}); using reference")
+            self.engine_implementation = self.engine_registry.select("reference")
+
+        # Incident correlation of events from the same user_id / source_ip
+        correlation_config = service_config.get("correlation", {})
+        self.correlator: Optional[IncidentCorrelator] = None
+        if correlation_config.get("enabled", False):
+            self.correlator = IncidentCorrelator(
+                self.scoring_engine.get_risk_level,
+                window_seconds=correlation_config.get("window_seconds", 60),
+                event_weight=correlation_config.get("event_weight", 0.3),
+                rule_weight=correlation_config.get("rule_weight", 0.05),
+                max_entities=correlation_config.get("max_entities", 100000),
+                max_events_per_key=correlation_config.get("max_events_per_key", 10000),
+                max_clock_skew_seconds=correlation_config.get("max_clock_skew_seconds", 300),
+            )
+
+        self.pipeline = RiskPipeline(
+            self.scoring_engine,
+            self.rule_engine,
+            observers=observers,
+            implementation=self.engine_implementation,
+            correlator=self.correlator,
+        )
+
+        # Periodic state snapshots so restarts begin warm
+        snapshots_config = service_config.get("snapshots", {})
+        self.snapshot_manager: Optional[SnapshotManager] = None
+        if snapshots_config.get("enabled", False):
+            self.snapshot_manager = SnapshotManager(
+                snapshots_config.get("path", "riskradar.snapshot"),
+                fingerprint=config_fingerprint(self.scoring_engine.weights, self.scoring_engine.risk_levels),
+                interval_seconds=snapshots_config.get("interval_seconds", 60),
+            )
+            if self.baseline_store is not None:
+                self.snapshot_manager.register("baselines", self.baseline_store)
+            if self.risk_notifier is not None:
+                # Last-seen levels are only meaningful under the same risk bands
+                self.snapshot_manager.register("notification_levels", self.risk_notifier, config_dependent=True)
+
+    def start(self) -> None:
+        """Restore the last snapshot and start background threads."""
+        if self.snapshot_manager is not None:
+            self.snapshot_manager.restore()
+            self.snapshot_manager.start()
+        if self.stats_publisher is not None:
+            self.stats_publisher.start()
+
+    def close(self) -> None:
+        """Write final snapshots and exports and flush queued notifications."""
+        if self.snapshot_manager is not None:
+            # Final snapshot so the next start is warm
+            self.snapshot_manager.close()
+        if self.notification_dispatcher is not None:
+            # Flush queued notifications before exit
+            self.notification_dispatcher.close()
+        if self.stats_publisher is not None:
+            # Leave a final export for the other workers
+            self.stats_publisher.close()
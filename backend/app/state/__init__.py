@@ -0,0 +1,11 @@
+from .snapshot import SnapshotFormatError, SnapshotReader, write_snapshot, config_fingerprint
+from .manager import SnapshotManager, SnapshotProvider
+
+__all__ = [
+    "SnapshotFormatError",
+    "SnapshotReader",
+    "write_snapshot",
+    "config_fingerprint",
+    "SnapshotManager",
+    "SnapshotProvider",
+]
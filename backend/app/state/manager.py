@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol
+from .snapshot import SnapshotFormatError, SnapshotReader, write_snapshot
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Top-level lists longer than this are encoded in pieces, yielding the GIL in between
+ENCODE_CHUNK = 500
+
+
+def encode_section(snapshot: Dict[str, Any]) -> bytes:
+    """
+    Encode a provider snapshot as compact JSON without stalling other threads.
+
+    json.dumps of a large structure runs in C and holds the GIL for its whole
+    duration, which would pause request handling. Long top-level lists are
+    therefore encoded ENCODE_CHUNK items at a time with a GIL release between
+    chunks. The output is identical to json.dumps with compact separators.
+    """
+    separators = (",", ":")
+    parts = []
+    for key, value in snapshot.items():
+        if isinstance(value, list) and len(value) > ENCODE_CHUNK:
+            pieces = []
+            for start in range(0, len(value), ENCODE_CHUNK):
+                pieces.append(json.dumps(value[start:start + ENCODE_CHUNK], separators=separators)[1:-1])
+                time.sleep(0)
+            encoded = "[" + ",".join(pieces) + "]"
+        else:
+            encoded = json.dumps(value, separators=separators)
+        parts.append(json.dumps(key) + ":" + encoded)
+    return ("{" + ",".join(parts) + "}").encode("utf-8")
+
+
+class SnapshotProvider(Protocol):
+    """
+    Stateful component whose state can be captured and restored.
+
+    Providers with large state may also define snapshot_json() returning the
+    encoded snapshot; the manager then uses it instead of encoding snapshot().
+    """
+
+    def snapshot(self) -> Dict[str, Any]:
+        ...
+
+    def restore(self, snapshot: Dict[str, Any]) -> Any:
+        ...
+
+
+class SnapshotManager:
+    """
+    Periodically persists registered component state and restores it on boot.
+
+    Each provider becomes one JSON section of a single versioned snapshot
+    file (see write_snapshot). Writes run on a background thread: providers
+    capture their state, and encoding and file I/O happen outside any
+    request path. Providers registered as config-dependent are only
+    restored when the snapshot was written with the same configuration
+    fingerprint; others are always restored.
+    """
+
+    def __init__(self, path: Path, fingerprint: bytes, interval_seconds: float = 60.0):
+        """
+        Initialize the manager.
+
+        Args:
+            path: Snapshot file location
+            fingerprint: Fingerprint of the current compiled configuration
+            interval_seconds: Time between periodic snapshots
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.interval = interval_seconds
+        self._providers: Dict[str, SnapshotProvider] = {}
+        self._config_dependent: Dict[str, bool] = {}
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.snapshots_written = 0
+        self.last_snapshot_ms: Optional[float] = None
+
+    def register(self, name: str, provider: SnapshotProvider, config_dependent: bool = False) -> None:
+        """
+        Add a component to every snapshot.
+
+        Args:
+            name: Section name in the snapshot file
+            provider: Object with snapshot() and restore()
+            config_dependent: Only restore when the configuration is unchanged
+        """
+        self._providers[name] = provider
+        self._config_dependent[name] = config_dependent
+
+    def restore(self) -> Dict[str, bool]:
+        """
+        Restore every registered provider from the snapshot file.
+
+        A missing, unreadable, corrupt or incompatible snapshot is logged and skipped;
+        start-up then proceeds cold.
+
+        Returns:
+            Provider name -> whether it was restored
+        """
+        restored = {name: False for name in self._providers}
+        try:
+            reader = SnapshotReader(self.path)
+        except FileNotFoundError:
+            logger.info(f"No snapshot at {self.path}; starting cold")
+            return restored
+        except SnapshotFormatError as e:
+            logger.warning(f"Ignoring snapshot: {str(e)}")
+            return restored
+        except OSError as e:
+            logger.warning(f"Cannot read snapshot at {self.path} ({str(e)}); starting cold")
+            return restored
+
+        with reader:
+            same_config = reader.fingerprint == self.fingerprint
+            for name, provider in self._providers.items():
+                if self._config_dependent[name] and not same_config:
+                    logger.info(f"Configuration changed; not restoring {name}")
+                    continue
+                try:
+                    state = reader.json(name)
+                    if state is not None:
+                        provider.restore(state)
+                        restored[name] = True
+                except (ValueError, KeyError, TypeError, IndexError) as e:
+                    logger.warning(f"Could not restore {name} from snapshot: {str(e)}")
+
+        age = time.time() - reader.created_at
+        logger.info(f"Restored {sum(restored.values())}/{len(restored)} components from snapshot taken {age:.0f}s ago")
+        return restored
+
+    def save(self) -> int:
+        """
+        Capture all providers and write the snapshot file now.
+
+        Returns:
+            Size of the written file in bytes
+        """
+        with self._write_lock:
+            start = time.perf_counter()
+            sections = {}
+            for name, provider in self._providers.items():
+                snapshot_json = getattr(provider, "snapshot_json", None)
+                sections[name] = snapshot_json() if snapshot_json is not None else encode_section(provider.snapshot())
+            size = write_snapshot(self.path, sections, self.fingerprint)
+            self.snapshots_written += 1
+            self.last_snapshot_ms = (time.perf_counter() - start) * 1000
+        logger.debug(f"Wrote {size} byte snapshot to {self.path} in {self.last_snapshot_ms:.1f}ms")
+        return size
+
+    def start(self) -> None:
+        """Start periodic snapshots on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"Periodic snapshot failed: {str(e)}")
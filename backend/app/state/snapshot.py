@@ -0,0 +1,172 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+MAGIC = b"RRSNAP\x00\x01"
+FORMAT_VERSION = 1
+
+# magic, format version, reserved flags, created_at (unix seconds), config fingerprint, section count
+HEADER = struct.Struct(">8sHHd32sI")
+# Per section: name length, then the name bytes, then payload offset and length
+INDEX_NAME = struct.Struct(">H")
+INDEX_SPAN = struct.Struct(">QQ")
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a snapshot file is truncated, foreign or of an unsupported version."""
+
+
+def config_fingerprint(*configs: Any) -> bytes:
+    """
+    Fingerprint compiled configuration.
+
+    Args:
+        configs: JSON-serializable configuration objects
+
+    Returns:
+        32-byte SHA-256 digest of their canonical JSON encoding
+    """
+    encoded = json.dumps(configs, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).digest()
+
+
+def write_snapshot(path: Path, sections: Dict[str, bytes], fingerprint: bytes) -> int:
+    """
+    Atomically write a snapshot file.
+
+    Layout: fixed header, section index, then the section payloads. Offsets
+    are absolute so a reader can mmap the file and slice any section
+    without parsing the others. The file is written to a uniquely named
+    temporary file next to the target, fsynced and renamed over it, so
+    readers never see partial data and writers sharing the path (e.g.
+    several workers) never write into each other's file.
+
+    Args:
+        path: Destination file
+        sections: Section name -> payload bytes
+        fingerprint: 32-byte configuration fingerprint
+
+    Returns:
+        Number of bytes written
+    """
+    if len(fingerprint) != 32:
+        raise ValueError("fingerprint must be 32 bytes")
+
+    names = [name.encode("utf-8") for name in sections]
+    index_size = sum(INDEX_NAME.size + len(name) + INDEX_SPAN.size for name in names)
+    offset = HEADER.size + index_size
+
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, time.time(), fingerprint, len(names))]
+    for name, payload in zip(names, sections.values()):
+        parts.append(INDEX_NAME.pack(len(name)) + name + INDEX_SPAN.pack(offset, len(payload)))
+        offset += len(payload)
+    parts.extend(sections.values())
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in parts:
+                f.write(part)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return offset
+
+
+class SnapshotReader:
+    """
+    Memory-mapped read access to a snapshot file.
+
+    Only the header and index are parsed when opening; section payloads are
+    sliced out of the mapping on demand.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open and validate a snapshot file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            SnapshotFormatError: If the file is not a valid snapshot
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotFormatError(f"{self.path} is empty")
+        try:
+            self._parse_index()
+        except (struct.error, UnicodeDecodeError, SnapshotFormatError) as e:
+            self.close()
+            raise SnapshotFormatError(f"{self.path} is not a valid snapshot: {str(e)}")
+
+    def _parse_index(self) -> None:
+        magic, version, _, created_at, fingerprint, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotFormatError("bad magic")
+        if version != FORMAT_VERSION:
+            raise SnapshotFormatError(f"unsupported format version {version}")
+
+        self.created_at = created_at
+        self.fingerprint = fingerprint
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        position = HEADER.size
+        for _ in range(count):
+            (name_length,) = INDEX_NAME.unpack_from(self._map, position)
+            position += INDEX_NAME.size
+            name = bytes(self._map[position:position + name_length]).decode("utf-8")
+            position += name_length
+            offset, length = INDEX_SPAN.unpack_from(self._map, position)
+            position += INDEX_SPAN.size
+            if offset + length > len(self._map):
+                raise SnapshotFormatError(f"section {name} is truncated")
+            self.sections[name] = (offset, length)
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sections)
+
+    def raw(self, name: str) -> Optional[memoryview]:
+        """
+        Zero-copy view of a section payload, or None if absent.
+
+        The view must be released before the reader is closed.
+        """
+        span = self.sections.get(name)
+        if span is None:
+            return None
+        offset, length = span
+        return memoryview(self._map)[offset:offset + length]
+
+    def json(self, name: str) -> Optional[Any]:
+        """Decode a JSON section, or None if absent."""
+        view = self.raw(name)
+        if view is None:
+            return None
+        try:
+            return json.loads(bytes(view))
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
@@ -0,0 +1,4 @@
+from .rolling import RollingStats, DistributionSummary, StatsBucket
+from .publisher import StatsPublisher
+
+__all__ = ["RollingStats", "DistributionSummary", "StatsBucket", "StatsPublisher"]
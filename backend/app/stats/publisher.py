@@ -0,0 +1,84 @@
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .rolling import RollingStats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StatsPublisher:
+    """
+    Shares RollingStats between worker processes through a directory.
+
+    Each worker periodically writes its export() atomically to
+    <directory>/<worker_id>.json and reads every other worker's file when
+    a query needs them. Files of workers that have stopped stay harmless:
+    their buckets fall out of the queried window.
+    """
+
+    def __init__(self, stats: RollingStats, directory: Path, interval_seconds: float = 5.0, worker_id: Optional[str] = None):
+        """
+        Initialize the publisher.
+
+        Args:
+            stats: This worker's statistics
+            directory: Directory shared by all workers (created if missing)
+            interval_seconds: Time between writes of this worker's file
+            worker_id: File name stem; defaults to <hostname>-<pid>
+        """
+        self.stats = stats
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.interval = interval_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.path = self.directory / f"{self.worker_id}.json"
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self) -> None:
+        """Write this worker's buckets now."""
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats.export(), f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def peer_exports(self) -> List[Dict[str, Any]]:
+        """Read the latest export of every other worker, skipping unreadable files."""
+        exports = []
+        for path in sorted(self.directory.glob("*.json")):
+            if path == self.path:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    exports.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read stats from {path}: {str(e)}")
+        return exports
+
+    def start(self) -> None:
+        """Start periodic publishing on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stats-publisher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop publishing and write a final export."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.publish()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish()
+            except Exception as e:
+                logger.error(f"Publishing stats failed: {str(e)}")
@@ -0,0 +1,223 @@
+import math
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from ..models.risk_models import RiskInput, RiskOutput
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fixed-bin histogram of risk_score over [0, 100]; 100 itself falls in the last bin
+HISTOGRAM_BINS = 200
+BIN_WIDTH = 100.0 / HISTOGRAM_BINS
+
+EXPORT_VERSION = 1
+
+
+class StatsBucket:
+    """Counts for the events of one time bucket."""
+
+    __slots__ = ("epoch", "count", "score_sum", "bins", "levels", "rules")
+
+    def __init__(self, epoch: int = -1):
+        self.reset(epoch)
+
+    def reset(self, epoch: int) -> None:
+        """Empty the bucket and assign it to a new time bucket."""
+        self.epoch = epoch
+        self.count = 0
+        self.score_sum = 0.0
+        self.bins = array("L", [0]) * HISTOGRAM_BINS
+        self.levels: Dict[str, int] = {}
+        self.rules: Dict[str, int] = {}
+
+    def to_list(self) -> List[Any]:
+        return [self.epoch, self.count, self.score_sum, list(self.bins), dict(self.levels), dict(self.rules)]
+
+
+class DistributionSummary:
+    """
+    Merged counts over a span of buckets, possibly from several workers.
+
+    Summaries are plain sums, so buckets can be added in any order. Rates
+    are per minute of span_minutes, the time the buckets actually cover,
+    which can exceed the requested minutes by up to one bucket.
+    """
+
+    def __init__(self, minutes: float, span_minutes: Optional[float] = None):
+        self.minutes = minutes
+        self.span_minutes = span_minutes if span_minutes is not None else minutes
+        self.count = 0
+        self.score_sum = 0.0
+        self.bins = [0] * HISTOGRAM_BINS
+        self.levels: Dict[str, int] = {}
+        self.rules: Dict[str, int] = {}
+        self.workers = 0
+
+    def add(self, count: int, score_sum: float, bins: Sequence[int], levels: Dict[str, int], rules: Dict[str, int]) -> None:
+        """Add one bucket's counts."""
+        if not count:
+            return
+        self.count += count
+        self.score_sum += score_sum
+        self.bins = [total + value for total, value in zip(self.bins, bins)]
+        for level, value in levels.items():
+            self.levels[level] = self.levels.get(level, 0) + value
+        for rule, value in rules.items():
+            self.rules[rule] = self.rules.get(rule, 0) + value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Score percentile by linear interpolation inside histogram bins.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Estimated risk score, or None with no events
+        """
+        if self.count == 0:
+            return None
+        target = q / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.bins):
+            if count and cumulative + count >= target:
+                fraction = (target - cumulative) / count
+                return round((index + fraction) * BIN_WIDTH, 2)
+            cumulative += count
+        return 100.0
+
+    def to_dict(self, percentiles: Iterable[float] = (50, 90, 95, 99)) -> Dict[str, Any]:
+        """JSON-compatible view for the stats endpoint."""
+        count = self.count
+        return {
+            "minutes": self.minutes,
+            "span_minutes": round(self.span_minutes, 3),
+            "workers": self.workers,
+            "count": count,
+            "events_per_minute": round(count / self.span_minutes, 3),
+            "mean_score": round(self.score_sum / count, 2) if count else None,
+            "percentiles": {f"p{q:g}": self.percentile(q) for q in percentiles},
+            "levels": {
+                level: {"count": value, "share": round(value / count, 4)}
+                for level, value in sorted(self.levels.items())
+            },
+            "rules": {
+                rule: {
+                    "count": value,
+                    "rate": round(value / count, 4),
+                    "per_minute": round(value / self.span_minutes, 3),
+                }
+                for rule, value in sorted(self.rules.items(), key=lambda item: -item[1])
+            },
+            "histogram": {"bin_width": BIN_WIDTH, "counts": list(self.bins)},
+        }
+
+
+class RollingStats:
+    """
+    Rolling-window distribution of scored events.
+
+    Keeps a ring of time buckets, each with a fixed-bin risk_score
+    histogram, a risk-level mix and per-rule trigger counters. Recording an
+    event touches only the current bucket, so it is O(1) (a bucket is
+    cleared once when the ring wraps onto it). Queries merge the buckets of
+    the last N minutes, so they cost O(buckets x bins) regardless of traffic.
+
+    Buckets can be exported and merged into another worker's query, which
+    is how StatsPublisher combines workers. The instance is a pipeline
+    observer.
+    """
+
+    def __init__(self, window_minutes: int = 60, bucket_seconds: int = 60, clock: Callable[[], float] = time.time):
+        """
+        Initialize the stats.
+
+        Args:
+            window_minutes: Longest span that can be queried
+            bucket_seconds: Time resolution of the ring
+            clock: Wall-clock time source; workers must share it to merge
+        """
+        if window_minutes < 1 or bucket_seconds < 1:
+            raise ValueError("window_minutes and bucket_seconds must be at least 1")
+        self.window_minutes = window_minutes
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        # One bucket beyond the window for the partially filled current bucket
+        self._buckets = [StatsBucket() for _ in range(math.ceil(window_minutes * 60 / bucket_seconds) + 1)]
+        self._lock = threading.Lock()
+
+    def record(self, risk_score: float, risk_level: str, triggered_rules: Sequence[str]) -> None:
+        """Add one scored event to the current bucket."""
+        epoch = int(self.clock() // self.bucket_seconds)
+        index = int(risk_score / BIN_WIDTH) if risk_score > 0 else 0
+        with self._lock:
+            bucket = self._buckets[epoch % len(self._buckets)]
+            if bucket.epoch != epoch:
+                bucket.reset(epoch)
+            bucket.count += 1
+            bucket.score_sum += risk_score
+            bucket.bins[min(index, HISTOGRAM_BINS - 1)] += 1
+            levels = bucket.levels
+            levels[risk_level] = levels.get(risk_level, 0) + 1
+            rules = bucket.rules
+            for rule in triggered_rules:
+                rules[rule] = rules.get(rule, 0) + 1
+
+    def observe(self, risk_input: RiskInput, output: RiskOutput) -> None:
+        """Record a scored event."""
+        self.record(output.risk_score, output.risk_level, output.triggered_rules)
+
+    def summary(self, minutes: Optional[float] = None, exports: Iterable[Dict[str, Any]] = ()) -> DistributionSummary:
+        """
+        Merge the buckets of the last N minutes.
+
+        Args:
+            minutes: Span to cover (defaults to the whole window); rounded up
+                to whole buckets, plus the current partial one
+            exports: Output of export() from other workers to merge in
+
+        Returns:
+            Merged summary
+
+        Raises:
+            ValueError: If minutes is not within the window
+        """
+        if minutes is None:
+            minutes = self.window_minutes
+        if not 0 < minutes <= self.window_minutes:
+            raise ValueError(f"minutes must be in (0, {self.window_minutes}]")
+
+        now = self.clock()
+        newest = int(now // self.bucket_seconds)
+        oldest = newest - math.ceil(minutes * 60 / self.bucket_seconds)
+        summary = DistributionSummary(minutes, (now - oldest * self.bucket_seconds) / 60)
+        summary.workers = 1
+        with self._lock:
+            for bucket in self._buckets:
+                if oldest <= bucket.epoch <= newest:
+                    summary.add(bucket.count, bucket.score_sum, bucket.bins, bucket.levels, bucket.rules)
+
+        for export in exports:
+            if export.get("version") != EXPORT_VERSION or export.get("bucket_seconds") != self.bucket_seconds \
+                    or export.get("bins") != HISTOGRAM_BINS:
+                logger.warning("Skipping incompatible stats export")
+                continue
+            summary.workers += 1
+            for epoch, count, score_sum, bins, levels, rules in export["buckets"]:
+                if oldest <= epoch <= newest:
+                    summary.add(count, score_sum, bins, levels, rules)
+        return summary
+
+    def export(self) -> Dict[str, Any]:
+        """Serialize the non-empty buckets for merging by another worker."""
+        with self._lock:
+            buckets = [bucket.to_list() for bucket in self._buckets if bucket.count]
+        return {
+            "version": EXPORT_VERSION,
+            "bucket_seconds": self.bucket_seconds,
+            "bins": HISTOGRAM_BINS,
+            "exported_at": self.clock(),
+            "buckets": buckets,
+        }
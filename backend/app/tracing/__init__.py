@@ -0,0 +1,14 @@
+from .tracer import Tracer, TraceContext, current_trace, parse_traceparent
+from .exporters import OTLPFileExporter, OTLPHttpExporter, LocalTraceCollector, build_exporters, export_request
+
+__all__ = [
+    "Tracer",
+    "TraceContext",
+    "current_trace",
+    "parse_traceparent",
+    "OTLPFileExporter",
+    "OTLPHttpExporter",
+    "LocalTraceCollector",
+    "build_exporters",
+    "export_request",
+]
@@ -0,0 +1,137 @@
+import json
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List
+from ..notifications import NotificationSink, LocalWebhookReceiver
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCOPE_NAME = "riskradar"
+
+
+def export_request(spans: List[Dict[str, Any]], service_name: str) -> Dict[str, Any]:
+    """
+    Wrap spans in an OTLP/JSON ExportTraceServiceRequest.
+
+    Args:
+        spans: OTLP/JSON spans
+        service_name: Value of the service.name resource attribute
+
+    Returns:
+        Request body accepted by an OpenTelemetry collector's OTLP/HTTP receiver
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+                "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class OTLPFileExporter(NotificationSink):
+    """
+    Appends one OTLP/JSON export request per batch to a JSON Lines file.
+
+    This is the layout written by the collector's file exporter and read by
+    its otlpjsonfile receiver, so the file can be replayed into a collector.
+    """
+
+    name = "file"
+
+    def __init__(self, path: Path, service_name: str = "riskradar"):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: JSON Lines file to append to (created if missing)
+            service_name: Value of the service.name resource attribute
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.service_name = service_name
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def send_batch(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write(json.dumps(export_request(records, self.service_name)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class OTLPHttpExporter(NotificationSink):
+    """POSTs each batch as OTLP/JSON to a collector's /v1/traces endpoint."""
+
+    name = "otlp_http"
+
+    def __init__(self, url: str, service_name: str = "riskradar", timeout: float = 5.0, headers: Dict[str, str] = None):
+        """
+        Initialize the exporter.
+
+        Args:
+            url: Collector endpoint, e.g. http://127.0.0.1:4318/v1/traces
+            service_name: Value of the service.name resource attribute
+            timeout: Request timeout in seconds
+            headers: Extra HTTP headers (e.g. authorization)
+        """
+        self.url = url
+        self.service_name = service_name
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json"}
+        self.headers.update(headers or {})
+
+    def send_batch(self, records: List[Dict[str, Any]]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(export_request(records, self.service_name)).encode("utf-8"),
+            headers=self.headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status >= 300:
+                raise IOError(f"Collector returned HTTP {response.status}")
+
+
+def build_exporters(exporter_configs: List[Dict[str, Any]], service_name: str) -> List[NotificationSink]:
+    """
+    Build exporters from the tracing.exporters section of service.yaml.
+
+    Args:
+        exporter_configs: List of {"type": "file" | "otlp_http", ...options}
+        service_name: Value of the service.name resource attribute
+
+    Returns:
+        Configured exporters
+
+    Raises:
+        ValueError: If an exporter type is unknown
+    """
+    exporters = []
+    for exporter_config in exporter_configs:
+        options = dict(exporter_config)
+        exporter_type = options.pop("type", None)
+        if exporter_type == "file":
+            exporters.append(OTLPFileExporter(service_name=service_name, **options))
+        elif exporter_type == "otlp_http":
+            exporters.append(OTLPHttpExporter(service_name=service_name, **options))
+        else:
+            raise ValueError(f"Unknown trace exporter type: {exporter_type}")
+    return exporters
+
+
+class LocalTraceCollector(LocalWebhookReceiver):
+    """
+    Local stand-in for an OpenTelemetry collector's OTLP/HTTP receiver.
+
+    Keeps every span it receives, flattened out of the export requests, so
+    the HTTP exporter can be exercised without a real collector. Intended
+    for development and tests.
+    """
+
+    def accept(self, payload: Any) -> None:
+        for resource_spans in payload["resourceSpans"]:
+            for scope_spans in resource_spans["scopeSpans"]:
+                self.records.extend(scope_spans["spans"])
@@ -0,0 +1,242 @@
+import random
+from contextvars import ContextVar
+from time import perf_counter_ns, time_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..models.risk_models import RiskOutput
+from ..notifications import NotificationDispatcher
+from ..scoring.pipeline import StageTimings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+# Trace of the request being handled, or None when it is not traced
+current_trace: ContextVar[Optional["TraceContext"]] = ContextVar("current_trace", default=None)
+
+
+def parse_traceparent(header: str) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header.
+
+    Args:
+        header: Value such as "00-<32 hex trace id>-<16 hex span id>-01"
+
+    Returns:
+        (trace_id, parent_span_id, sampled), or None if the header is malformed
+    """
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1].lower(), parts[2].lower(), bool(flags & 1)
+
+
+class TraceContext:
+    """
+    Timing state of one traced request.
+
+    Times are time.perf_counter_ns values; wall_offset converts them to
+    Unix nanoseconds for export. The endpoint fills in the handler times,
+    stage timings and result attributes.
+    """
+
+    __slots__ = (
+        "trace_id", "parent_span_id", "sampled", "name", "start_ns", "wall_offset",
+        "handler_start", "handler_end", "response_start", "status_code", "timings", "result",
+    )
+
+    def __init__(self, trace_id: str, parent_span_id: Optional[str], sampled: bool, name: str):
+        self.trace_id = trace_id
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.name = name
+        self.start_ns = perf_counter_ns()
+        self.wall_offset = time_ns() - self.start_ns
+        self.handler_start: Optional[int] = None
+        self.handler_end: Optional[int] = None
+        self.response_start: Optional[int] = None
+        self.status_code = 0
+        self.timings: StageTimings = {}
+        self.result: Optional[RiskOutput] = None
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode one OTLP/JSON attribute."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    elif isinstance(value, (list, tuple)):
+        encoded = {"arrayValue": {"values": [{"stringValue": str(item)} for item in value]}}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class Tracer:
+    """
+    Request tracing with head- and tail-based sampling.
+
+    A request is traced when its W3C traceparent says so, or (without a
+    parent) with probability sample_ratio; that is the head decision. With
+    latency_threshold_ms set, every request is timed and also exported when
+    it turns out to be at least that slow; that is the tail decision.
+
+    Traced requests produce a server span for the request and child spans
+    for request parsing, each pipeline stage and response serialization, in
+    the OTLP/JSON span format. Spans are handed to a NotificationDispatcher,
+    so export happens on a background thread from a bounded buffer.
+
+    When neither decision can apply, start() returns None after one random
+    draw and the request runs untouched. Without tail sampling (head_only),
+    callers may make the head decision for requests without a parent
+    themselves, drawing from random_source, and only call start() on a hit.
+    With sample_ratio 0 as well, only an incoming sampled traceparent can
+    start a trace; parent_only tells callers they may skip the draw too.
+    """
+
+    def __init__(
+        self,
+        dispatcher: NotificationDispatcher,
+        sample_ratio: float = 0.01,
+        latency_threshold_ms: Optional[float] = None,
+        random_source: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            dispatcher: Delivers finished spans to the exporters
+            sample_ratio: Fraction of requests without a parent that are traced up front
+            latency_threshold_ms: Also export requests at least this slow; None disables
+            random_source: Uniform [0, 1) source for the head decision
+        """
+        if not 0 <= sample_ratio <= 1:
+            raise ValueError("sample_ratio must be in [0, 1]")
+        self.dispatcher = dispatcher
+        self.sample_ratio = sample_ratio
+        self.latency_threshold_ns = None if latency_threshold_ms is None else int(latency_threshold_ms * 1_000_000)
+        self.head_only = latency_threshold_ms is None
+        self.parent_only = sample_ratio == 0 and self.head_only
+        self.random_source = random_source
+
+        self.traces_exported = 0
+
+    def start(
+        self,
+        method: str,
+        path: str,
+        traceparent: Optional[str] = None,
+        sampled: Optional[bool] = None,
+    ) -> Optional[TraceContext]:
+        """
+        Make the head decision for a request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            traceparent: Incoming W3C traceparent header, if any
+            sampled: Head decision the caller already drew for a request
+                without a valid parent; None draws here
+
+        Returns:
+            A TraceContext if the request may be exported, otherwise None
+        """
+        parent = parse_traceparent(traceparent) if traceparent else None
+        if parent is not None:
+            sampled = parent[2]
+        elif sampled is None:
+            sampled = self.random_source() < self.sample_ratio
+        if not sampled and self.latency_threshold_ns is None:
+            return None
+
+        name = f"{method} {path}"
+        if parent is not None:
+            return TraceContext(parent[0], parent[1], sampled, name)
+        return TraceContext(f"{random.getrandbits(128):032x}", None, sampled, name)
+
+    def finish(self, trace: TraceContext) -> bool:
+        """
+        Make the tail decision and export the trace's spans if it is kept.
+
+        Returns:
+            True if the trace was exported
+        """
+        end_ns = perf_counter_ns()
+        if not trace.sampled and end_ns - trace.start_ns < self.latency_threshold_ns:
+            return False
+        for span in self.spans(trace, end_ns):
+            self.dispatcher.emit(span)
+        self.traces_exported += 1
+        return True
+
+    def spans(self, trace: TraceContext, end_ns: int) -> List[Dict[str, Any]]:
+        """
+        Build the OTLP/JSON spans of a finished request.
+
+        Args:
+            trace: Finished request
+            end_ns: perf_counter_ns at the end of the request
+
+        Returns:
+            Server span first, then child spans in start order
+        """
+        offset = trace.wall_offset
+        root_id = _span_id()
+
+        def span(name, start, end, parent_id, kind=SPAN_KIND_INTERNAL, attributes=None, span_id=None):
+            return {
+                "traceId": trace.trace_id,
+                "spanId": span_id or _span_id(),
+                "parentSpanId": parent_id or "",
+                "name": name,
+                "kind": kind,
+                "startTimeUnixNano": str(start + offset),
+                "endTimeUnixNano": str(end + offset),
+                "attributes": [_attribute(key, value) for key, value in (attributes or {}).items()],
+                "status": {"code": STATUS_ERROR if trace.status_code >= 500 else STATUS_UNSET},
+            }
+
+        result = trace.result
+        root_attributes: Dict[str, Any] = {"http.status_code": trace.status_code}
+        if result is not None:
+            root_attributes["riskradar.risk_score"] = result.risk_score
+            root_attributes["riskradar.risk_level"] = result.risk_level
+            root_attributes["riskradar.rule_count"] = len(result.triggered_rules)
+            if result.incident is not None:
+                root_attributes["riskradar.incident_score"] = result.incident.incident_score
+        spans = [span(trace.name, trace.start_ns, end_ns, trace.parent_span_id, SPAN_KIND_SERVER, root_attributes, root_id)]
+
+        # Body read and validation run until the handler starts (or the error response)
+        parse_end = trace.handler_start or trace.response_start or end_ns
+        spans.append(span("request.parse", trace.start_ns, parse_end, root_id))
+
+        for stage, (start, end) in sorted(trace.timings.items(), key=lambda item: item[1][0]):
+            attributes = None
+            if stage == "evaluate_rules" and result is not None:
+                attributes = {
+                    "riskradar.triggered_rules": result.triggered_rules,
+                    "riskradar.rule_count": len(result.triggered_rules),
+                }
+            spans.append(span(stage, start, end, root_id, attributes=attributes))
+
+        if trace.handler_end is not None and trace.response_start is not None:
+            spans.append(span("response.serialize", trace.handler_end, trace.response_start, root_id))
+        return spans
+
+
+def _span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
@@ -0,0 +1,12 @@
+from .protocol import FrameError, encode_frame, decode_header, decode_body
+from .server import FramedScoringServer
+from .client import FramedScoringClient
+
+__all__ = [
+    "FrameError",
+    "encode_frame",
+    "decode_header",
+    "decode_body",
+    "FramedScoringServer",
+    "FramedScoringClient",
+]
@@ -0,0 +1,98 @@
+import socket
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional
+from .protocol import HEADER_SIZE, DEFAULT_MAX_FRAME_BYTES, encode_frame, decode_header, decode_body
+
+
+class FramedScoringClient:
+    """
+    Blocking client for the framed scoring server.
+
+    Keeps a single connection open for its whole lifetime so callers pay
+    the connect cost once. Supports single events, batch frames and
+    pipelining many frames before reading their responses.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9000,
+        unix_path: Optional[str] = None,
+        timeout: Optional[float] = 10.0,
+        max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES,
+    ):
+        """
+        Connect to a framed scoring server.
+
+        Args:
+            host: TCP host (ignored when unix_path is set)
+            port: TCP port (ignored when unix_path is set)
+            unix_path: Unix socket path
+            timeout: Socket timeout in seconds
+            max_frame_bytes: Largest accepted response frame body
+        """
+        if unix_path is not None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(unix_path)
+        else:
+            self._sock = socket.create_connection((host, port), timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        self._ids = count(1)
+        self.max_frame_bytes = max_frame_bytes
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "FramedScoringClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read_frame(self) -> Dict[str, Any]:
+        """Read one response frame."""
+        header = self._file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ConnectionError("Connection closed by server")
+        body = self._file.read(decode_header(header, self.max_frame_bytes))
+        return decode_body(body)
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one raw request frame and wait for its response."""
+        message.setdefault("id", next(self._ids))
+        self._sock.sendall(encode_frame(message))
+        return self._read_frame()
+
+    def score(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a single event; returns the raw response frame."""
+        return self.request({"event": event})
+
+    def score_batch(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Score several events in one batch frame; returns the raw response frame."""
+        return self.request({"events": events})
+
+    def pipeline(self, events: Iterable[Dict[str, Any]], window: int = 256) -> List[Dict[str, Any]]:
+        """
+        Send one frame per event without waiting, then collect the responses.
+
+        Frames are written in windows so that neither side's socket buffers
+        can fill up while the other is blocked writing.
+
+        Args:
+            events: Events to score
+            window: Maximum number of frames in flight
+
+        Returns:
+            Response frames in request order
+        """
+        frames = [encode_frame({"id": next(self._ids), "event": event}) for event in events]
+        responses = []
+        for start in range(0, len(frames), window):
+            chunk = frames[start:start + window]
+            self._sock.sendall(b"".join(chunk))
+            responses.extend(self._read_frame() for _ in chunk)
+        return responses
@@ -0,0 +1,70 @@
+import json
+import struct
+from typing import Any, Dict
+
+# Every frame is a 4-byte big-endian unsigned length followed by a UTF-8 JSON body.
+HEADER = struct.Struct(">I")
+HEADER_SIZE = HEADER.size
+
+# Default cap on a single frame body; protects the server from unbounded reads.
+DEFAULT_MAX_FRAME_BYTES = 4 * 1024 * 1024
+
+
+class FrameError(ValueError):
+    """Raised when a frame is malformed or exceeds the configured size limit."""
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """
+    Encode a message as a length-prefixed JSON frame.
+
+    Args:
+        message: JSON-serializable message
+
+    Returns:
+        Frame bytes (header + body)
+    """
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+def decode_header(header: bytes, max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES) -> int:
+    """
+    Decode a frame header and validate the announced body length.
+
+    Args:
+        header: Exactly HEADER_SIZE bytes
+        max_frame_bytes: Largest body accepted
+
+    Returns:
+        Body length in bytes
+
+    Raises:
+        FrameError: If the announced length exceeds max_frame_bytes
+    """
+    (length,) = HEADER.unpack(header)
+    if length > max_frame_bytes:
+        raise FrameError(f"Frame of {length} bytes exceeds limit of {max_frame_bytes}")
+    return length
+
+
+def decode_body(body: bytes) -> Dict[str, Any]:
+    """
+    Decode a frame body into a message.
+
+    Args:
+        body: UTF-8 JSON body
+
+    Returns:
+        Decoded message
+
+    Raises:
+        FrameError: If the body is not a JSON object
+    """
+    try:
+        message = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise FrameError(f"Invalid frame body: {str(e)}")
+    if not isinstance(message, dict):
+        raise FrameError("Frame body must be a JSON object")
+    return message
@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from ..models.risk_models import RiskInput
+from ..scoring import RiskPipeline
+from .protocol import (
+    HEADER_SIZE,
+    DEFAULT_MAX_FRAME_BYTES,
+    FrameError,
+    encode_frame,
+    decode_header,
+    decode_body,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _error(status: int, detail: str) -> Dict[str, Any]:
+    """Build an error payload mirroring the HTTP status codes used by the API."""
+    return {"status": status, "detail": detail}
+
+
+class FramedScoringServer:
+    """
+    Length-prefixed framed scoring server over TCP or a Unix socket.
+
+    Intended for internal high-throughput callers that do not need HTTP.
+    Connections are persistent, and clients may pipeline any number of
+    frames before reading; responses are written back in request order and
+    echo the request "id".
+
+    Request frames:
+        {"id": 1, "event": {...RiskInput...}}
+        {"id": 2, "events": [{...}, {...}]}
+        {"id": 3, "op": "ping"}
+
+    Response frames:
+        {"id": 1, "result": {...RiskOutput...}}
+        {"id": 2, "results": [{...RiskOutput...} | {"error": {...}}, ...]}
+        {"id": 3, "pong": true}
+        {"id": 4, "error": {"status": 422, "detail": "..."}}
+    """
+
+    def __init__(self, pipeline: RiskPipeline, max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES):
+        """
+        Initialize the server.
+
+        Args:
+            pipeline: Scoring core shared with the HTTP API
+            max_frame_bytes: Largest accepted request frame body
+        """
+        self.pipeline = pipeline
+        self.max_frame_bytes = max_frame_bytes
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 9000) -> asyncio.AbstractServer:
+        """Start listening on a TCP address."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        logger.info(f"Framed scoring server listening on {host}:{port}")
+        return self._server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Start listening on a Unix domain socket."""
+        self._server = await asyncio.start_unix_server(self._handle_connection, path)
+        logger.info(f"Framed scoring server listening on unix:{path}")
+        return self._server
+
+    async def close(self) -> None:
+        """Stop accepting connections and wait for the listener to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process one decoded request frame.
+
+        Args:
+            message: Decoded request
+
+        Returns:
+            Response message
+        """
+        request_id = message.get("id")
+        try:
+            if "events" in message:
+                return {"id": request_id, "results": self._score_batch(message["events"])}
+            if "event" in message:
+                risk_input = RiskInput.model_validate(message["event"])
+                return {"id": request_id, "result": self.pipeline.score(risk_input).model_dump(mode="json", exclude_none=True)}
+            if message.get("op") == "ping":
+                return {"id": request_id, "pong": True}
+            return {"id": request_id, "error": _error(400, "Frame must contain 'event', 'events' or 'op'")}
+        except ValueError as e:
+            return {"id": request_id, "error": _error(422, str(e))}
+        except Exception as e:
+            logger.error(f"Unexpected error during framed risk calculation: {str(e)}")
+            return {"id": request_id, "error": _error(500, "Internal server error")}
+
+    def _score_batch(self, events: List[Any]) -> List[Dict[str, Any]]:
+        """Validate each event independently and score the valid ones in one batch."""
+        if not isinstance(events, list):
+            raise ValueError("'events' must be a list")
+
+        results: List[Dict[str, Any]] = [None] * len(events)
+        valid_positions = []
+        valid_inputs = []
+        for position, event in enumerate(events):
+            try:
+                valid_inputs.append(RiskInput.model_validate(event))
+                valid_positions.append(position)
+            except ValidationError as e:
+                results[position] = {"error": _error(422, str(e))}
+
+        for position, output in zip(valid_positions, self.pipeline.score_batch(valid_inputs)):
+            results[position] = output.model_dump(mode="json", exclude_none=True)
+        return results
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve frames on one persistent connection until the peer disconnects."""
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER_SIZE)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    length = decode_header(header, self.max_frame_bytes)
+                    message = decode_body(await reader.readexactly(length))
+                except FrameError as e:
+                    # The stream cannot be resynchronized after a bad frame
+                    writer.write(encode_frame({"id": None, "error": _error(400, str(e))}))
+                    await writer.drain()
+                    break
+
+                writer.write(encode_frame(self.handle_message(message)))
+                # Returns immediately unless the peer stops reading (backpressure)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def main() -> None:
+    """Run the framed scoring server from the command line."""
+    import argparse
+    from ..config import load_service_config
+    from ..services import ScoringServices
+
+    parser = argparse.ArgumentParser(description="RiskRadar framed scoring server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--unix", default=None, help="Listen on a Unix socket path instead of TCP")
+    parser.add_argument("--max-frame-bytes", type=int, default=DEFAULT_MAX_FRAME_BYTES)
+    parser.add_argument("--config", default=None, help="Path to service.yaml (defaults to backend/config/service.yaml)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    # Same scoring core and stateful components as the HTTP API
+    services = ScoringServices(load_service_config(args.config))
+    server = FramedScoringServer(services.pipeline, max_frame_bytes=args.max_frame_bytes)
+
+    async def run() -> None:
+        listener = await (server.start_unix(args.unix) if args.unix else server.start(args.host, args.port))
+        async with listener:
+            await listener.serve_forever()
+
+    services.start()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        services.close()
+
+
+if __name__ == "__main__":
+    main()
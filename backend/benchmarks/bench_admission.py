@@ -0,0 +1,70 @@
+"""
+Overhead benchmark for admission control.
+
+Drives a trivial ASGI app directly and through AdmissionControlMiddleware
+with many distinct clients, and reports the added cost per request.
+
+Usage (from backend/):
+    python benchmarks/bench_admission.py --requests 200000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.admission import AdmissionController, AdmissionControlMiddleware
+
+
+async def _inner_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _drive(app, requests: int, clients: int) -> float:
+    scopes = [
+        {
+            "type": "http",
+            "path": "/calculate-risk",
+            "headers": [(b"x-client-id", f"client-{i}".encode()), (b"x-priority", b"normal")],
+            "client": ("127.0.0.1", 50000),
+        }
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scopes[i % clients], _receive, _send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--clients", type=int, default=5000)
+    args = parser.parse_args()
+
+    controller = AdmissionController(rate_per_second=1e9, burst=1e9, max_clients=args.clients)
+    limited = AdmissionControlMiddleware(_inner_app, controller=controller, trust_client_headers=True)
+
+    baseline = asyncio.run(_drive(_inner_app, args.requests, args.clients))
+    with_admission = asyncio.run(_drive(limited, args.requests, args.clients))
+
+    overhead_us = (with_admission - baseline) * 1e6 / args.requests
+    print(f"baseline          {baseline * 1e6 / args.requests:8.2f} us/request")
+    print(f"with admission    {with_admission * 1e6 / args.requests:8.2f} us/request")
+    print(f"overhead          {overhead_us:8.2f} us/request  ({args.clients} clients)")
+    print(f"controller stats  {controller.stats}")
+
+
+if __name__ == "__main__":
+    main()
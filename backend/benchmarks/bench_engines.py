@@ -0,0 +1,43 @@
+"""
+Differential check and throughput table for registered engine implementations.
+
+Every implementation is compared bit-for-bit against the reference on
+randomized and edge-case inputs, then timed on the same cases.
+
+Usage (from backend/):
+    python benchmarks/bench_engines.py --cases 20000
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.rules import RuleEngine
+from app.scoring import ScoringEngine, EngineRegistry
+from app.scoring.equivalence import generate_cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-speedup", type=float, default=1.0)
+    args = parser.parse_args()
+
+    registry = EngineRegistry(ScoringEngine(), RuleEngine())
+    cases = generate_cases(args.cases, seed=args.seed)
+
+    print(f"{'implementation':<16} {'equivalent':>10} {'events/s':>12} {'speedup':>8} {'qualified':>10}")
+    for name in registry.names():
+        result = registry.qualify(name, cases=cases, min_speedup=args.min_speedup)
+        print(
+            f"{name:<16} {str(result['equivalent']):>10} {result['events_per_second']:>12,.0f} "
+            f"{result['speedup']:>7.2f}x {str(result['qualified']):>10}"
+        )
+        for mismatch in result["mismatches"][:3]:
+            print(f"    {mismatch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Overhead benchmark for request tracing.
+
+Drives a trivial ASGI app directly and through TracingMiddleware with
+tracing unsampled (sample_ratio 0, and a head-sampling miss) and fully
+sampled, and reports the added cost per request as the best of --repeat runs.
+Unsampled requests are checked against --target-us (sub-microsecond by
+default).
+
+Usage (from backend/):
+    python benchmarks/bench_tracing.py --requests 200000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.tracing import TracingMiddleware
+from app.notifications import NotificationDispatcher, NotificationSink
+from app.tracing import Tracer
+
+
+class _DiscardSink(NotificationSink):
+    def send_batch(self, records):
+        pass
+
+
+async def _inner_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _drive(app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/calculate-risk",
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json"), (b"x-client-id", b"client-1")],
+    }
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, _receive, _send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-us", type=float, default=1.0, help="Overhead target for unsampled requests")
+    args = parser.parse_args()
+
+    dispatcher = NotificationDispatcher([_DiscardSink()], buffer_size=1_000_000, batch_size=1024)
+    apps = {
+        "unsampled": TracingMiddleware(_inner_app, tracer=Tracer(dispatcher, sample_ratio=0.0)),
+        "head miss": TracingMiddleware(_inner_app, tracer=Tracer(dispatcher, sample_ratio=1e-12)),
+        "sampled": TracingMiddleware(_inner_app, tracer=Tracer(dispatcher, sample_ratio=1.0)),
+    }
+
+    best = lambda app: min(asyncio.run(_drive(app, args.requests)) for _ in range(args.repeat))
+    per_request = lambda seconds: seconds * 1e6 / args.requests
+    baseline = best(_inner_app)
+    print(f"baseline          {per_request(baseline):8.3f} us/request")
+    for name, app in apps.items():
+        elapsed = best(app)
+        overhead = per_request(elapsed - baseline)
+        verdict = ""
+        if name != "sampled":
+            verdict = "  within target" if overhead < args.target_us else "  ABOVE TARGET"
+        print(f"{name:<17} {per_request(elapsed):8.3f} us/request  (overhead {overhead:.3f} us){verdict}")
+    dispatcher.close()
+    print(f"dispatcher stats  {dispatcher.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Local throughput benchmark for the framed scoring transport.
+
+Starts an in-process framed server on a Unix socket (or TCP with --tcp)
+and measures events/second for one-frame-per-round-trip, pipelined frames
+and batch frames over a single reused connection.
+
+Usage (from backend/):
+    python benchmarks/bench_transport.py --events 20000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.rules import RuleEngine
+from app.scoring import ScoringEngine, RiskPipeline
+from app.transport import FramedScoringServer, FramedScoringClient
+
+
+def _events(n: int) -> list:
+    return [
+        {
+            "severity": (i * 7) % 101,
+            "confidence": (i * 13) % 101,
+            "frequency": (i * 17) % 101,
+            "context": {"failed_logins": i % 9, "is_privileged": i % 5 == 0},
+        }
+        for i in range(n)
+    ]
+
+
+def _report(label: str, n: int, elapsed: float) -> None:
+    print(f"{label:<28} {n / elapsed:>12,.0f} events/s  ({elapsed * 1e6 / n:.1f} us/event)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--tcp", action="store_true", help="Use TCP on 127.0.0.1 instead of a Unix socket")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    server = FramedScoringServer(RiskPipeline(ScoringEngine(), RuleEngine()))
+    tmpdir = tempfile.mkdtemp()
+    if args.tcp:
+        listener = loop.run_until_complete(server.start("127.0.0.1", 0))
+        client_args = {"host": "127.0.0.1", "port": listener.sockets[0].getsockname()[1]}
+    else:
+        path = os.path.join(tmpdir, "riskradar.sock")
+        loop.run_until_complete(server.start_unix(path))
+        client_args = {"unix_path": path}
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    events = _events(args.events)
+    with FramedScoringClient(**client_args) as client:
+        start = time.perf_counter()
+        for event in events:
+            client.score(event)
+        _report("request/response", len(events), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        client.pipeline(events)
+        _report("pipelined", len(events), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(0, len(events), args.batch_size):
+            client.score_batch(events[i:i + args.batch_size])
+        _report(f"batch frames ({args.batch_size})", len(events), time.perf_counter() - start)
+
+    loop.call_soon_threadsafe(loop.stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -7,7 +8,12 @@ from pathlib import Path
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.api.routes import router
+from app.api import routes
+from app.api.routes import router, service_config, slow_log
+from app.api.diagnostics import router as diagnostics_router
+from app.api.admission import AdmissionController, AdmissionControlMiddleware
+from app.api.tracing import TracingMiddleware
+from app.api.stats import router as stats_router
 import logging
 
 # Configure logging
@@ -17,13 +23,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start-up and shutdown hooks for stateful components."""
+    routes.services.start()
+    
+    yield
+    
+    routes.services.close()
+    if routes.trace_dispatcher is not None:
+        # Export buffered spans before exit
+        routes.trace_dispatcher.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="RiskRadar",
     description="Explainable security risk scoring engine v1.0",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Add request tracing inside admission control, so queueing for a slot is not traced
+if routes.tracer is not None:
+    app.add_middleware(TracingMiddleware, tracer=routes.tracer)
+
+# Add per-client rate limiting and load shedding for the scoring endpoint
+admission_config = dict(service_config.get("admission", {}))
+if admission_config.pop("enabled", False):
+    trust_client_headers = admission_config.pop("trust_client_headers", False)
+    trusted_proxies = admission_config.pop("trusted_proxies", None) or ()
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        controller=AdmissionController(**admission_config),
+        trust_client_headers=trust_client_headers,
+        trusted_proxies=trusted_proxies,
+    )
+
 # Add CORS middleware for local development
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +72,10 @@ app.add_middleware(
 
 # Include routes
 app.include_router(router)
+if slow_log is not None:
+    app.include_router(diagnostics_router)
+if routes.rolling_stats is not None:
+    app.include_router(stats_router)
 
 
 @app.get("/")
@@ -0,0 +1,200 @@
+import pytest
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.admission import AdmissionController, AdmissionControlMiddleware
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdmissionController:
+    """Test suite for the AdmissionController."""
+
+    def test_token_bucket_burst_and_refill(self):
+        """Test that a client gets its burst, then refills at the configured rate."""
+        clock = FakeClock()
+        controller = AdmissionController(rate_per_second=10, burst=3, clock=clock)
+        assert [controller.check_rate("a") for _ in range(3)] == [None, None, None]
+        wait = controller.check_rate("a")
+        assert wait == pytest.approx(0.1)
+
+        clock.now = 0.1
+        assert controller.check_rate("a") is None
+        assert controller.rate_limited == 1
+
+    def test_clients_are_independent(self):
+        """Test that one client exhausting its bucket does not affect others."""
+        controller = AdmissionController(rate_per_second=1, burst=1, clock=FakeClock())
+        assert controller.check_rate("a") is None
+        assert controller.check_rate("a") is not None
+        assert controller.check_rate("b") is None
+
+    def test_client_table_is_bounded(self):
+        """Test that the least recently seen clients are evicted."""
+        controller = AdmissionController(max_clients=100, clock=FakeClock())
+        for i in range(1000):
+            controller.check_rate(f"client-{i}")
+        assert controller.stats["clients"] == 100
+
+    def test_low_priority_shed_first(self):
+        """Test that a filling queue sheds low, then normal, then high priority."""
+        controller = AdmissionController(max_concurrent=1, max_queue=4, max_queue_wait_ms=5000)
+
+        async def run():
+            assert await controller.acquire("normal")
+            waiters = [asyncio.ensure_future(controller.acquire("high")) for _ in range(2)]
+            await asyncio.sleep(0)
+            # Queue holds 2 of 4: low (share 0.5) is now shed, normal still queues
+            assert await controller.acquire("low") is False
+            waiters.append(asyncio.ensure_future(controller.acquire("normal")))
+            await asyncio.sleep(0)
+            # Queue holds 3 of 4: normal (share 0.75) is shed, high still queues
+            assert await controller.acquire("normal") is False
+            waiters.append(asyncio.ensure_future(controller.acquire("high")))
+            await asyncio.sleep(0)
+            assert controller.queued == 4
+
+            for _ in range(len(waiters) + 1):
+                controller.release()
+            assert all(await asyncio.gather(*waiters))
+
+        asyncio.run(run())
+        assert controller.shed == 2
+        assert controller.active == 0
+        assert controller.queued == 0
+
+    def test_release_prefers_high_priority(self):
+        """Test that a freed slot goes to the highest-priority waiter."""
+        controller = AdmissionController(max_concurrent=1, max_queue=10, max_queue_wait_ms=5000)
+        order = []
+
+        async def waiter(priority):
+            await controller.acquire(priority)
+            order.append(priority)
+
+        async def run():
+            await controller.acquire("normal")
+            tasks = [asyncio.ensure_future(waiter(p)) for p in ("low", "normal", "high")]
+            await asyncio.sleep(0)
+            for _ in range(4):
+                controller.release()
+                await asyncio.sleep(0)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert order == ["high", "normal", "low"]
+
+    def test_queue_wait_timeout(self):
+        """Test that requests waiting too long are shed and leave the queue."""
+        controller = AdmissionController(max_concurrent=1, max_queue=10, max_queue_wait_ms=10)
+
+        async def run():
+            await controller.acquire("normal")
+            assert await controller.acquire("high") is False
+
+        asyncio.run(run())
+        assert controller.queued == 0
+        assert controller.shed == 1
+
+    def test_unknown_priority_is_normal(self):
+        """Test priority normalization."""
+        assert AdmissionController.normalize_priority("HIGH") == "high"
+        assert AdmissionController.normalize_priority("urgent") == "normal"
+        assert AdmissionController.normalize_priority(None) == "normal"
+
+
+class TestAdmissionMiddleware:
+    """Test suite for the AdmissionControlMiddleware."""
+
+    @staticmethod
+    def _app(**options):
+        """Create an app with a tiny rate limit on /calculate-risk."""
+        app = FastAPI()
+
+        @app.post("/calculate-risk")
+        def score():
+            return {"ok": True}
+
+        @app.get("/health")
+        def health():
+            return {"status": "healthy"}
+
+        controller = AdmissionController(rate_per_second=0.5, burst=2)
+        app.add_middleware(AdmissionControlMiddleware, controller=controller, **options)
+        return TestClient(app), controller
+
+    @pytest.fixture
+    def client(self):
+        return self._app(trust_client_headers=True)[0]
+
+    def test_rate_limited_with_retry_after(self, client):
+        """Test that exceeding the limit returns 429 with Retry-After."""
+        headers = {"X-Client-Id": "pipeline-1"}
+        assert client.post("/calculate-risk", headers=headers).status_code == 200
+        assert client.post("/calculate-risk", headers=headers).status_code == 200
+        response = client.post("/calculate-risk", headers=headers)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+        # Another client is unaffected
+        assert client.post("/calculate-risk", headers={"X-Client-Id": "pipeline-2"}).status_code == 200
+
+    def test_health_never_limited(self, client):
+        """Test that /health bypasses admission control."""
+        for _ in range(10):
+            client.post("/calculate-risk")
+        for _ in range(10):
+            assert client.get("/health").status_code == 200
+
+    def test_client_id_ignored_from_untrusted_peer(self):
+        """Test that rotating X-Client-Id does not bypass the per-peer limit."""
+        client, _ = self._app()
+        statuses = [
+            client.post("/calculate-risk", headers={"X-Client-Id": f"rotating-{i}"}).status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+
+    def test_trusted_proxy_headers_honoured(self, monkeypatch):
+        """Test that a trusted proxy's X-Client-Id and X-Priority are used."""
+        client, controller = self._app(trusted_proxies=["testclient"])
+        priorities = []
+        acquire = controller.acquire
+
+        async def spy(priority):
+            priorities.append(priority)
+            return await acquire(priority)
+
+        monkeypatch.setattr(controller, "acquire", spy)
+        for i in range(3):
+            headers = {"X-Client-Id": f"client-{i}", "X-Priority": "high"}
+            assert client.post("/calculate-risk", headers=headers).status_code == 200
+        assert priorities == ["high"] * 3
+
+    def test_priority_ignored_from_untrusted_peer(self, monkeypatch):
+        """Test that a self-declared X-Priority is ignored by default."""
+        client, controller = self._app(trusted_proxies=["10.0.0.1"])
+        priorities = []
+        acquire = controller.acquire
+
+        async def spy(priority):
+            priorities.append(priority)
+            return await acquire(priority)
+
+        monkeypatch.setattr(controller, "acquire", spy)
+        client.post("/calculate-risk", headers={"X-Priority": "high"})
+        assert priorities == ["normal"]
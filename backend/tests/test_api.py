@@ -171,6 +171,8 @@ class TestAPIEndpoints:
         assert "risk_level" in data
         assert "breakdown" in data
         assert "triggered_rules" in data
+        # Incidents are only reported when correlation is enabled
+        assert "incident" not in data
         
         # Check breakdown structure
         assert "severity" in data["breakdown"]
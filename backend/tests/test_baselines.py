@@ -0,0 +1,203 @@
+import pytest
+import json
+import random
+import statistics
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput, ContextData
+from app.rules import RuleEngine, BaselineStore, MetricStats
+from app.scoring import ScoringEngine, RiskPipeline
+
+USER_RULE = "Anomalous activity for user"
+IP_RULE = "Anomalous activity from source IP"
+
+
+def _event(severity, frequency=50, failed_logins=0, user_id="alice", source_ip="10.0.0.1"):
+    return RiskInput(
+        severity=severity,
+        confidence=60,
+        frequency=frequency,
+        context=ContextData(failed_logins=failed_logins, user_id=user_id, source_ip=source_ip),
+    )
+
+
+class TestMetricStats:
+    """Test suite for MetricStats."""
+
+    def test_welford_matches_statistics(self):
+        """Test that streaming mean and std match a batch computation."""
+        rng = random.Random(7)
+        values = [rng.uniform(0, 100) for _ in range(500)]
+        stats = MetricStats()
+        for value in values:
+            stats.update(value)
+        assert stats.count == 500
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.std == pytest.approx(statistics.stdev(values))
+
+    def test_quantiles(self):
+        """Test histogram quantiles stay within one bin of the truth."""
+        stats = MetricStats()
+        for value in range(101):
+            stats.update(value)
+        assert stats.quantile(0.5) == pytest.approx(50, abs=4)
+        assert stats.quantile(0.9) == pytest.approx(90, abs=4)
+        assert MetricStats().quantile(0.5) is None
+
+    def test_count_metric_quantiles(self):
+        """Test that failed-login counts get unit-wide bins."""
+        stats = MetricStats(upper=25)
+        for value in [0] * 50 + [1] * 30 + [3] * 15 + [8] * 5:
+            stats.update(value)
+        assert stats.quantile(0.5) == pytest.approx(0, abs=1)
+        assert stats.quantile(0.9) == pytest.approx(3, abs=1)
+        assert stats.quantile(0.99) == pytest.approx(8, abs=1)
+        stats.update(400)
+        assert stats.quantile(1.0) == 25
+
+    def test_store_sizes_bins_per_metric(self):
+        """Test that the store uses count-sized bins for failed logins."""
+        store = BaselineStore()
+        store.observe(_event(50, failed_logins=3), None)
+        metrics = store.get("user_id", "alice")
+        assert metrics["severity"].upper == 100
+        assert metrics["failed_logins"].upper == 25
+        restored = BaselineStore()
+        restored.restore(store.snapshot())
+        assert restored.get("user_id", "alice")["failed_logins"].bins == metrics["failed_logins"].bins
+
+    def test_state_is_fixed_size(self):
+        """Test that state does not grow with observations."""
+        stats = MetricStats()
+        before = len(stats.bins)
+        for value in range(10000):
+            stats.update(value % 250)
+        assert len(stats.bins) == before
+
+
+class TestBaselineRules:
+    """Test suite for the deviation rules backed by a BaselineStore."""
+
+    @pytest.fixture
+    def store(self):
+        return BaselineStore(min_samples=20, z_threshold=3.0)
+
+    @pytest.fixture
+    def pipeline(self, store):
+        return RiskPipeline(ScoringEngine(), RuleEngine(baselines=store), observers=[store])
+
+    def _warm_up(self, pipeline, count=50, **kwargs):
+        rng = random.Random(1)
+        for _ in range(count):
+            pipeline.score(_event(rng.uniform(20, 30), **kwargs))
+
+    def test_rules_only_added_with_baselines(self, store):
+        """Test that deviation rules exist only when a store is given."""
+        assert USER_RULE not in [r["name"] for r in RuleEngine().rules]
+        assert USER_RULE in [r["name"] for r in RuleEngine(baselines=store).rules]
+
+    def test_no_trigger_without_history(self, pipeline):
+        """Test that new entities are never anomalous."""
+        assert USER_RULE not in pipeline.score(_event(95)).triggered_rules
+
+    def test_deviation_triggers(self, pipeline):
+        """Test that a spike relative to the entity baseline triggers both rules."""
+        self._warm_up(pipeline)
+        output = pipeline.score(_event(70))
+        assert USER_RULE in output.triggered_rules
+        assert IP_RULE in output.triggered_rules
+        # A fixed threshold would not have fired
+        assert "High-severity event detected" not in output.triggered_rules
+
+    def test_normal_event_does_not_trigger(self, pipeline):
+        """Test that an in-range event is not anomalous."""
+        self._warm_up(pipeline)
+        assert USER_RULE not in pipeline.score(_event(27)).triggered_rules
+
+    def test_baselines_are_per_entity(self, pipeline):
+        """Test that one entity's history does not affect another."""
+        self._warm_up(pipeline)
+        output = pipeline.score(_event(70, user_id="bob", source_ip="10.0.0.1"))
+        assert USER_RULE not in output.triggered_rules
+        assert IP_RULE in output.triggered_rules
+
+    def test_min_std_floor(self, pipeline):
+        """Test that constant history needs a real jump, not a tiny change."""
+        for _ in range(30):
+            pipeline.score(_event(25, failed_logins=0))
+        assert USER_RULE not in pipeline.score(_event(25, failed_logins=2)).triggered_rules
+        assert USER_RULE in pipeline.score(_event(25, failed_logins=4)).triggered_rules
+
+    def test_entity_table_is_bounded(self):
+        """Test that the LRU bound is enforced."""
+        store = BaselineStore(max_entities=5)
+        for i in range(20):
+            store.observe(_event(10, user_id=f"u{i}", source_ip=None), None)
+        assert len(store) == 5
+        assert store.get("user_id", "u19") is not None
+        assert store.get("user_id", "u0") is None
+
+    def test_snapshot_restore(self, pipeline, store):
+        """Test that baselines survive a snapshot/restore round trip."""
+        self._warm_up(pipeline)
+        snapshot = store.snapshot()
+        assert json.loads(store.snapshot_json()) == snapshot
+
+        restored = BaselineStore(min_samples=20, z_threshold=3.0)
+        assert restored.restore(snapshot) == 2
+        original = store.get("user_id", "alice")["severity"]
+        copy = restored.get("user_id", "alice")["severity"]
+        assert (copy.count, copy.mean, copy.m2, list(copy.bins)) == (original.count, original.mean, original.m2, list(original.bins))
+
+        engine = RuleEngine(baselines=restored)
+        assert USER_RULE in engine.evaluate_rules(70, 60, 50, _event(70).context)
+
+    def test_routine_spikes_are_not_anomalous(self, store, pipeline):
+        """Test that values above the z-score threshold but within the entity's usual range do not fire."""
+        for index in range(100):
+            pipeline.score(_event(90 if index % 20 == 0 else 10))
+        metric = store.get("user_id", "alice")["severity"]
+        assert (90 - metric.mean) / metric.std >= store.z_threshold
+        assert USER_RULE not in pipeline.score(_event(90)).triggered_rules
+        assert USER_RULE in pipeline.score(_event(99)).triggered_rules
+
+    @pytest.mark.parametrize("size", [1, 2, 5])
+    def test_batch_matches_one_at_a_time(self, size):
+        """Test that batched scoring sees the baselines of earlier events in the same batch."""
+        def pipeline():
+            store = BaselineStore(min_samples=20, z_threshold=3.0)
+            return RiskPipeline(ScoringEngine(), RuleEngine(baselines=store), observers=[store])
+
+        rng = random.Random(3)
+        events = [_event(rng.uniform(20, 30)) for _ in range(19)]
+        # The 20th and 21st events: the spike only counts once 20 samples exist
+        events += [_event(25), _event(70), _event(70, user_id="bob"), _event(27)]
+        scalar, batched = pipeline(), pipeline()
+        expected = [scalar.score(event) for event in events]
+        actual = []
+        for start in range(0, len(events), size):
+            actual.extend(batched.score_batch(events[start:start + size]))
+        assert actual == expected
+        assert USER_RULE in expected[20].triggered_rules
+
+    def test_batch_runs(self):
+        """Test that runs split on a repeated entity and before an LRU eviction."""
+        store = BaselineStore(max_entities=4)
+        alice, bob = _event(10).context, _event(10, user_id="bob", source_ip="10.0.0.2").context
+        carol = _event(10, user_id="carol", source_ip="10.0.0.3").context
+        assert store.batch_runs([alice, None, bob, alice]) == [(0, 3), (3, 4)]
+        # alice and bob fill the table, so carol would evict one of them
+        assert store.batch_runs([alice, bob, carol, None]) == [(0, 2), (2, 3), (3, 4)]
+        store.observe(_event(10), None)
+        store.observe(_event(10, user_id="bob", source_ip="10.0.0.2"), None)
+        assert store.batch_runs([alice, bob, None]) == [(0, 3)]
+        assert store.batch_runs([]) == []
+
+    def test_restore_rejects_incompatible_snapshot(self, store):
+        """Test that snapshots from another layout are refused."""
+        with pytest.raises(ValueError):
+            store.restore({"version": 99, "metrics": [], "entities": []})
@@ -0,0 +1,135 @@
+import pytest
+import asyncio
+import statistics
+import time
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput, ContextData
+from app.rules import RuleEngine
+from app.scoring import ScoringEngine, RiskPipeline, MicroBatcher
+from app.correlation import IncidentCorrelator
+
+
+def _inputs(n):
+    return [
+        RiskInput(
+            severity=(i * 7) % 101,
+            confidence=(i * 13) % 101,
+            frequency=(i * 17) % 101,
+            context=ContextData(failed_logins=i % 9, is_privileged=i % 3 == 0),
+        )
+        for i in range(n)
+    ]
+
+
+class TestMicroBatcher:
+    """Test suite for the MicroBatcher."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Create a fresh scoring pipeline."""
+        return RiskPipeline(ScoringEngine(), RuleEngine())
+
+    def test_score_batch_matches_scalar(self, pipeline):
+        """Test that the batched pipeline path equals per-event scoring."""
+        inputs = _inputs(200)
+        assert pipeline.score_batch(inputs) == [pipeline.score(r) for r in inputs]
+
+    def test_concurrent_requests_are_batched(self, pipeline):
+        """Test that concurrent submissions are coalesced into few batches."""
+        batcher = MicroBatcher(pipeline, max_batch_size=16, max_wait_us=1000)
+        inputs = _inputs(40)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(r) for r in inputs))
+
+        outputs = asyncio.run(run())
+        assert outputs == [pipeline.score(r) for r in inputs]
+        assert batcher.events_scored == 40
+        assert batcher.batches_flushed == 3
+
+    def test_idle_traffic_has_no_window(self, pipeline):
+        """Test that a lone request is flushed without waiting."""
+        batcher = MicroBatcher(pipeline, max_batch_size=64, max_wait_us=1_000_000)
+        assert batcher.current_window == 0.0
+
+        async def run():
+            return await asyncio.wait_for(batcher.submit(_inputs(1)[0]), timeout=0.5)
+
+        asyncio.run(run())
+        assert batcher.batches_flushed == 1
+
+    def test_window_adapts_to_load(self, pipeline):
+        """Test that the window opens under load and closes when idle."""
+        batcher = MicroBatcher(pipeline, max_batch_size=8, max_wait_us=500)
+        for i in range(20):
+            batcher._record_arrival(i * 10e-6)
+        assert 0 < batcher.current_window <= 500e-6
+
+        batcher._record_arrival(10.0)
+        assert batcher.current_window == 0.0
+
+    @pytest.mark.parametrize("max_wait_us", [250, 3000])
+    def test_wait_is_bounded_by_max_wait(self, pipeline, max_wait_us):
+        """Test that a lone event in an open window waits about max_wait_us, not a timer tick."""
+        batcher = MicroBatcher(pipeline, max_batch_size=64, max_wait_us=max_wait_us)
+
+        async def wait_once():
+            now = time.perf_counter()
+            for i in range(20):
+                batcher._record_arrival(now - (20 - i) * 100e-6)
+            assert batcher.current_window == max_wait_us / 1e6
+            timings = {}
+            await batcher.submit(_inputs(1)[0], timings)
+            start, end = timings["queue_wait"]
+            return (end - start) / 1000
+
+        async def run():
+            return [await wait_once() for _ in range(5)]
+
+        waits = asyncio.run(run())
+        assert statistics.median(waits) <= max_wait_us + 200
+
+    def test_failing_event_does_not_fail_batch(self, pipeline):
+        """Test that an error scoring one event only fails that caller."""
+        batcher = MicroBatcher(pipeline, max_batch_size=4, max_wait_us=1000)
+        bad = RiskInput.model_construct(severity=None, confidence=50, frequency=50, context=None)
+        good = _inputs(3)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(r) for r in [good[0], bad, *good[1:]]), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert isinstance(results[1], Exception)
+        assert [results[0], results[2], results[3]] == [pipeline.score(r) for r in good]
+
+    def test_failed_state_update_is_not_rescored(self):
+        """Test that a batch is not scored again once correlation has counted its events."""
+        scoring_engine = ScoringEngine()
+        correlator = IncidentCorrelator(scoring_engine.get_risk_level)
+
+        class FailingObserver:
+            def observe(self, risk_input, output):
+                raise RuntimeError("observer failed")
+
+        pipeline = RiskPipeline(scoring_engine, RuleEngine(), observers=[FailingObserver()], correlator=correlator)
+        batcher = MicroBatcher(pipeline, max_batch_size=2, max_wait_us=1000)
+        events = [RiskInput(severity=50, confidence=50, frequency=50, context=ContextData(source_ip=ip)) for ip in ("1.1.1.1", "2.2.2.2")]
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(r) for r in events), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+        pipeline.observers = []
+        assert pipeline.score(events[0]).incident.event_count == 2
+
+    def test_invalid_configuration(self, pipeline):
+        """Test that invalid batch settings are rejected."""
+        with pytest.raises(ValueError):
+            MicroBatcher(pipeline, max_batch_size=0)
+        with pytest.raises(ValueError):
+            MicroBatcher(pipeline, max_wait_us=-1)
@@ -0,0 +1,276 @@
+import pytest
+import math
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput, ContextData
+from app.correlation import IncidentCorrelator
+from app.rules import RuleEngine
+from app.scoring import ScoringEngine, RiskPipeline
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class ArrivalClock:
+    """Arrival time of the last event built by _event(), as if sent in real time."""
+
+    def __init__(self):
+        self.now = START.timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+ARRIVAL = ArrivalClock()
+
+
+def _event(seconds, source_ip="10.0.0.1", user_id=None, severity=45):
+    ARRIVAL.now = START.timestamp() + seconds
+    return RiskInput(
+        severity=severity,
+        confidence=45,
+        frequency=45,
+        context=ContextData(source_ip=source_ip, user_id=user_id),
+        timestamp=START + timedelta(seconds=seconds),
+    )
+
+
+def _noisy_or(scores, weight=0.3):
+    miss = 1.0
+    for score in scores:
+        miss *= 1 - weight * score / 100
+    return round(100 * (1 - miss), 2)
+
+
+class TestIncidentCorrelator:
+    """Test suite for IncidentCorrelator."""
+
+    @pytest.fixture
+    def correlator(self):
+        return IncidentCorrelator(ScoringEngine().get_risk_level, window_seconds=60, rule_weight=0.05, clock=ARRIVAL)
+
+    def test_medium_events_add_up_to_high_incident(self, correlator):
+        """Test that ten medium events from one IP within a minute form a HIGH incident."""
+        for second in range(10):
+            incident = correlator.correlate(_event(second * 5), 45.0, [])
+        assert incident.entity_type == "source_ip"
+        assert incident.entity_id == "10.0.0.1"
+        assert incident.event_count == 10
+        assert incident.incident_score == _noisy_or([45.0] * 10)
+        assert incident.incident_level == "HIGH"
+        assert incident.first_seen == START
+        assert incident.last_seen == START + timedelta(seconds=45)
+
+    def test_single_event_scores_its_own_risk(self, correlator):
+        """Test that one event alone is an incident as severe as the event."""
+        incident = correlator.correlate(_event(0), 45.0, [])
+        assert incident.event_count == 1
+        assert _noisy_or([45.0]) < incident.incident_score == 45.0
+        assert incident.incident_level == "MEDIUM"
+
+        incident = correlator.correlate(_event(1, source_ip="10.0.0.2"), 100.0, ["Rule A"])
+        assert incident.incident_score == 100.0
+        assert incident.incident_level == "CRITICAL"
+
+    def test_strongest_event_expires_and_arrives_late(self, correlator):
+        """Test that the floor follows the strongest event still in the window."""
+        correlator.correlate(_event(0), 90.0, [])
+        correlator.correlate(_event(10), 40.0, [])
+        assert correlator.correlate(_event(20), 30.0, []).incident_score == 90.0
+        assert correlator.correlate(_event(65), 30.0, []).incident_score == 40.0
+        assert correlator.correlate(_event(50), 80.0, []).incident_score == 80.0
+        assert correlator.correlate(_event(115), 20.0, []).incident_score == 30.0
+
+    def test_events_expire_from_window(self, correlator):
+        """Test that events older than the window no longer count."""
+        for second in range(5):
+            correlator.correlate(_event(second), 45.0, [])
+        incident = correlator.correlate(_event(100), 45.0, [])
+        assert incident.event_count == 1
+        assert incident.incident_score == 45.0
+
+    def test_expired_sums_do_not_drift(self, correlator):
+        """Test that running sums match a fresh computation after many expiries."""
+        for second in range(0, 10000, 7):
+            incident = correlator.correlate(_event(second), 45.0 + second % 50, [])
+        window = [second for second in range(0, 10000, 7) if second >= 9996 - 60]
+        assert incident.event_count == len(window)
+        scores = [45.0 + second % 50 for second in window]
+        assert incident.incident_score == pytest.approx(max(max(scores), _noisy_or(scores)), abs=0.01)
+
+    def test_distinct_rules_add_evidence(self, correlator):
+        """Test that each distinct rule in the window counts once."""
+        correlator.correlate(_event(0), 45.0, ["Rule A"])
+        correlator.correlate(_event(1), 45.0, ["Rule A", "Rule B"])
+        incident = correlator.correlate(_event(2), 45.0, [])
+        miss = (1 - _noisy_or([45.0] * 3) / 100) * (1 - 0.05) ** 2
+        assert incident.incident_score == pytest.approx(max(45.0, 100 * (1 - miss)), abs=0.01)
+        assert incident.triggered_rules == ["Rule A", "Rule B"]
+
+        incident = correlator.correlate(_event(61), 45.0, [])
+        assert incident.triggered_rules == ["Rule A", "Rule B"]
+        incident = correlator.correlate(_event(62), 45.0, [])
+        assert incident.triggered_rules == []
+
+    def test_entities_are_separate(self, correlator):
+        """Test that events from different IPs do not correlate."""
+        for second in range(5):
+            correlator.correlate(_event(second, source_ip="10.0.0.1"), 45.0, [])
+        incident = correlator.correlate(_event(6, source_ip="10.0.0.2"), 45.0, [])
+        assert incident.entity_id == "10.0.0.2"
+        assert incident.event_count == 1
+
+    def test_strongest_entity_is_returned(self, correlator):
+        """Test that the higher-scoring of the user and IP incidents is reported."""
+        for second in range(5):
+            correlator.correlate(_event(second, source_ip="10.0.0.1", user_id="alice"), 45.0, [])
+        incident = correlator.correlate(_event(6, source_ip="10.0.0.9", user_id="alice"), 45.0, [])
+        assert incident.entity_type == "user_id"
+        assert incident.event_count == 6
+
+    def test_no_entity_no_incident(self, correlator):
+        """Test that events without user_id or source_ip are not correlated."""
+        assert correlator.correlate(_event(0, source_ip=None), 45.0, []) is None
+
+    def test_late_event_kept_in_order(self, correlator):
+        """Test that a late event inside the window still counts."""
+        correlator.correlate(_event(10), 45.0, [])
+        incident = correlator.correlate(_event(5), 45.0, [])
+        assert incident.event_count == 2
+        assert incident.first_seen == START + timedelta(seconds=5)
+        assert incident.last_seen == START + timedelta(seconds=10)
+
+    def test_event_older_than_window_is_ignored(self, correlator):
+        """Test that an event already outside its entity's window adds nothing."""
+        correlator.correlate(_event(100), 45.0, [])
+        incident = correlator.correlate(_event(10), 45.0, [])
+        assert incident.event_count == 1
+        assert incident.first_seen == START + timedelta(seconds=100)
+
+    def test_idle_entities_are_swept(self, correlator):
+        """Test that entities with no events left in the window are dropped."""
+        for index in range(100):
+            correlator.correlate(_event(0, source_ip=f"10.0.1.{index}"), 45.0, [])
+        correlator.correlate(_event(200, source_ip="10.0.0.1"), 45.0, [])
+        assert len(correlator) == 1
+
+    def test_state_is_bounded(self):
+        """Test that entities and per-entity events are capped."""
+        correlator = IncidentCorrelator(
+            ScoringEngine().get_risk_level, max_entities=10, max_events_per_key=5, clock=ARRIVAL
+        )
+        for index in range(50):
+            correlator.correlate(_event(0, source_ip=f"10.0.1.{index}"), 45.0, [])
+        assert len(correlator) == 10
+        for _ in range(20):
+            incident = correlator.correlate(_event(1), 45.0, [])
+        assert incident.event_count == 5
+        assert incident.incident_score == _noisy_or([45.0] * 5)
+
+    def test_naive_timestamp_is_utc(self, correlator):
+        """Test that timestamps without a timezone are read as UTC."""
+        event = _event(0)
+        event.timestamp = datetime(2024, 1, 1)
+        incident = correlator.correlate(event, 45.0, [])
+        assert incident.first_seen == START
+
+    def test_missing_timestamp_uses_clock(self):
+        """Test that events without a timestamp use the arrival time."""
+        correlator = IncidentCorrelator(ScoringEngine().get_risk_level, clock=lambda: START.timestamp())
+        event = _event(0)
+        event.timestamp = None
+        assert correlator.correlate(event, 45.0, []).last_seen == START
+
+    def test_future_timestamp_is_clamped(self, correlator):
+        """Test that a far-future timestamp neither sweeps other entities nor sticks."""
+        for index in range(3):
+            correlator.correlate(_event(0, source_ip=f"10.0.1.{index}"), 45.0, [])
+        event = _event(10)
+        event.timestamp = datetime(2100, 1, 1, tzinfo=timezone.utc)
+        incident = correlator.correlate(event, 45.0, [])
+        assert incident.last_seen == START + timedelta(seconds=10 + correlator.max_clock_skew_seconds)
+        assert len(correlator) == 4
+
+        incident = correlator.correlate(_event(correlator.max_clock_skew_seconds + 20), 45.0, [])
+        assert incident.event_count == 2
+        assert len(correlator) == 1
+
+    def test_stale_events_do_not_depend_on_other_entities(self):
+        """Test that events older than the window at arrival are dropped whatever else is tracked."""
+
+        def last_incident(prefix):
+            correlator = IncidentCorrelator(ScoringEngine().get_risk_level, clock=lambda: START.timestamp() + 3600)
+            for event in prefix:
+                correlator.correlate(event, 45.0, [])
+            for second in range(10):
+                incident = correlator.correlate(_event(second), 45.0, [])
+            return incident, len(correlator)
+
+        fresh = _event(3600, source_ip=None, user_id="bob")
+        assert last_incident([]) == (None, 0)
+        assert last_incident([fresh]) == (None, 1)
+
+    def test_out_of_range_timestamp(self, correlator):
+        """Test that a valid but ancient timestamp is ignored rather than failing."""
+        event = RiskInput.model_validate({
+            "severity": 45, "confidence": 45, "frequency": 45,
+            "context": {"source_ip": "1.1.1.1"}, "timestamp": "0001-01-01T00:00:00+01:00",
+        })
+        assert correlator.correlate(event, 45.0, []) is None
+        assert len(correlator) == 0
+
+    def test_invalid_settings(self):
+        """Test that invalid settings are rejected."""
+        level_for = ScoringEngine().get_risk_level
+        with pytest.raises(ValueError):
+            IncidentCorrelator(level_for, window_seconds=0)
+        with pytest.raises(ValueError):
+            IncidentCorrelator(level_for, event_weight=1.5)
+        with pytest.raises(ValueError):
+            IncidentCorrelator(level_for, rule_weight=1.0)
+        with pytest.raises(ValueError):
+            IncidentCorrelator(level_for, max_clock_skew_seconds=-1)
+
+
+class TestPipelineCorrelation:
+    """Test suite for correlation inside RiskPipeline."""
+
+    @pytest.fixture
+    def pipeline(self):
+        scoring_engine = ScoringEngine()
+        return RiskPipeline(
+            scoring_engine,
+            RuleEngine(),
+            correlator=IncidentCorrelator(scoring_engine.get_risk_level, clock=ARRIVAL),
+        )
+
+    def test_incident_attached_to_result(self, pipeline):
+        """Test that results carry the incident of their entity."""
+        outputs = [pipeline.score(_event(second)) for second in range(10)]
+        assert outputs[-1].risk_level == "MEDIUM"
+        assert outputs[-1].incident.event_count == 10
+        assert outputs[-1].incident.incident_level == "HIGH"
+
+    def test_batch_matches_scalar(self):
+        """Test that batched and one-by-one scoring give the same incidents."""
+        events = [_event(second, source_ip=f"10.0.0.{second % 3}") for second in range(30)]
+        scoring_engine = ScoringEngine()
+        scalar = RiskPipeline(scoring_engine, RuleEngine(), correlator=IncidentCorrelator(scoring_engine.get_risk_level, clock=ARRIVAL))
+        batched = RiskPipeline(scoring_engine, RuleEngine(), correlator=IncidentCorrelator(scoring_engine.get_risk_level, clock=ARRIVAL))
+        assert [scalar.score(event) for event in events] == batched.score_batch(events)
+
+    def test_correlate_stage_timed(self, pipeline):
+        """Test that the correlate stage is recorded in timings."""
+        timings = {}
+        pipeline.score(_event(0), timings)
+        assert "correlate" in timings
+
+    def test_disabled_by_default(self):
+        """Test that results have no incident without a correlator."""
+        output = RiskPipeline(ScoringEngine(), RuleEngine()).score(_event(0))
+        assert output.incident is None
+        assert math.isclose(output.risk_score, 45.0)
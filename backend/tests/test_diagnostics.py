@@ -0,0 +1,136 @@
+import pytest
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api import routes
+from app.api.diagnostics import router as diagnostics_router
+from app.diagnostics import SamplingProfiler, ProfilerBusyError, SlowRequestLog
+from app.models.risk_models import RiskInput
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSamplingProfiler:
+    """Test suite for the SamplingProfiler."""
+
+    def test_collapsed_stack_output(self):
+        """Test that output is in collapsed-stack format and sees other threads."""
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            output = SamplingProfiler().profile(0.2, interval_ms=2)
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = output.splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert any(line.startswith("busy-worker;") and "_busy_loop" in line for line in lines)
+
+    def test_duration_is_capped(self):
+        """Test that profiles are capped at max_seconds."""
+        start = time.perf_counter()
+        SamplingProfiler(max_seconds=0.05).profile(30, interval_ms=5)
+        assert time.perf_counter() - start < 5
+
+    def test_one_profile_at_a_time(self):
+        """Test that concurrent profiles are rejected."""
+        profiler = SamplingProfiler()
+        thread = threading.Thread(target=profiler.profile, args=(0.3,))
+        thread.start()
+        time.sleep(0.05)
+        with pytest.raises(ProfilerBusyError):
+            profiler.profile(0.1)
+        thread.join()
+
+    def test_invalid_arguments(self):
+        """Test that non-positive durations are rejected."""
+        with pytest.raises(ValueError):
+            SamplingProfiler().profile(0)
+
+
+class TestSlowRequestLog:
+    """Test suite for the SlowRequestLog."""
+
+    @pytest.fixture
+    def risk_input(self):
+        return RiskInput(severity=80, confidence=75, frequency=90)
+
+    def test_fast_requests_ignored(self, risk_input):
+        """Test that requests under the threshold are not captured."""
+        log = SlowRequestLog(threshold_ms=10)
+        assert log.observe(0, 5_000_000, risk_input, {}) is False
+        assert log.entries() == []
+
+    def test_slow_request_captured(self, risk_input):
+        """Test that slow requests keep input and stage timings."""
+        log = SlowRequestLog(threshold_ms=10)
+        timings = {"calculate_risk_score": (1_000_000, 3_000_000), "evaluate_rules": (3_000_000, 15_000_000)}
+        assert log.observe(0, 20_000_000, risk_input, timings) is True
+        entry = log.entries()[0]
+        assert entry["total_ms"] == 20.0
+        assert entry["stages_ms"] == {"calculate_risk_score": 2.0, "evaluate_rules": 12.0}
+        assert entry["input"]["severity"] == 80
+
+    def test_ring_buffer_is_bounded(self, risk_input):
+        """Test that only the newest entries are retained."""
+        log = SlowRequestLog(threshold_ms=0, capacity=3)
+        for i in range(10):
+            log.observe(0, i * 1_000_000, risk_input, {})
+        entries = log.entries()
+        assert len(entries) == 3
+        assert [e["total_ms"] for e in entries] == [9.0, 8.0, 7.0]
+        assert log.captured == 10
+
+
+class TestDiagnosticsEndpoints:
+    """Test suite for the /diagnostics endpoints."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Create an app with diagnostics enabled and every request captured."""
+        monkeypatch.setattr(routes, "slow_log", SlowRequestLog(threshold_ms=0, capacity=10))
+        monkeypatch.setattr(routes, "profiler", SamplingProfiler(max_seconds=1))
+        app = FastAPI()
+        app.include_router(routes.router)
+        app.include_router(diagnostics_router)
+        return TestClient(app)
+
+    def test_slow_requests_endpoint(self, client):
+        """Test that scored requests show up with per-stage timings."""
+        payload = {"severity": 80, "confidence": 75, "frequency": 90}
+        assert client.post("/calculate-risk", json=payload).status_code == 200
+
+        data = client.get("/diagnostics/slow-requests").json()
+        assert data["captured"] == 1
+        entry = data["entries"][0]
+        assert entry["input"]["severity"] == 80
+        assert {"calculate_risk_score", "get_risk_level", "evaluate_rules", "build_response"} <= set(entry["stages_ms"])
+
+        assert client.delete("/diagnostics/slow-requests").json() == {"cleared": True}
+        assert client.get("/diagnostics/slow-requests").json()["entries"] == []
+
+    def test_profile_endpoint(self, client):
+        """Test that the profile endpoint returns collapsed stacks."""
+        response = client.get("/diagnostics/profile", params={"seconds": 0.1, "interval_ms": 2})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_disabled_by_default(self):
+        """Test that the default app does not mount diagnostics."""
+        from main import app
+        assert TestClient(app).get("/diagnostics/slow-requests").status_code == 404
@@ -0,0 +1,141 @@
+import pytest
+import time
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput
+from app.rules import RuleEngine, BaselineStore
+from app.scoring import (
+    ScoringEngine,
+    RiskPipeline,
+    EngineImplementation,
+    EngineRegistry,
+    EngineNotQualifiedError,
+)
+from app.scoring.equivalence import BOUNDARY_VALUES, CLAMP_VALUES, canonical, generate_cases
+
+
+@pytest.fixture(scope="module")
+def engines():
+    """Create the engines backing every implementation."""
+    return ScoringEngine(), RuleEngine()
+
+
+@pytest.fixture
+def registry(engines):
+    """Create a registry with the built-in implementations."""
+    return EngineRegistry(*engines)
+
+
+def _all_implementations():
+    return EngineRegistry(ScoringEngine(), RuleEngine()).names()
+
+
+class TestEquivalence:
+    """Differential tests: every registered implementation must match the reference bit-for-bit."""
+
+    @pytest.mark.parametrize("name", _all_implementations())
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_reference(self, registry, name, seed):
+        """Test bit-identical results on randomized and edge-case inputs."""
+        result = registry.qualify(name, cases=generate_cases(2000, seed=seed), min_speedup=0, repeats=1)
+        assert result["mismatches"] == []
+        assert result["equivalent"]
+        assert result["events_per_second"] > 0
+
+    def test_cases_cover_edges(self):
+        """Test that generated cases include band boundaries and clamping extremes."""
+        values = {v for case in generate_cases(0) for v in case[:3]}
+        for edge in (30.5, 80.0, 1e308, -1e9):
+            assert edge in values
+        assert set(BOUNDARY_VALUES) | set(CLAMP_VALUES) <= values
+
+    def test_canonical_is_bit_exact(self):
+        """Test that the comparison key distinguishes values == would conflate."""
+        assert canonical(0.0) != canonical(-0.0)
+        assert canonical(0) != canonical(0.0)
+        assert canonical(0.1 + 0.2) != canonical(0.3)
+        assert canonical([1.5, "HIGH"]) == canonical([1.5, "HIGH"])
+
+
+class TestQualification:
+    """Test suite for the EngineRegistry selection gate."""
+
+    def test_unqualified_cannot_be_selected(self, registry):
+        """Test that registration alone does not allow selection."""
+        with pytest.raises(EngineNotQualifiedError):
+            registry.select("batch")
+        assert registry.select("reference").name == "reference"
+
+    def test_incorrect_implementation_rejected(self, registry, engines):
+        """Test that an implementation with rounding differences fails."""
+        scoring_engine, rule_engine = engines
+        registry.register(EngineImplementation(
+            "rounded",
+            lambda rows: [round(score, 6) for score in scoring_engine.calculate_risk_scores(rows)],
+            scoring_engine.get_risk_levels,
+            rule_engine.evaluate_rules_batch,
+        ))
+        result = registry.qualify("rounded", cases=generate_cases(200), min_speedup=0, repeats=1)
+        assert not result["equivalent"]
+        assert result["mismatches"][0]["stage"] == "calculate_risk_score"
+        with pytest.raises(EngineNotQualifiedError):
+            registry.select("rounded")
+
+    def test_boundary_bug_detected(self, registry, engines):
+        """Test that a band-edge difference at 30.5 is caught."""
+        scoring_engine, rule_engine = engines
+        registry.register(EngineImplementation(
+            "floor-bands",
+            scoring_engine.calculate_risk_scores,
+            lambda scores: scoring_engine.get_risk_levels([int(score) for score in scores]),
+            rule_engine.evaluate_rules_batch,
+        ))
+        result = registry.qualify("floor-bands", cases=generate_cases(0), min_speedup=0, repeats=1)
+        assert any(m["stage"] == "get_risk_level" for m in result["mismatches"])
+
+    def test_slower_implementation_rejected(self, registry, engines):
+        """Test that a correct but slower implementation does not qualify."""
+        scoring_engine, rule_engine = engines
+
+        def slow_scores(rows):
+            time.sleep(0.01)
+            return scoring_engine.calculate_risk_scores(rows)
+
+        registry.register(EngineImplementation(
+            "slow", slow_scores, scoring_engine.get_risk_levels, rule_engine.evaluate_rules_batch,
+        ))
+        result = registry.qualify("slow", cases=generate_cases(100), min_speedup=1.0, repeats=2)
+        assert result["equivalent"]
+        assert result["speedup"] < 1.0
+        assert not result["qualified"]
+
+    def test_baseline_rules_are_qualified(self):
+        """Test that rules ignoring entity baselines fail even though the live store is empty."""
+        scoring_engine = ScoringEngine()
+        rule_engine = RuleEngine(baselines=BaselineStore())
+        registry = EngineRegistry(scoring_engine, rule_engine)
+        assert registry.qualify("batch", cases=generate_cases(200), min_speedup=0, repeats=1)["equivalent"]
+
+        no_baselines = RuleEngine()
+        registry.register(EngineImplementation(
+            "no-baselines",
+            scoring_engine.calculate_risk_scores,
+            scoring_engine.get_risk_levels,
+            no_baselines.evaluate_rules_batch,
+        ))
+        result = registry.qualify("no-baselines", cases=generate_cases(200), min_speedup=0, repeats=1)
+        assert not result["equivalent"]
+        assert {m["stage"] for m in result["mismatches"]} == {"evaluate_rules"}
+        assert len(rule_engine.baselines) == 0
+
+    def test_qualified_implementation_drives_pipeline(self, registry, engines):
+        """Test that a qualified implementation is used by score_batch with identical output."""
+        registry.qualify("batch", cases=generate_cases(200), min_speedup=0, repeats=1)
+        pipeline = RiskPipeline(*engines, implementation=registry.select("batch"))
+        inputs = [RiskInput(severity=s, confidence=c, frequency=f, context=ctx)
+                  for s, c, f, ctx in generate_cases(300) if all(0 <= v <= 100 for v in (s, c, f))]
+        assert pipeline.score_batch(inputs) == [pipeline.score(r) for r in inputs]
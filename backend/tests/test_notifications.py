@@ -0,0 +1,214 @@
+import pytest
+import queue
+import json
+import threading
+import time
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput, ContextData
+from app.notifications import (
+    NotificationSink,
+    FileSink,
+    WebhookSink,
+    QueueSink,
+    LocalWebhookReceiver,
+    NotificationDispatcher,
+    RiskNotifier,
+    build_sinks,
+)
+from app.rules import RuleEngine
+from app.scoring import ScoringEngine, RiskPipeline
+
+
+class BlockingSink(NotificationSink):
+    """Sink that blocks until released, to simulate slow I/O."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.records = []
+
+    def send_batch(self, records):
+        self.release.wait(5)
+        self.records.extend(records)
+
+
+class RecordingDispatcher:
+    """Dispatcher stand-in that keeps emitted records."""
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+        return True
+
+
+def _event(severity, user_id=None, source_ip=None):
+    return RiskInput(
+        severity=severity,
+        confidence=severity,
+        frequency=severity,
+        context=ContextData(user_id=user_id, source_ip=source_ip),
+    )
+
+
+class TestRiskNotifier:
+    """Test suite for the RiskNotifier."""
+
+    @pytest.fixture
+    def pipeline(self):
+        return RiskPipeline(ScoringEngine(), RuleEngine())
+
+    def test_threshold_notification(self, pipeline):
+        """Test that results at or above min_level are emitted."""
+        dispatcher = RecordingDispatcher()
+        notifier = RiskNotifier(dispatcher, min_level="CRITICAL", escalation=False)
+        for severity in (10, 50, 95):
+            event = _event(severity)
+            notifier.observe(event, pipeline.score(event))
+        assert len(dispatcher.records) == 1
+        assert dispatcher.records[0]["risk_level"] == "CRITICAL"
+        assert dispatcher.records[0]["reason"] == "threshold"
+
+    def test_escalation_notification(self, pipeline):
+        """Test that an entity moving up a level is emitted once."""
+        dispatcher = RecordingDispatcher()
+        notifier = RiskNotifier(dispatcher, min_level="CRITICAL")
+        for severity in (10, 10, 50, 50, 20):
+            event = _event(severity, user_id="alice")
+            notifier.observe(event, pipeline.score(event))
+        assert len(dispatcher.records) == 1
+        record = dispatcher.records[0]
+        assert record["reason"] == "escalation"
+        assert record["risk_level"] == "MEDIUM"
+        assert record["escalated_from"] == {"user_id": "LOW"}
+        assert record["entities"] == {"user_id": "alice"}
+
+    def test_entity_table_is_bounded(self, pipeline):
+        """Test that tracked entities are capped."""
+        notifier = RiskNotifier(RecordingDispatcher(), max_entities=10)
+        for i in range(100):
+            event = _event(10, source_ip=f"10.0.0.{i}")
+            notifier.observe(event, pipeline.score(event))
+        assert len(notifier._levels) == 10
+
+    def test_invalid_level(self):
+        """Test that unknown levels are rejected."""
+        with pytest.raises(ValueError):
+            RiskNotifier(RecordingDispatcher(), min_level="SEVERE")
+
+    def test_pipeline_observer(self, pipeline):
+        """Test that the pipeline feeds observers on single and batch paths."""
+        dispatcher = RecordingDispatcher()
+        pipeline.observers.append(RiskNotifier(dispatcher, min_level="HIGH"))
+        pipeline.score(_event(90))
+        pipeline.score_batch([_event(90), _event(10)])
+        assert len(dispatcher.records) == 2
+
+
+class TestNotificationDispatcher:
+    """Test suite for the NotificationDispatcher."""
+
+    def test_emit_never_blocks_and_drops_when_full(self):
+        """Test that a stalled sink causes drops instead of blocking emit()."""
+        sink = BlockingSink()
+        dispatcher = NotificationDispatcher([sink], buffer_size=5, batch_size=1, flush_interval_ms=10)
+        start = time.perf_counter()
+        results = [dispatcher.emit({"n": i}) for i in range(50)]
+        assert time.perf_counter() - start < 0.5
+        assert results.count(False) == dispatcher.dropped > 0
+
+        sink.release.set()
+        dispatcher.close()
+        assert len(sink.records) == dispatcher.emitted
+
+    def test_batching_and_file_sink(self, tmp_path):
+        """Test that records are delivered in batches to a file."""
+        path = tmp_path / "notifications.jsonl"
+        dispatcher = NotificationDispatcher([FileSink(path)], batch_size=10, flush_interval_ms=20)
+        for i in range(25):
+            dispatcher.emit({"n": i})
+        dispatcher.close()
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == list(range(25))
+
+    def test_webhook_retries(self):
+        """Test that failed webhook deliveries are retried against the local stand-in."""
+        receiver = LocalWebhookReceiver(fail_first=2)
+        try:
+            dispatcher = NotificationDispatcher(
+                [WebhookSink(receiver.url, timeout=2)],
+                batch_size=5,
+                flush_interval_ms=10,
+                retry_backoff_ms=1,
+            )
+            for i in range(5):
+                dispatcher.emit({"n": i})
+            dispatcher.close()
+        finally:
+            receiver.close()
+        assert [r["n"] for r in receiver.records] == list(range(5))
+        assert receiver.requests == 3
+        assert dispatcher.failed == 0
+
+    def test_gives_up_after_max_retries(self):
+        """Test that a permanently failing sink counts failures."""
+        receiver = LocalWebhookReceiver(fail_first=100)
+        try:
+            dispatcher = NotificationDispatcher(
+                [WebhookSink(receiver.url, timeout=2)],
+                max_retries=1,
+                retry_backoff_ms=1,
+                flush_interval_ms=10,
+            )
+            dispatcher.emit({"n": 1})
+            dispatcher.close()
+        finally:
+            receiver.close()
+        assert dispatcher.failed == 1
+        assert receiver.records == []
+
+    def test_queue_sink(self):
+        """Test delivery to an in-process queue."""
+        sink = QueueSink()
+        dispatcher = NotificationDispatcher([sink], flush_interval_ms=10)
+        dispatcher.emit({"n": 1})
+        dispatcher.close()
+        assert sink.queue.get_nowait() == {"n": 1}
+
+    def test_queue_sink_retry_does_not_duplicate(self):
+        """Test that a retry after queue.Full resumes after the records already put."""
+        sink = QueueSink(queue.Queue(maxsize=2), timeout=0.01)
+        batch = [{"n": 1}, {"n": 2}, {"n": 3}]
+        with pytest.raises(queue.Full):
+            sink.send_batch(batch)
+        received = [sink.queue.get_nowait(), sink.queue.get_nowait()]
+        sink.send_batch(batch)
+        received.append(sink.queue.get_nowait())
+        assert received == batch
+        assert sink.queue.empty()
+
+    def test_build_queue_sink_needs_registered_queue(self):
+        """Test that config-built queue sinks target an injected queue."""
+        target = queue.Queue(maxsize=10)
+        sinks = build_sinks([{"type": "queue", "name": "soar"}], queues={"soar": target})
+        assert sinks[0].queue is target
+        with pytest.raises(ValueError):
+            build_sinks([{"type": "queue"}])
+        with pytest.raises(ValueError):
+            build_sinks([{"type": "queue", "name": "other"}], queues={"soar": target})
+
+    def test_build_sinks(self, tmp_path):
+        """Test building sinks from configuration."""
+        sinks = build_sinks([
+            {"type": "file", "path": str(tmp_path / "out.jsonl")},
+            {"type": "webhook", "url": "http://127.0.0.1:1/"},
+        ])
+        assert [type(s) for s in sinks] == [FileSink, WebhookSink]
+        sinks[0].close()
+        with pytest.raises(ValueError):
+            build_sinks([{"type": "pager"}])
@@ -127,3 +127,13 @@ class TestRuleEngine:
         assert "Privileged account activity detected" in rule_names
         assert "High event frequency detected" in rule_names
         assert "Low confidence with high severity" in rule_names
+    
+    def test_batch_evaluation_matches_scalar(self, engine):
+        """Test that batched rule evaluation matches per-event evaluation."""
+        rows = [
+            (80, 50, 90, ContextData(failed_logins=6, is_privileged=True)),
+            (75, 40, 50, None),
+            (50, 60, 70, ContextData(failed_logins=2)),
+        ]
+        expected = [engine.evaluate_rules(s, c, f, ctx) for s, c, f, ctx in rows]
+        assert engine.evaluate_rules_batch(rows) == expected
@@ -98,3 +98,14 @@ class TestScoringEngine:
         """Test floating point calculation accuracy."""
         score = engine.calculate_risk_score(50, 50, 50)
         assert 49 < score < 51  # Should be very close to 50
+    
+    def test_batch_scores_bit_identical(self, engine):
+        """Test that batched scoring matches the scalar path exactly."""
+        rows = [(75.5, 82.3, 91.2), (33.333333, 33.333333, 33.333333), (150, -20, 50), (0, 0, 0)]
+        scores = engine.calculate_risk_scores(rows)
+        assert scores == [engine.calculate_risk_score(*row) for row in rows]
+    
+    def test_batch_risk_levels(self, engine):
+        """Test that batched risk levels match the scalar path."""
+        scores = [0, 30, 30.5, 31, 60, 61, 80, 80.5, 81, 100]
+        assert engine.get_risk_levels(scores) == [engine.get_risk_level(s) for s in scores]
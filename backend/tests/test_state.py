@@ -0,0 +1,228 @@
+import pytest
+import json
+import random
+import threading
+import time
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput, ContextData
+from app.notifications import RiskNotifier
+from app.rules import RuleEngine, BaselineStore
+from app.scoring import ScoringEngine, RiskPipeline
+from app.state import (
+    SnapshotFormatError,
+    SnapshotManager,
+    SnapshotReader,
+    config_fingerprint,
+    write_snapshot,
+)
+
+FINGERPRINT = config_fingerprint({"severity": 0.35}, {"low": {"min": 0, "max": 30}})
+
+
+class DictProvider:
+    """Minimal snapshot provider."""
+
+    def __init__(self, state=None):
+        self.state = state or {}
+
+    def snapshot(self):
+        return dict(self.state)
+
+    def restore(self, snapshot):
+        self.state = dict(snapshot)
+
+
+class TestSnapshotFile:
+    """Test suite for the snapshot file format."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that sections and header survive a write/read cycle."""
+        path = tmp_path / "state.snapshot"
+        write_snapshot(path, {"a": b'{"x":1}', "b": b"\x00\x01\x02"}, FINGERPRINT)
+
+        with SnapshotReader(path) as reader:
+            assert list(reader) == ["a", "b"]
+            assert reader.fingerprint == FINGERPRINT
+            assert reader.json("a") == {"x": 1}
+            view = reader.raw("b")
+            assert bytes(view) == b"\x00\x01\x02"
+            view.release()
+            assert reader.json("missing") is None
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_concurrent_writers_do_not_mix(self, tmp_path):
+        """Test that writers sharing a path (e.g. workers) each write a whole file."""
+        path = tmp_path / "state.snapshot"
+        payloads = [bytes([index]) * 200_000 for index in range(4)]
+
+        def write(payload):
+            for _ in range(10):
+                write_snapshot(path, {"a": payload}, FINGERPRINT)
+
+        threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with SnapshotReader(path) as reader:
+            view = reader.raw("a")
+            assert bytes(view) in payloads
+            view.release()
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that a file without the magic header is refused."""
+        path = tmp_path / "state.snapshot"
+        path.write_bytes(b"not a snapshot" * 10)
+        with pytest.raises(SnapshotFormatError):
+            SnapshotReader(path)
+
+    def test_rejects_truncated_file(self, tmp_path):
+        """Test that a truncated file is refused."""
+        path = tmp_path / "state.snapshot"
+        write_snapshot(path, {"a": b"x" * 1000}, FINGERPRINT)
+        path.write_bytes(path.read_bytes()[:-10])
+        with pytest.raises(SnapshotFormatError):
+            SnapshotReader(path)
+
+    def test_fingerprint_is_stable(self):
+        """Test that fingerprints depend on content, not key order."""
+        assert config_fingerprint({"a": 1, "b": 2}) == config_fingerprint({"b": 2, "a": 1})
+        assert config_fingerprint({"a": 1}) != config_fingerprint({"a": 2})
+
+
+class TestSnapshotManager:
+    """Test suite for the SnapshotManager."""
+
+    def test_save_and_restore(self, tmp_path):
+        """Test that providers are restored from the last snapshot."""
+        path = tmp_path / "state.snapshot"
+        manager = SnapshotManager(path, FINGERPRINT)
+        manager.register("counters", DictProvider({"seen": 42}))
+        manager.save()
+
+        fresh = DictProvider()
+        restarted = SnapshotManager(path, FINGERPRINT)
+        restarted.register("counters", fresh)
+        assert restarted.restore() == {"counters": True}
+        assert fresh.state == {"seen": 42}
+
+    def test_config_dependent_state_discarded_on_change(self, tmp_path):
+        """Test that config-dependent providers are skipped when config changed."""
+        path = tmp_path / "state.snapshot"
+        manager = SnapshotManager(path, FINGERPRINT)
+        manager.register("independent", DictProvider({"a": 1}))
+        manager.register("dependent", DictProvider({"b": 2}), config_dependent=True)
+        manager.save()
+
+        restarted = SnapshotManager(path, config_fingerprint("changed"))
+        restarted.register("independent", DictProvider())
+        restarted.register("dependent", DictProvider(), config_dependent=True)
+        assert restarted.restore() == {"independent": True, "dependent": False}
+
+    def test_missing_or_corrupt_snapshot_starts_cold(self, tmp_path):
+        """Test that start-up survives a missing or corrupt file."""
+        path = tmp_path / "state.snapshot"
+        manager = SnapshotManager(path, FINGERPRINT)
+        manager.register("counters", DictProvider())
+        assert manager.restore() == {"counters": False}
+        path.write_bytes(b"garbage")
+        assert manager.restore() == {"counters": False}
+
+    def test_unreadable_snapshot_starts_cold(self, tmp_path):
+        """Test that a path that cannot be read (here a directory) does not stop start-up."""
+        manager = SnapshotManager(tmp_path, FINGERPRINT)
+        manager.register("counters", DictProvider())
+        assert manager.restore() == {"counters": False}
+
+    def test_malformed_section_starts_cold(self, tmp_path):
+        """Test that a section with a short metric list is skipped."""
+        path = tmp_path / "state.snapshot"
+        section = {"version": 2, "metrics": ["severity", "frequency", "failed_logins"], "entities": [["user_id", "alice", [[1]]]]}
+        write_snapshot(path, {"baselines": json.dumps(section).encode("utf-8")}, FINGERPRINT)
+        store = BaselineStore()
+        manager = SnapshotManager(path, FINGERPRINT)
+        manager.register("baselines", store)
+        assert manager.restore() == {"baselines": False}
+        assert len(store) == 0
+
+    def test_periodic_snapshots(self, tmp_path):
+        """Test that the background thread writes snapshots and close() writes a final one."""
+        path = tmp_path / "state.snapshot"
+        provider = DictProvider({"n": 0})
+        manager = SnapshotManager(path, FINGERPRINT, interval_seconds=0.02)
+        manager.register("counters", provider)
+        manager.start()
+        deadline = time.monotonic() + 5
+        while manager.snapshots_written < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        provider.state["n"] = 7
+        manager.close()
+
+        assert manager.snapshots_written >= 3
+        with SnapshotReader(path) as reader:
+            assert reader.json("counters") == {"n": 7}
+
+    def test_warm_restart_keeps_baselines_and_levels(self, tmp_path):
+        """Test that a restarted pipeline detects anomalies without re-learning."""
+        path = tmp_path / "state.snapshot"
+
+        def build():
+            store = BaselineStore(min_samples=20)
+            notifier = RiskNotifier(dispatcher=_NullDispatcher())
+            pipeline = RiskPipeline(ScoringEngine(), RuleEngine(baselines=store), observers=[store, notifier])
+            manager = SnapshotManager(path, FINGERPRINT)
+            manager.register("baselines", store)
+            manager.register("notification_levels", notifier, config_dependent=True)
+            return pipeline, manager, notifier
+
+        pipeline, manager, notifier = build()
+        rng = random.Random(3)
+        for _ in range(50):
+            pipeline.score(_event(rng.uniform(20, 30)))
+        manager.close()
+
+        pipeline, manager, restored_notifier = build()
+        assert manager.restore() == {"baselines": True, "notification_levels": True}
+        assert restored_notifier.snapshot() == notifier.snapshot()
+        assert "Anomalous activity for user" in pipeline.score(_event(70)).triggered_rules
+
+    def test_save_does_not_block_scoring(self, tmp_path):
+        """Test that observe() is not held up while a large store is saved."""
+        store = BaselineStore(max_entities=20_000)
+        for i in range(10_000):
+            store.observe(RiskInput(severity=50, confidence=60, frequency=50, context=ContextData(user_id=f"u{i}")), None)
+        manager = SnapshotManager(tmp_path / "state.snapshot", FINGERPRINT)
+        manager.register("baselines", store)
+
+        saver = threading.Thread(target=manager.save)
+        event = _event(40)
+        worst = 0.0
+        saver.start()
+        while saver.is_alive():
+            start = time.perf_counter()
+            store.observe(event, None)
+            worst = max(worst, time.perf_counter() - start)
+        saver.join()
+
+        assert manager.snapshots_written == 1
+        assert worst < 0.05
+
+
+class _NullDispatcher:
+    def emit(self, record):
+        return True
+
+
+def _event(severity):
+    return RiskInput(
+        severity=severity,
+        confidence=60,
+        frequency=50,
+        context=ContextData(user_id="alice", source_ip="10.0.0.1"),
+    )
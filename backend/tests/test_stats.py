@@ -0,0 +1,226 @@
+import pytest
+import random
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import routes
+from app.api.routes import router
+from app.api.stats import router as stats_router
+from app.stats import RollingStats, StatsPublisher, DistributionSummary
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestRollingStats:
+    """Test suite for RollingStats."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def stats(self, clock):
+        return RollingStats(window_minutes=10, bucket_seconds=60, clock=clock)
+
+    def test_percentiles_match_sorted_scores(self, stats):
+        """Test that percentiles are within one bin of the exact values."""
+        rng = random.Random(3)
+        scores = [round(rng.uniform(0, 100), 2) for _ in range(5000)]
+        for score in scores:
+            stats.record(score, "LOW", [])
+        summary = stats.summary()
+        scores.sort()
+        for q in (50, 90, 99):
+            exact = scores[int(q / 100 * len(scores)) - 1]
+            assert summary.percentile(q) == pytest.approx(exact, abs=0.5)
+        assert summary.count == 5000
+
+    def test_levels_and_rules(self, stats):
+        """Test the level mix and per-rule counters."""
+        stats.record(90, "CRITICAL", ["Rule A", "Rule B"])
+        stats.record(50, "MEDIUM", ["Rule A"])
+        stats.record(10, "LOW", [])
+        stats.record(12, "LOW", [])
+        result = stats.summary(minutes=5).to_dict()
+        assert result["count"] == 4
+        assert result["mean_score"] == 40.5
+        assert result["levels"]["LOW"] == {"count": 2, "share": 0.5}
+        # The clock is 20s into a bucket, so 5 minutes cover 5m20s
+        assert result["span_minutes"] == pytest.approx(16 / 3, abs=1e-3)
+        assert result["rules"]["Rule A"] == {"count": 2, "rate": 0.5, "per_minute": 0.375}
+        assert list(result["rules"]) == ["Rule A", "Rule B"]
+        assert sum(result["histogram"]["counts"]) == 4
+
+    def test_window_selects_recent_buckets(self, stats, clock):
+        """Test that queries only cover the last N minutes."""
+        stats.record(10, "LOW", [])
+        clock.now += 180
+        stats.record(90, "CRITICAL", [])
+        assert stats.summary(minutes=1).count == 1
+        assert stats.summary(minutes=4).count == 2
+
+    def test_query_just_after_rollover(self, stats, clock):
+        """Test that a bucket boundary does not empty a short query."""
+        clock.now = 1_700_000_000 // 60 * 60 + 58
+        for _ in range(100):
+            stats.record(50, "MEDIUM", [])
+        clock.now += 4
+        result = stats.summary(minutes=1).to_dict()
+        assert result["count"] == 100
+        assert result["span_minutes"] == pytest.approx(1 + 2 / 60, abs=1e-3)
+        assert stats.summary().count == 100
+
+    def test_whole_window_is_covered(self, stats, clock):
+        """Test that the oldest bucket of a full-window query is still in the ring."""
+        clock.now = 1_700_000_000 // 60 * 60 + 1
+        stats.record(50, "MEDIUM", [])
+        clock.now += 10 * 60
+        assert stats.summary().count == 1
+        clock.now += 60
+        assert stats.summary().count == 0
+
+    def test_ring_wraps_and_expires(self, stats, clock):
+        """Test that old buckets are reused once the ring wraps."""
+        for _ in range(100):
+            stats.record(10, "LOW", ["Old rule"])
+        clock.now += 11 * 60
+        stats.record(90, "CRITICAL", [])
+        summary = stats.summary()
+        assert summary.count == 1
+        assert "Old rule" not in summary.rules
+
+    def test_score_bounds(self, stats):
+        """Test that 0 and 100 land in the first and last bins."""
+        stats.record(0, "LOW", [])
+        stats.record(100, "CRITICAL", [])
+        summary = stats.summary()
+        assert summary.bins[0] == 1 and summary.bins[-1] == 1
+        assert summary.percentile(100) == 100.0
+
+    def test_empty_summary(self, stats):
+        """Test that an empty window reports no percentiles."""
+        result = stats.summary().to_dict()
+        assert result["count"] == 0
+        assert result["mean_score"] is None
+        assert result["percentiles"]["p50"] is None
+
+    def test_minutes_beyond_window_rejected(self, stats):
+        """Test that queries longer than the window are rejected."""
+        with pytest.raises(ValueError):
+            stats.summary(minutes=11)
+
+    def test_merge_across_workers(self, clock):
+        """Test that merged exports equal one instance seeing every event."""
+        rng = random.Random(5)
+        workers = [RollingStats(window_minutes=10, clock=clock) for _ in range(3)]
+        combined = RollingStats(window_minutes=10, clock=clock)
+        for step in range(600):
+            clock.now += 1
+            score = rng.uniform(0, 100)
+            rules = ["Rule A"] if score > 50 else []
+            workers[step % 3].record(score, "HIGH" if score > 60 else "LOW", rules)
+            combined.record(score, "HIGH" if score > 60 else "LOW", rules)
+
+        merged = workers[0].summary(exports=[worker.export() for worker in workers[1:]])
+        expected = combined.summary()
+        assert merged.workers == 3
+        assert merged.bins == expected.bins
+        assert merged.levels == expected.levels
+        assert merged.rules == expected.rules
+
+    def test_incompatible_export_skipped(self, stats):
+        """Test that exports with another bucket size are ignored."""
+        other = RollingStats(window_minutes=10, bucket_seconds=30, clock=stats.clock)
+        other.record(50, "MEDIUM", [])
+        assert stats.summary(exports=[other.export()]).workers == 1
+
+
+class TestStatsPublisher:
+    """Test suite for sharing stats between workers."""
+
+    def test_publish_and_read_peers(self, tmp_path):
+        """Test that each worker sees the others' published buckets."""
+        clock = FakeClock()
+        first = RollingStats(clock=clock)
+        second = RollingStats(clock=clock)
+        first.record(20, "LOW", [])
+        second.record(80, "HIGH", [])
+        first_publisher = StatsPublisher(first, tmp_path, worker_id="a")
+        second_publisher = StatsPublisher(second, tmp_path, worker_id="b")
+        first_publisher.publish()
+        second_publisher.publish()
+        (tmp_path / "broken.json").write_text("{")
+
+        summary = first.summary(exports=first_publisher.peer_exports())
+        assert summary.workers == 2
+        assert summary.levels == {"LOW": 1, "HIGH": 1}
+
+    def test_close_writes_final_export(self, tmp_path):
+        """Test that stopping the publisher leaves a final file."""
+        publisher = StatsPublisher(RollingStats(), tmp_path, interval_seconds=60, worker_id="a")
+        publisher.start()
+        publisher.close()
+        assert (tmp_path / "a.json").exists()
+
+
+class TestStatsEndpoint:
+    """Test suite for GET /stats."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        stats = RollingStats(window_minutes=10)
+        monkeypatch.setattr(routes, "rolling_stats", stats)
+        monkeypatch.setattr(routes, "stats_publisher", None)
+        monkeypatch.setattr(routes.pipeline, "observers", routes.pipeline.observers + [stats])
+        app = FastAPI()
+        app.include_router(router)
+        app.include_router(stats_router)
+        return TestClient(app)
+
+    def test_stats_reflect_scored_events(self, client):
+        """Test that scored events show up in the summary."""
+        for severity in (10, 50, 90):
+            client.post("/calculate-risk", json={"severity": severity, "confidence": 50, "frequency": 50})
+        response = client.get("/stats", params={"minutes": 5, "percentiles": [50, 99.9]})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == 3
+        assert set(body["percentiles"]) == {"p50", "p99.9"}
+        assert sum(level["count"] for level in body["levels"].values()) == 3
+
+    def test_invalid_query(self, client):
+        """Test that a span longer than the window or a bad percentile is rejected."""
+        assert client.get("/stats", params={"minutes": 60}).status_code == 422
+        assert client.get("/stats", params={"percentiles": [101]}).status_code == 422
+
+    def test_disabled(self, monkeypatch):
+        """Test that the endpoint reports disabled stats."""
+        monkeypatch.setattr(routes, "rolling_stats", None)
+        app = FastAPI()
+        app.include_router(stats_router)
+        assert TestClient(app).get("/stats").status_code == 404
+
+
+class TestDistributionSummary:
+    """Test suite for DistributionSummary."""
+
+    def test_mergeable_in_any_order(self):
+        """Test that adding buckets is order independent."""
+        first, second = DistributionSummary(1), DistributionSummary(1)
+        buckets = [(1, 10.0, [1] + [0] * 199, {"LOW": 1}, {}), (2, 150.0, [0] * 199 + [2], {"HIGH": 2}, {"R": 2})]
+        for bucket in buckets:
+            first.add(*bucket)
+        for bucket in reversed(buckets):
+            second.add(*bucket)
+        assert first.to_dict() == second.to_dict()
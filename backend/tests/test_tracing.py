@@ -0,0 +1,243 @@
+import pytest
+import json
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.routes import router
+from app.api.tracing import TracingMiddleware
+from app.notifications import NotificationDispatcher, QueueSink
+from app.tracing import (
+    Tracer,
+    OTLPFileExporter,
+    OTLPHttpExporter,
+    LocalTraceCollector,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+EVENT = {
+    "severity": 85,
+    "confidence": 90,
+    "frequency": 70,
+    "context": {"failed_logins": 6, "is_privileged": True},
+}
+
+
+def _spans(sink):
+    spans = []
+    while not sink.queue.empty():
+        spans.append(sink.queue.get_nowait())
+    return spans
+
+
+def _attributes(span):
+    return {attribute["key"]: attribute["value"] for attribute in span["attributes"]}
+
+
+class TestTraceparent:
+    """Test suite for W3C traceparent parsing."""
+
+    def test_valid_header(self):
+        """Test that a valid header yields trace id, parent id and sampled flag."""
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00") == (TRACE_ID, PARENT_ID, False)
+
+    @pytest.mark.parametrize("header", [
+        "",
+        "garbage",
+        f"00-{TRACE_ID[:-1]}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'z' * 16}-01",
+    ])
+    def test_invalid_header(self, header):
+        """Test that malformed headers are ignored."""
+        assert parse_traceparent(header) is None
+
+
+class TestTracer:
+    """Test suite for sampling decisions."""
+
+    @pytest.fixture
+    def sink(self):
+        return QueueSink()
+
+    @pytest.fixture
+    def dispatcher(self, sink):
+        dispatcher = NotificationDispatcher([sink], flush_interval_ms=10)
+        yield dispatcher
+        dispatcher.close()
+
+    def test_unsampled_request_is_not_traced(self, dispatcher):
+        """Test that head sampling off and no tail sampling skips the request."""
+        tracer = Tracer(dispatcher, sample_ratio=0.0)
+        assert tracer.start("POST", "/calculate-risk") is None
+        assert tracer.parent_only
+        assert not Tracer(dispatcher, sample_ratio=0.0, latency_threshold_ms=100).parent_only
+
+    def test_head_sampling_ratio(self, dispatcher):
+        """Test that the head decision compares a random draw with sample_ratio."""
+        tracer = Tracer(dispatcher, sample_ratio=0.25, random_source=iter([0.1, 0.5]).__next__)
+        assert tracer.start("POST", "/calculate-risk").sampled
+        assert tracer.start("POST", "/calculate-risk") is None
+
+    def test_parent_decision_is_followed(self, dispatcher):
+        """Test that an incoming traceparent overrides the sample ratio."""
+        tracer = Tracer(dispatcher, sample_ratio=0.0)
+        trace = tracer.start("POST", "/calculate-risk", f"00-{TRACE_ID}-{PARENT_ID}-01")
+        assert trace.trace_id == TRACE_ID
+        assert trace.parent_span_id == PARENT_ID
+        assert Tracer(dispatcher, sample_ratio=1.0).start("POST", "/", f"00-{TRACE_ID}-{PARENT_ID}-00") is None
+
+    def test_tail_sampling_keeps_slow_requests(self, dispatcher, sink):
+        """Test that unsampled requests are exported only when slow."""
+        fast = Tracer(dispatcher, sample_ratio=0.0, latency_threshold_ms=60_000)
+        trace = fast.start("POST", "/calculate-risk")
+        assert trace is not None and not trace.sampled
+        assert not fast.finish(trace)
+
+        slow = Tracer(dispatcher, sample_ratio=0.0, latency_threshold_ms=0)
+        assert slow.finish(slow.start("POST", "/calculate-risk"))
+        dispatcher.close()
+        assert [span["name"] for span in _spans(sink)] == ["POST /calculate-risk", "request.parse"]
+
+    def test_invalid_ratio(self, dispatcher):
+        """Test that an invalid sample ratio is rejected."""
+        with pytest.raises(ValueError):
+            Tracer(dispatcher, sample_ratio=1.5)
+
+
+class TestTracingMiddleware:
+    """Test suite for request tracing through the HTTP endpoint."""
+
+    @pytest.fixture
+    def sink(self):
+        return QueueSink()
+
+    @pytest.fixture
+    def traced(self, sink):
+        dispatcher = NotificationDispatcher([sink], flush_interval_ms=10)
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(TracingMiddleware, tracer=Tracer(dispatcher, sample_ratio=1.0))
+        yield TestClient(app), dispatcher
+        dispatcher.close()
+
+    def test_request_spans(self, traced, sink):
+        """Test that a traced request produces the server span and stage spans."""
+        client, dispatcher = traced
+        response = client.post("/calculate-risk", json=EVENT)
+        assert response.status_code == 200
+        dispatcher.close()
+
+        spans = _spans(sink)
+        root = spans[0]
+        names = [span["name"] for span in spans]
+        assert root["name"] == "POST /calculate-risk"
+        assert root["kind"] == 2
+        for stage in ("request.parse", "calculate_risk_score", "get_risk_level", "evaluate_rules", "response.serialize"):
+            assert stage in names
+        assert all(span["traceId"] == root["traceId"] for span in spans)
+        assert all(span["parentSpanId"] == root["spanId"] for span in spans[1:])
+        for span in spans:
+            assert int(span["startTimeUnixNano"]) <= int(span["endTimeUnixNano"])
+
+        root_attributes = _attributes(root)
+        assert root_attributes["http.status_code"] == {"intValue": "200"}
+        assert root_attributes["riskradar.risk_level"] == {"stringValue": response.json()["risk_level"]}
+
+        rules_span = spans[names.index("evaluate_rules")]
+        triggered = _attributes(rules_span)["riskradar.triggered_rules"]["arrayValue"]["values"]
+        assert [value["stringValue"] for value in triggered] == response.json()["triggered_rules"]
+
+    def test_trace_continues_parent(self, traced, sink):
+        """Test that an incoming traceparent is continued."""
+        client, dispatcher = traced
+        client.post("/calculate-risk", json=EVENT, headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+        dispatcher.close()
+        root = _spans(sink)[0]
+        assert root["traceId"] == TRACE_ID
+        assert root["parentSpanId"] == PARENT_ID
+
+    def test_parent_only_tracer(self, sink):
+        """Test that with sample_ratio 0 only requests with a sampled parent are traced."""
+        dispatcher = NotificationDispatcher([sink], flush_interval_ms=10)
+        tracer = Tracer(dispatcher, sample_ratio=0.0)
+        assert tracer.parent_only
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+        client = TestClient(app)
+
+        assert client.post("/calculate-risk", json=EVENT).status_code == 200
+        client.post("/calculate-risk", json=EVENT, headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+        dispatcher.close()
+        assert tracer.traces_exported == 1
+        assert {span["traceId"] for span in _spans(sink)} == {TRACE_ID}
+
+    def test_unsampled_request_adds_no_layer(self, sink):
+        """Test that a head miss hands the inner app's coroutine straight back, drawing once."""
+        draws = []
+
+        def random_source():
+            draws.append(1)
+            return 0.9
+
+        async def inner(scope, receive, send):
+            pass
+
+        dispatcher = NotificationDispatcher([sink])
+        middleware = TracingMiddleware(inner, tracer=Tracer(dispatcher, sample_ratio=0.5, random_source=random_source))
+        scope = {"type": "http", "method": "POST", "path": "/calculate-risk", "headers": []}
+        coroutine = middleware(scope, None, None)
+        assert coroutine.cr_code is inner.__code__
+        coroutine.close()
+        assert draws == [1]
+        dispatcher.close()
+
+    def test_validation_error_is_traced(self, traced, sink):
+        """Test that a rejected request still yields a server and parse span."""
+        client, dispatcher = traced
+        assert client.post("/calculate-risk", json={"severity": -5}).status_code == 422
+        dispatcher.close()
+        spans = _spans(sink)
+        assert [span["name"] for span in spans] == ["POST /calculate-risk", "request.parse"]
+        assert _attributes(spans[0])["http.status_code"] == {"intValue": "422"}
+
+    def test_other_paths_not_traced(self, traced, sink):
+        """Test that only the configured paths are traced."""
+        client, dispatcher = traced
+        assert client.get("/health").status_code == 200
+        dispatcher.close()
+        assert _spans(sink) == []
+
+
+class TestExporters:
+    """Test suite for OTLP/JSON exporters."""
+
+    def test_file_exporter(self, tmp_path):
+        """Test that each batch is one OTLP export request per line."""
+        path = tmp_path / "traces.jsonl"
+        exporter = OTLPFileExporter(path, service_name="riskradar-test")
+        exporter.send_batch([{"name": "a"}, {"name": "b"}])
+        exporter.close()
+
+        request = json.loads(path.read_text().splitlines()[0])
+        resource_spans = request["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "riskradar-test"}
+        assert [span["name"] for span in resource_spans["scopeSpans"][0]["spans"]] == ["a", "b"]
+
+    def test_http_exporter_to_local_collector(self):
+        """Test delivery to the collector stand-in."""
+        collector = LocalTraceCollector()
+        try:
+            OTLPHttpExporter(collector.url + "v1/traces").send_batch([{"name": "a"}, {"name": "b"}])
+            assert [span["name"] for span in collector.records] == ["a", "b"]
+        finally:
+            collector.close()
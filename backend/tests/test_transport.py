@@ -0,0 +1,121 @@
+import pytest
+import asyncio
+import socket
+import threading
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.risk_models import RiskInput
+from app.rules import RuleEngine
+from app.scoring import ScoringEngine, RiskPipeline
+from app.services import ScoringServices
+from app.transport import FramedScoringServer, FramedScoringClient, FrameError, decode_header
+from app.transport.protocol import HEADER, HEADER_SIZE
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    """Create a scoring pipeline shared by the server under test."""
+    return RiskPipeline(ScoringEngine(), RuleEngine())
+
+
+@pytest.fixture(scope="module")
+def server_address(pipeline):
+    """Run a framed server on an ephemeral TCP port in a background thread."""
+    loop = asyncio.new_event_loop()
+    server = FramedScoringServer(pipeline, max_frame_bytes=64 * 1024)
+    listener = loop.run_until_complete(server.start("127.0.0.1", 0))
+    port = listener.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield ("127.0.0.1", port)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+class TestFramedTransport:
+    """Test suite for the framed socket transport."""
+
+    def test_single_event_matches_pipeline(self, server_address, pipeline):
+        """Test that a single frame returns the same result as the shared pipeline."""
+        event = {"severity": 80, "confidence": 75, "frequency": 90, "context": {"failed_logins": 6}}
+        with FramedScoringClient(*server_address) as client:
+            response = client.score(event)
+        assert "incident" not in response["result"]
+        assert response["result"] == pipeline.score(RiskInput(**event)).model_dump(exclude_none=True)
+
+    def test_batch_frame_with_invalid_item(self, server_address):
+        """Test that invalid items in a batch fail individually."""
+        events = [
+            {"severity": 10, "confidence": 10, "frequency": 10},
+            {"severity": 150, "confidence": 10, "frequency": 10},
+            {"severity": 100, "confidence": 100, "frequency": 100},
+        ]
+        with FramedScoringClient(*server_address) as client:
+            response = client.score_batch(events)
+        results = response["results"]
+        assert len(results) == 3
+        assert results[0]["risk_level"] == "LOW"
+        assert results[1]["error"]["status"] == 422
+        assert results[2]["risk_score"] == 100
+
+    def test_pipelined_frames_preserve_order(self, server_address):
+        """Test that pipelined responses come back in request order on one connection."""
+        events = [{"severity": i % 101, "confidence": 50, "frequency": 50} for i in range(600)]
+        with FramedScoringClient(*server_address) as client:
+            responses = client.pipeline(events, window=128)
+            ids = [r["id"] for r in responses]
+            assert ids == sorted(ids)
+            assert [r["result"]["breakdown"]["severity"] for r in responses] == [e["severity"] for e in events]
+            # The connection stays usable afterwards
+            assert client.request({"op": "ping"})["pong"] is True
+
+    def test_invalid_event_error(self, server_address):
+        """Test that a validation failure is reported with status 422."""
+        with FramedScoringClient(*server_address) as client:
+            response = client.score({"severity": 80, "confidence": 75})
+        assert response["error"]["status"] == 422
+
+    def test_unknown_frame(self, server_address):
+        """Test that a frame without an event or op is rejected."""
+        with FramedScoringClient(*server_address) as client:
+            response = client.request({"foo": "bar"})
+        assert response["error"]["status"] == 400
+
+    def test_oversized_frame_rejected(self, server_address):
+        """Test that frames above the size limit are rejected and the connection closed."""
+        with socket.create_connection(server_address, timeout=5) as sock:
+            sock.sendall(HEADER.pack(10 * 1024 * 1024))
+            data = b""
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        assert b"exceeds limit" in data[HEADER_SIZE:]
+
+    def test_decode_header_limit(self):
+        """Test header validation against the frame size limit."""
+        assert decode_header(HEADER.pack(100), max_frame_bytes=100) == 100
+        with pytest.raises(FrameError):
+            decode_header(HEADER.pack(101), max_frame_bytes=100)
+
+    def test_server_uses_configured_services(self):
+        """Test that a server built from service settings correlates and records stats."""
+        services = ScoringServices({
+            "baselines": {"enabled": True},
+            "correlation": {"enabled": True},
+            "stats": {"enabled": True},
+            "engine": {"implementation": "reference"},
+        })
+        server = FramedScoringServer(services.pipeline)
+        event = {"severity": 80, "confidence": 75, "frequency": 90, "context": {"user_id": "alice"}}
+        server.handle_message({"id": 1, "event": event})
+        response = server.handle_message({"id": 2, "events": [event]})
+
+        assert response["results"][0]["incident"]["event_count"] == 2
+        assert services.rolling_stats.summary().count == 2
+        assert services.baseline_store.get("user_id", "alice")["severity"].count == 2